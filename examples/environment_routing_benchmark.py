@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : benchmark of Environment.publish_message, routed by its address -> roles table or by scanning every role
+
+import time
+
+import fire
+
+from metagpt.environment import Environment
+from metagpt.logs import logger
+from metagpt.roles import Role
+from metagpt.schema import Message
+from metagpt.utils.common import is_send_to
+
+
+def publish_by_scan(env: Environment, message: Message):
+    """How messages were delivered before the routing table: every member is checked against the message."""
+    for role, addrs in env.member_addrs.items():
+        if is_send_to(message, addrs):
+            role.put_message(message)
+
+
+def main(num_roles: int = 1000, num_messages: int = 100000):
+    """Publish point-to-point messages among the roles, the debug history of publish_message included."""
+    roles = [Role(name=f"role{i}", profile=f"profile{i}") for i in range(num_roles)]
+    env = Environment()
+    env.add_roles(roles)
+    messages = [Message(content=f"message {i}", send_to=f"role{i % num_roles}") for i in range(num_messages)]
+
+    start = time.perf_counter()
+    for message in messages:
+        publish_by_scan(env, message)
+    scanned = time.perf_counter() - start
+    logger.info(f"scan every role: {scanned:.2f}s, {scanned / num_messages * 1e6:.1f}us per message")
+
+    for role in roles:
+        role.rc.msg_buffer.pop_all()
+    start = time.perf_counter()
+    for message in messages:
+        env.publish_message(message)
+    published = time.perf_counter() - start
+    logger.info(f"publish_message: {published:.2f}s, {published / num_messages * 1e6:.1f}us per message")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
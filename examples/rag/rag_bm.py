@@ -16,6 +16,8 @@ from metagpt.rag.schema import (
     ColbertRerankConfig,
     FAISSIndexConfig,
     FAISSRetrieverConfig,
+    FusionMode,
+    HybridRetrieverConfig,
 )
 from metagpt.utils.common import write_json_file
 
@@ -56,7 +58,12 @@ class RAGExample:
                     self.engine = SimpleEngine.from_index(
                         index_config=FAISSIndexConfig(persist_path=output_dir),
                         ranker_configs=[ColbertRerankConfig()],
-                        retriever_configs=[FAISSRetrieverConfig(), BM25RetrieverConfig()],
+                        retriever_configs=[
+                            HybridRetrieverConfig(
+                                retriever_configs=[FAISSRetrieverConfig(), BM25RetrieverConfig()],
+                                fusion_mode=FusionMode.RECIPROCAL_RANK,
+                            )
+                        ],
                     )
                 else:
                     logger.info("Loading index from documents!")
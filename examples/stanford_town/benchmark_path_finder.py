@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : benchmark of the PathFinder of the StanfordTown env on the shipped `the_ville` maze
+
+import random
+import time
+
+import fire
+
+from metagpt.environment.stanford_town.path_finder import PathFinder
+from metagpt.environment.stanford_town.stanford_town_ext_env import StanfordTownExtEnv
+from metagpt.ext.stanford_town.utils.const import MAZE_ASSET_PATH
+from metagpt.logs import logger
+
+
+def main(num_roles: int = 25, targets_per_role: int = 4, num_steps: int = 20, seed: int = 0):
+    """Every step, each role looks for the paths to a few target tiles, as STRole.execute does."""
+    env = StanfordTownExtEnv(maze_asset_path=MAZE_ASSET_PATH)
+    maze = env.get_collision_maze()
+    walkable = [(x, y) for y in range(env.maze_height) for x in range(env.maze_width) if maze[y][x] == "0"]
+    rng = random.Random(seed)
+    steps = [
+        [(start, rng.choice(walkable)) for start in rng.sample(walkable, num_roles) for _ in range(targets_per_role)]
+        for _ in range(num_steps)
+    ]
+
+    start = time.perf_counter()
+    finder = PathFinder(maze)
+    logger.info(f"build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    uncached = PathFinder(maze, cache_size=0)
+    start = time.perf_counter()
+    for pairs in steps:
+        for pair in pairs:
+            uncached.find_path(*pair)
+    single = (time.perf_counter() - start) / num_steps
+    logger.info(f"one path at a time, no cache: {single * 1000:.1f}ms per step")
+
+    start = time.perf_counter()
+    for pairs in steps:
+        finder.find_paths(pairs)
+    batched = (time.perf_counter() - start) / num_steps
+    logger.info(f"batched: {batched * 1000:.1f}ms per step")
+
+    start = time.perf_counter()
+    for pairs in steps:
+        finder.find_paths(pairs)
+    cached = (time.perf_counter() - start) / num_steps
+    logger.info(f"cached: {cached * 1000:.2f}ms per step")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
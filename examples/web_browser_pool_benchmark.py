@@ -0,0 +1,65 @@
+"""Compare scraping pages with a browser launched per call against the shared browser pool.
+
+The pages are served by a local static HTTP server, so that the numbers measure the browser, not the network.
+Requires the browser of the engine, e.g. `playwright install chromium`.
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import fire
+from aiohttp import web
+
+from metagpt.logs import logger
+from metagpt.tools import WebBrowserEngineType
+from metagpt.tools.web_browser_engine import WebBrowserEngine
+from metagpt.tools.web_browser_pool import close_browser_pools
+
+
+async def serve_pages(root: Path, num_pages: int) -> tuple[web.AppRunner, list[str]]:
+    for i in range(num_pages):
+        text = f"<p>Paragraph {i} of the benchmark page, with some words to render.</p>" * 50
+        root.joinpath(f"{i}.html").write_text(f"<html><head><title>Page {i}</title></head><body>{text}</body></html>")
+    app = web.Application()
+    app.router.add_static("/", root)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    _, port, *_ = site._server.sockets[0].getsockname()
+    return runner, [f"http://127.0.0.1:{port}/{i}.html" for i in range(num_pages)]
+
+
+async def run_benchmark(engine: str, num_pages: int, pool_size: int):
+    with tempfile.TemporaryDirectory() as root:
+        runner, urls = await serve_pages(Path(root), num_pages)
+        browser = WebBrowserEngine(
+            engine=WebBrowserEngineType(engine), pool_size=pool_size, max_per_domain=pool_size, max_pages=50
+        )
+        try:
+            start = time.perf_counter()
+            for url in urls:
+                await browser.run(url)
+                await close_browser_pools()  # a new browser for the next call, as before the pool
+            launch_per_call = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pages = await asyncio.gather(*(browser.run(url) for url in urls))
+            pooled = time.perf_counter() - start
+            assert all("Paragraph" in page.inner_text for page in pages)
+        finally:
+            await close_browser_pools()
+            await runner.cleanup()
+
+    logger.info(f"browser per call: {launch_per_call:.2f}s, {num_pages / launch_per_call:.1f} pages/s")
+    logger.info(f"pooled: {pooled:.2f}s, {num_pages / pooled:.1f} pages/s")
+
+
+def main(engine: str = "playwright", num_pages: int = 100, pool_size: int = 4):
+    asyncio.run(run_benchmark(engine, num_pages, pool_size))
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
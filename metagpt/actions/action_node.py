@@ -16,7 +16,10 @@ from typing import Any, Dict, List, Optional, Tuple, Type, Union
 from pydantic import BaseModel, Field, create_model, model_validator
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
-from metagpt.actions.action_outcls_registry import register_action_outcls
+from metagpt.actions.action_outcls_registry import (
+    get_outcls_json_schema,
+    register_action_outcls,
+)
 from metagpt.const import USE_CONFIG_TIMEOUT
 from metagpt.llm import BaseLLM
 from metagpt.logs import logger
@@ -430,7 +433,7 @@ class ActionNode:
 
         if schema == "json":
             parsed_data = llm_output_postprocess(
-                output=content, schema=output_class.model_json_schema(), req_key=f"[/{TAG}]"
+                output=content, schema=get_outcls_json_schema(output_class), req_key=f"[/{TAG}]"
             )
         else:  # using markdown parser
             parsed_data = OutputParser.parse_data_with_mapping(content, output_data_mapping)
@@ -569,7 +572,7 @@ class ActionNode:
         output_class_name = f"{self.key}_AN_REVIEW"
         output_class = self.create_class(class_name=output_class_name, exclude=exclude_keys)
         parsed_data = llm_output_postprocess(
-            output=content, schema=output_class.model_json_schema(), req_key=f"[/{TAG}]"
+            output=content, schema=get_outcls_json_schema(output_class), req_key=f"[/{TAG}]"
         )
         instruct_content = output_class(**parsed_data)
         return instruct_content.model_dump()
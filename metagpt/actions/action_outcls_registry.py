@@ -3,40 +3,97 @@
 # @Desc   : registry to store Dynamic Model from ActionNode.create_model_class to keep it as same Class
 #           with same class name and mapping
 
-from functools import wraps
+import weakref
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Hashable, NamedTuple
 
-action_outcls_registry = dict()
+from pydantic import BaseModel
+
+MAX_ACTION_OUTCLS = 1024  # least recently used classes beyond this are dropped from the registry
+
+# (creator, class_name, frozen mapping) -> model class, in least recently used order
+action_outcls_registry: OrderedDict[tuple, type[BaseModel]] = OrderedDict()
+_outcls_schemas: "weakref.WeakKeyDictionary[type[BaseModel], dict]" = weakref.WeakKeyDictionary()
+
+
+class OutclsCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    schema_hits: int
+    schema_misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_stats = {"hits": 0, "misses": 0, "schema_hits": 0, "schema_misses": 0}
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn a field mapping into a hashable key where field order does not matter and typing aliases such as
+    `typing.List[str]` match their builtin form `list[str]`.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (tuple, list)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, type) or hasattr(value, "__origin__"):
+        return _type_key(value)
+    if value is None or value is ... or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)  # e.g. a FieldInfo, which compares by identity
+
+
+@lru_cache(maxsize=1024)
+def _type_key(tp) -> tuple[str, str]:
+    # eliminate typing influence
+    return "type", str(tp).replace("typing.List", "list").replace("typing.Dict", "dict")
 
 
 def register_action_outcls(func):
     """
     Due to `create_model` return different Class even they have same class name and mapping.
-    In order to do a comparison, use outcls_id to identify same Class with same class name and field definition
+    In order to do a comparison, identify same Class by class name and field definition, and reuse it instead of
+    building the model again.
     """
 
     @wraps(func)
-    def decorater(*args, **kwargs):
-        """
-        arr example
-            [<class 'metagpt.actions.action_node.ActionNode'>, 'test', {'field': (str, Ellipsis)}]
-        """
-        arr = list(args) + list(kwargs.values())
-        """
-        outcls_id example
-            "<class 'metagpt.actions.action_node.ActionNode'>_test_{'field': (str, Ellipsis)}"
-        """
-        for idx, item in enumerate(arr):
-            if isinstance(item, dict):
-                arr[idx] = dict(sorted(item.items()))
-        outcls_id = "_".join([str(i) for i in arr])
-        # eliminate typing influence
-        outcls_id = outcls_id.replace("typing.List", "list").replace("typing.Dict", "dict")
-
-        if outcls_id in action_outcls_registry:
-            return action_outcls_registry[outcls_id]
-
-        out_cls = func(*args, **kwargs)
+    def decorater(cls, class_name: str, mapping: dict):
+        outcls_id = (cls, class_name, _freeze(mapping))
+        out_cls = action_outcls_registry.get(outcls_id)
+        if out_cls is not None:
+            _stats["hits"] += 1
+            action_outcls_registry.move_to_end(outcls_id)
+            return out_cls
+
+        _stats["misses"] += 1
+        out_cls = func(cls, class_name, mapping)
         action_outcls_registry[outcls_id] = out_cls
+        while len(action_outcls_registry) > MAX_ACTION_OUTCLS:
+            _, evicted = action_outcls_registry.popitem(last=False)
+            _outcls_schemas.pop(evicted, None)
         return out_cls
 
     return decorater
+
+
+def get_outcls_json_schema(out_cls: type[BaseModel]) -> dict:
+    """Return `out_cls.model_json_schema()`, computed once per class. Callers must not modify it."""
+    schema = _outcls_schemas.get(out_cls)
+    if schema is not None:
+        _stats["schema_hits"] += 1
+        return schema
+
+    _stats["schema_misses"] += 1
+    schema = out_cls.model_json_schema()
+    _outcls_schemas[out_cls] = schema
+    return schema
+
+
+def get_outcls_cache_stats() -> OutclsCacheStats:
+    return OutclsCacheStats(size=len(action_outcls_registry), **_stats)
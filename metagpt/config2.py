@@ -72,6 +72,7 @@ class Config(CLIParams, YamlModel):
     prompt_schema: Literal["json", "markdown", "raw"] = "json"
     workspace: WorkspaceConfig = WorkspaceConfig()
     enable_longterm_memory: bool = False
+    memory_window_size: int = 0  # max messages a role keeps in RAM, older ones are spilled to disk, 0 keeps them all
     code_review_k_times: int = 2
     agentops_api_key: str = ""
 
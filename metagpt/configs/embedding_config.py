@@ -46,6 +46,11 @@ class EmbeddingConfig(YamlModel):
     embed_batch_size: Optional[int] = None
     dimensions: Optional[int] = None  # output dimension of embedding model
 
+    # Cache, texts already embedded are read from disk instead of calling the model again
+    cache: bool = False
+    cache_path: Optional[str] = None  # defaults to ~/.metagpt/embedding_cache
+    embed_concurrency: int = 4  # max batches embedding at the same time, with the cache on
+
     @field_validator("api_type", mode="before")
     @classmethod
     def check_api_type(cls, v):
@@ -90,6 +90,17 @@ class LLMConfig(YamlModel):
     # Cost Control
     calc_usage: bool = True
 
+    # Admission Control, shared by all LLM instances of the same provider account and model. 0 means unlimited
+    max_concurrency: int = 0  # max in-flight requests
+    rpm: int = 0  # requests per minute
+    tpm: int = 0  # tokens per minute, counted with `metagpt.utils.token_counter`
+
+    # Response Cache, identical requests to the same model are answered from the cache at no cost
+    response_cache: bool = False
+    response_cache_path: Optional[str] = None  # sqlite file, defaults to ~/.metagpt/llm_response_cache.db
+    response_cache_ttl: int = 0  # seconds before a cached response expires, 0 means never
+    response_cache_max_size: float = 100  # MB of responses kept on disk, 0 means unbounded
+
     @field_validator("api_key")
     @classmethod
     def check_llm_key(cls, v):
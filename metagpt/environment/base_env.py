@@ -9,8 +9,16 @@ from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Union
 
 from gymnasium import spaces
 from gymnasium.core import ActType, ObsType
-from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    SerializeAsAny,
+    model_validator,
+)
 
+from metagpt.const import MESSAGE_ROUTE_TO_ALL
 from metagpt.context import Context
 from metagpt.environment.api.env_api import (
     EnvAPIAbstract,
@@ -20,7 +28,7 @@ from metagpt.environment.api.env_api import (
 from metagpt.environment.base_env_space import BaseEnvAction, BaseEnvObsParams
 from metagpt.logs import logger
 from metagpt.schema import Message
-from metagpt.utils.common import get_function_schema, is_coroutine_func, is_send_to
+from metagpt.utils.common import get_function_schema, is_coroutine_func
 
 if TYPE_CHECKING:
     from metagpt.roles.role import Role  # noqa: F401
@@ -133,6 +141,12 @@ class Environment(ExtEnv):
     member_addrs: Dict["Role", Set] = Field(default_factory=dict, exclude=True)
     history: str = ""  # For debug
     context: Context = Field(default_factory=Context, exclude=True)
+    event_driven: bool = False  # only run the roles that have received messages since their last run
+    max_concurrency: int = 0  # max number of roles running at once in a round, 0 means unbounded
+    # Inverted routing table of `member_addrs`: address -> roles subscribed to it, in subscription order.
+    _routes: dict[str, dict["Role", None]] = PrivateAttr(default_factory=dict)
+    # Roles with pending messages, in the order they were woken up.
+    _ready: dict["Role", None] = PrivateAttr(default_factory=dict)
 
     def reset(
         self,
@@ -182,12 +196,16 @@ class Environment(ExtEnv):
         in RFC 113.
         """
         logger.debug(f"publish_message: {message.dump()}")
-        found = False
         # According to the routing feature plan in Chapter 2.2.3.2 of RFC 113
-        for role, addrs in self.member_addrs.items():
-            if is_send_to(message, addrs):
-                role.put_message(message)
-                found = True
+        if MESSAGE_ROUTE_TO_ALL in message.send_to:
+            recipients = self.member_addrs.keys()
+        else:
+            recipients = {}
+            for addr in message.send_to:
+                recipients.update(self._routes.get(addr, {}))
+        for role in recipients:
+            role.put_message(message)
+        found = bool(recipients)
         if not found:
             logger.warning(f"Message no recipients: {message.dump()}")
         self.history += f"\n{message}"  # For debug
@@ -199,14 +217,26 @@ class Environment(ExtEnv):
         Process all Role runs at once
         """
         for _ in range(k):
-            futures = []
-            for role in self.roles.values():
-                future = role.run()
-                futures.append(future)
+            ready, self._ready = self._ready, {}
+            roles = list(ready) if self.event_driven else list(self.roles.values())
+            if self.max_concurrency > 0:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                futures = [self._run_role(role, semaphore) for role in roles]
+            else:
+                futures = [role.run() for role in roles]
 
             await asyncio.gather(*futures)
             logger.debug(f"is idle: {self.is_idle}")
 
+    @staticmethod
+    async def _run_role(role: "Role", semaphore: asyncio.Semaphore):
+        async with semaphore:
+            return await role.run()
+
+    def mark_ready(self, role: "Role"):
+        """Wake up the role in the next round of an event-driven `run`"""
+        self._ready[role] = None
+
     def get_roles(self) -> dict[str, "Role"]:
         """获得环境内的所有角色
         Process all Role runs at once
@@ -236,7 +266,15 @@ class Environment(ExtEnv):
 
     def set_addresses(self, obj, addresses):
         """Set the addresses of the object"""
+        for addr in self.member_addrs.get(obj, ()):
+            routed = self._routes.get(addr)
+            if routed is not None:
+                routed.pop(obj, None)
+                if not routed:
+                    del self._routes[addr]
         self.member_addrs[obj] = addresses
+        for addr in addresses:
+            self._routes.setdefault(addr, {})[obj] = None
 
     def archive(self, auto_archive=True):
         if auto_archive and self.context.git_repo:
@@ -55,6 +55,7 @@ class EnvObsType(BaseEnvObsType):
     GET_TITLE = 1  # get the tile detail dictionary with given tile coord
     TILE_PATH = 2  # get the tile address with given tile coord
     TILE_NBR = 3  # get the neighbors of given tile coord and its vision radius
+    TILE_EVENTS = 4  # get the events in the arena of given tile coord within its vision radius, closest first
 
 
 class EnvObsParams(BaseEnvObsParams):
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : spatial hash of the tiles having events in the StanfordTown, per arena
+
+from collections import defaultdict
+
+Tile = tuple[int, int]  # (x, y)
+
+
+def get_arena_path(tile_details: dict) -> str:
+    """The address of the arena of a tile, as `get_tile_path(tile, level="arena")`"""
+    return f"{tile_details['world']}:{tile_details['sector']}:{tile_details['arena']}"
+
+
+class TileEventIndex:
+    """
+    The tiles having events, hashed by arena and by square cells of `cell_size` tiles.
+
+    Finding the events around a tile looks up the few cells overlapping the area, so it costs the number of tiles
+    with events nearby, whatever the size of the area. The index reads the events from `tiles`, `update` must be
+    called after the events of a tile changed.
+    """
+
+    def __init__(self, tiles: list[list[dict]], cell_size: int = 8):
+        self.tiles = tiles
+        self.cell_size = cell_size
+        self._cells: dict[tuple[str, int, int], set[Tile]] = defaultdict(set)
+        for y, row in enumerate(tiles):
+            for x, tile_details in enumerate(row):
+                if tile_details["events"]:
+                    self._cells[self._cell_key((x, y))].add((x, y))
+
+    def _cell_key(self, tile: Tile) -> tuple[str, int, int]:
+        x, y = tile
+        return get_arena_path(self.tiles[y][x]), x // self.cell_size, y // self.cell_size
+
+    def update(self, tile: Tile):
+        tile = (int(tile[0]), int(tile[1]))
+        key = self._cell_key(tile)
+        if self.tiles[tile[1]][tile[0]]["events"]:
+            self._cells[key].add(tile)
+        elif tile in self._cells.get(key, ()):
+            self._cells[key].discard(tile)
+            if not self._cells[key]:
+                del self._cells[key]
+
+    def get_tiles(self, arena_path: str, left: int, right: int, top: int, bottom: int) -> list[Tile]:
+        """The tiles with events of the arena in [left, right) x [top, bottom), ordered by x, then y."""
+        tiles = []
+        size = self.cell_size
+        for cx in range(left // size, (right - 1) // size + 1):
+            for cy in range(top // size, (bottom - 1) // size + 1):
+                for x, y in self._cells.get((arena_path, cx, cy), ()):
+                    if left <= x < right and top <= y < bottom:
+                        tiles.append((x, y))
+        tiles.sort()
+        return tiles
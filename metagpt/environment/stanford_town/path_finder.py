@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : shortest paths on the collision maze of the StanfordTown, built once per maze and cached
+
+from collections import OrderedDict, deque
+from typing import Iterable, Optional
+
+import numpy as np
+
+# the farthest a path reaches, in steps, further tiles are unreachable as with the original flood fill
+MAX_PATH_STEPS = 151
+
+Tile = tuple[int, int]  # (x, y), x being the column and y the row of the maze
+
+
+class PathFinder:
+    """
+    Shortest 4-connected paths between the tiles of a collision maze.
+
+    The maze is turned once into a boolean grid of blocked tiles and into the walkable neighbors of every tile, then
+    each path is found by a breadth-first search stopping as soon as the end is reached, and kept in an LRU cache of
+    `cache_size` (start, end) pairs. `find_paths` serves all the roles of a step, searching once per distinct start.
+
+    The paths are those of the original flood fill of generative_agents: from the end back to the start, a step goes
+    up, left, down or right, the first of them being one step closer. An unreachable end, blocked or farther than
+    MAX_PATH_STEPS, gives `[end]`.
+
+    A tile blocks if it is `collision_block_char`, or if it is not "0" when that is None. Call `invalidate` after
+    changing the maze in place.
+    """
+
+    def __init__(self, collision_maze: list[list], collision_block_char: Optional[str] = None, cache_size: int = 4096):
+        self.collision_maze = collision_maze
+        self.collision_block_char = collision_block_char
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[Tile, Tile], tuple[Tile, ...]] = OrderedDict()
+        self._build()
+
+    def _build(self):
+        grid = np.asarray(self.collision_maze, dtype=str)
+        if self.collision_block_char is None:
+            self.blocked = grid != "0"
+        else:
+            self.blocked = grid == self.collision_block_char
+        self.height, self.width = self.blocked.shape
+
+        # flat index of each tile -> its neighbors, in the order the paths are backtracked: up, left, down, right
+        h, w = self.height, self.width
+        self._neighbors = []
+        for i in range(h * w):
+            row, col = divmod(i, w)
+            candidates = ((i - w, row > 0), (i - 1, col > 0), (i + w, row < h - 1), (i + 1, col < w - 1))
+            self._neighbors.append([n for n, inside in candidates if inside])
+        walkable = (~self.blocked).ravel().tolist()
+        self._walkable_neighbors = [[n for n in neighbors if walkable[n]] for neighbors in self._neighbors]
+
+    def invalidate(self):
+        """Rebuild the grid from the maze and forget the cached paths, the maze having changed."""
+        self._cache.clear()
+        self._build()
+
+    def find_path(self, start: Tile, end: Tile) -> list[Tile]:
+        """The tiles from start to end, both included."""
+        return self.find_paths([(start, end)])[0]
+
+    def find_paths(self, pairs: Iterable[tuple[Tile, Tile]]) -> list[list[Tile]]:
+        """The paths of the (start, end) pairs, searching the maze once for all the ends of a start."""
+        pairs = [(tuple(start), tuple(end)) for start, end in pairs]
+        paths: dict[tuple[Tile, Tile], tuple[Tile, ...]] = {}
+        missing: dict[Tile, set[Tile]] = {}
+        for pair in pairs:
+            path = self._cache.get(pair)
+            if path is None:
+                missing.setdefault(pair[0], set()).add(pair[1])
+            else:
+                self._cache.move_to_end(pair)
+                paths[pair] = path
+
+        for start, ends in missing.items():
+            distances = self._search(start, ends)
+            for end in ends:
+                path = self._backtrack(distances, end)
+                paths[(start, end)] = path
+                self._cache[(start, end)] = path
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return [list(paths[pair]) for pair in pairs]
+
+    def _index(self, tile: Tile) -> int:
+        x, y = tile
+        return y * self.width + x
+
+    def _search(self, start: Tile, ends: set[Tile]) -> list[int]:
+        """Steps from start to the tiles, -1 if not reached, searching until all the ends are reached."""
+        distances = [-1] * (self.height * self.width)
+        source = self._index(start)
+        distances[source] = 0
+        targets = {self._index(end) for end in ends}
+        targets.discard(source)
+        walkable_neighbors = self._walkable_neighbors
+
+        queue = deque([source])
+        while queue and targets:
+            i = queue.popleft()
+            step = distances[i] + 1
+            if step > MAX_PATH_STEPS:
+                break
+            for n in walkable_neighbors[i]:
+                if distances[n] < 0:
+                    distances[n] = step
+                    queue.append(n)
+                    targets.discard(n)
+        return distances
+
+    def _backtrack(self, distances: list[int], end: Tile) -> tuple[Tile, ...]:
+        i = self._index(end)
+        step = distances[i]
+        path = [i]
+        while step > 0:
+            step -= 1
+            i = next(n for n in self._neighbors[i] if distances[n] == step)
+            path.append(i)
+        path.reverse()
+        return tuple((i % self.width, i // self.width) for i in path)
@@ -7,7 +7,7 @@ import math
 from pathlib import Path
 from typing import Any, Optional
 
-from pydantic import ConfigDict, Field, model_validator
+from pydantic import ConfigDict, Field, PrivateAttr, model_validator
 
 from metagpt.environment.base_env import ExtEnv, mark_as_readable, mark_as_writeable
 from metagpt.environment.stanford_town.env_space import (
@@ -19,6 +19,8 @@ from metagpt.environment.stanford_town.env_space import (
     get_action_space,
     get_observation_space,
 )
+from metagpt.environment.stanford_town.event_index import TileEventIndex, get_arena_path
+from metagpt.environment.stanford_town.path_finder import PathFinder
 from metagpt.utils.common import read_csv_to_list, read_json_file
 
 
@@ -36,6 +38,9 @@ class StanfordTownExtEnv(ExtEnv):
     address_tiles: dict[str, set] = Field(default=dict())
     collision_maze: list[list] = Field(default=[])
 
+    _path_finder: Optional[PathFinder] = PrivateAttr(default=None)
+    _event_index: Optional[TileEventIndex] = PrivateAttr(default=None)
+
     @model_validator(mode="before")
     @classmethod
     def _init_maze(cls, values):
@@ -245,6 +250,8 @@ class StanfordTownExtEnv(ExtEnv):
             obs = self.get_tile_path(tile=obs_params.coord, level=obs_params.level)
         elif obs_type == EnvObsType.TILE_NBR:
             obs = self.get_nearby_tiles(tile=obs_params.coord, vision_r=obs_params.vision_radius)
+        elif obs_type == EnvObsType.TILE_EVENTS:
+            obs = self.observe_events_in_radius(tile=obs_params.coord, vision_r=obs_params.vision_radius)
         return obs
 
     def step(self, action: EnvAction) -> tuple[dict[str, EnvObsValType], float, bool, bool, dict[str, Any]]:
@@ -287,6 +294,13 @@ class StanfordTownExtEnv(ExtEnv):
     def get_collision_maze(self) -> list:
         return self.collision_maze
 
+    @mark_as_readable
+    def get_path_finder(self) -> PathFinder:
+        """The path finder of the collision maze, built again when the maze is replaced."""
+        if not self._path_finder or self._path_finder.collision_maze is not self.collision_maze:
+            self._path_finder = PathFinder(self.collision_maze)
+        return self._path_finder
+
     @mark_as_readable
     def get_address_tiles(self) -> dict:
         return self.address_tiles
@@ -370,6 +384,15 @@ class StanfordTownExtEnv(ExtEnv):
         OUTPUT:
           nearby_tiles: a list of tiles that are within the radius.
         """
+        left_end, right_end, top_end, bottom_end = self._get_nearby_bounds(tile, vision_r)
+        nearby_tiles = []
+        for i in range(left_end, right_end):
+            for j in range(top_end, bottom_end):
+                nearby_tiles += [(i, j)]
+        return nearby_tiles
+
+    def _get_nearby_bounds(self, tile: tuple[int, int], vision_r: int) -> tuple[int, int, int, int]:
+        """The x range [left_end, right_end) and y range [top_end, bottom_end) of the nearby tiles"""
         left_end = 0
         if tile[0] - vision_r > left_end:
             left_end = tile[0] - vision_r
@@ -386,11 +409,48 @@ class StanfordTownExtEnv(ExtEnv):
         if tile[1] - vision_r > top_end:
             top_end = tile[1] - vision_r
 
-        nearby_tiles = []
-        for i in range(left_end, right_end):
-            for j in range(top_end, bottom_end):
-                nearby_tiles += [(i, j)]
-        return nearby_tiles
+        return left_end, right_end, top_end, bottom_end
+
+    @mark_as_readable
+    def observe_events_in_radius(
+        self, tile: tuple[int, int], vision_r: int, arena: Optional[str] = None
+    ) -> list[tuple[str, Optional[str], Optional[str], Optional[str]]]:
+        """
+        Get the events of the nearby tiles, as given by `get_nearby_tiles`, that
+        are in the arena, the closest first. An event on several tiles is listed
+        once, at the distance of the first of them by x, then y.
+
+        INPUT:
+          tile: The tile coordinate of our interest in (x, y) form.
+          vision_r: The radius of the persona's vision.
+          arena: The arena address, e.g. "the Ville:Hobbs Cafe:cafe", the one
+            of the tile by default.
+        OUTPUT:
+          events: a list of event triples ordered by distance to the tile.
+        """
+        x, y = int(tile[0]), int(tile[1])
+        if arena is None:
+            arena = get_arena_path(self.tiles[y][x])
+
+        events = []
+        seen = set()
+        for event_tile in self._get_event_index().get_tiles(arena, *self._get_nearby_bounds((x, y), vision_r)):
+            dist = math.dist(event_tile, (x, y))
+            for event in self.tiles[event_tile[1]][event_tile[0]]["events"]:
+                if event not in seen:
+                    events.append((dist, event))
+                    seen.add(event)
+        events.sort(key=lambda i: i[0])
+        return [event for _, event in events]
+
+    def _get_event_index(self) -> TileEventIndex:
+        if not self._event_index or self._event_index.tiles is not self.tiles:
+            self._event_index = TileEventIndex(self.tiles)
+        return self._event_index
+
+    def _update_event_index(self, tile: tuple[int, int]):
+        if self._event_index and self._event_index.tiles is self.tiles:
+            self._event_index.update(tile)
 
     @mark_as_writeable
     def add_event_from_tile(self, curr_event: tuple[str], tile: tuple[int, int]) -> None:
@@ -406,6 +466,7 @@ class StanfordTownExtEnv(ExtEnv):
           None
         """
         self.tiles[tile[1]][tile[0]]["events"].add(curr_event)
+        self._update_event_index(tile)
 
     @mark_as_writeable
     def remove_event_from_tile(self, curr_event: tuple[str], tile: tuple[int, int]) -> None:
@@ -424,6 +485,7 @@ class StanfordTownExtEnv(ExtEnv):
         for event in curr_tile_ev_cp:
             if event == curr_event:
                 self.tiles[tile[1]][tile[0]]["events"].remove(event)
+        self._update_event_index(tile)
 
     @mark_as_writeable
     def turn_event_from_tile_idle(self, curr_event: tuple[str], tile: tuple[int, int]) -> None:
@@ -449,3 +511,4 @@ class StanfordTownExtEnv(ExtEnv):
         for event in curr_tile_ev_cp:
             if event[0] == subject:
                 self.tiles[tile[1]][tile[0]]["events"].remove(event)
+        self._update_event_index(tile)
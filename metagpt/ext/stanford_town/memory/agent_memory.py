@@ -6,7 +6,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from pydantic import Field, field_serializer, model_validator
+import numpy as np
+from pydantic import Field, PrivateAttr, field_serializer, model_validator
 
 from metagpt.logs import logger
 from metagpt.memory.memory import Memory
@@ -92,6 +93,93 @@ class BasicMemory(Message):
         return memory_dict
 
 
+class MemoryMatrix:
+    """
+    The memories of an AgentMemory as contiguous arrays, row i being storage[i], so that retrieval scores all of them
+    in one numpy pass instead of a Python loop per memory.
+
+    - embeddings: float32 L2-normalized embeddings, the dot product with a normalized query being the cosine similarity
+    - importance: the poignancy of the memories
+    - created: the creation time of the memories in seconds, from which the recency is computed
+    - retrievable: whether the memory is an event or a thought, idle ones excepted
+    """
+
+    def __init__(self):
+        self.nodes: list[BasicMemory] = []
+        self.rows: dict[str, int] = {}  # memory_id -> row
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._importance = np.zeros(0, dtype=np.float32)
+        self._created = np.zeros(0, dtype=np.float64)
+        self._retrievable = np.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._embeddings[: len(self.nodes)]
+
+    @property
+    def importance(self) -> np.ndarray:
+        return self._importance[: len(self.nodes)]
+
+    @property
+    def created(self) -> np.ndarray:
+        return self._created[: len(self.nodes)]
+
+    @property
+    def retrievable(self) -> np.ndarray:
+        return self._retrievable[: len(self.nodes)]
+
+    def is_synced(self, storage: list[BasicMemory]) -> bool:
+        n = len(self.nodes)
+        return n <= len(storage) and (not n or (storage[0] is self.nodes[0] and storage[n - 1] is self.nodes[-1]))
+
+    def extend(self, nodes: list[BasicMemory], embeddings: dict[str, list[float]]):
+        """Append rows for the nodes, a node without embedding being never relevant."""
+        if not nodes:
+            return
+        vectors = [embeddings.get(i.embedding_key) for i in nodes]
+        dim = self._embeddings.shape[1] or next((len(v) for v in vectors if v is not None), 0)
+        start, end = len(self.nodes), len(self.nodes) + len(nodes)
+        self._reserve(end, dim)
+
+        block = np.zeros((len(nodes), dim), dtype=np.float32)
+        for i, v in enumerate(vectors):
+            if v is not None:
+                block[i] = v
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        self._embeddings[start:end] = np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+        self._importance[start:end] = [i.poignancy for i in nodes]
+        self._created[start:end] = [to_seconds(i.created) for i in nodes]
+        self._retrievable[start:end] = [
+            i.memory_type in ("event", "thought") and "idle" not in (i.embedding_key or "") for i in nodes
+        ]
+        for i, node in enumerate(nodes, start=start):
+            self.rows[node.memory_id] = i
+        self.nodes.extend(nodes)
+
+    def _reserve(self, size: int, dim: int):
+        """Grow the arrays geometrically, so that appending a memory is amortized O(1)."""
+        capacity = len(self._importance)
+        if size <= capacity and dim == self._embeddings.shape[1]:
+            return
+        capacity = max(size, 2 * capacity, 64)
+        embeddings = np.zeros((capacity, dim), dtype=np.float32)
+        embeddings[: len(self.nodes), : self._embeddings.shape[1]] = self.embeddings
+        self._embeddings = embeddings
+        for name in ("_importance", "_created", "_retrievable"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: len(self.nodes)] = old[: len(self.nodes)]
+            setattr(self, name, new)
+
+
+def to_seconds(time: Optional[datetime]) -> float:
+    """Seconds since datetime.min, not since the epoch, to stay independent of the local timezone."""
+    return (time - datetime.min).total_seconds() if time else 0.0
+
+
 class AgentMemory(Memory):
     """
     GA中主要存储三种JSON
@@ -115,6 +203,16 @@ class AgentMemory(Memory):
     memory_saved: Optional[Path] = Field(default=None)
     embeddings: dict[str, list[float]] = dict()
 
+    _matrix: MemoryMatrix = PrivateAttr(default_factory=MemoryMatrix)
+
+    @property
+    def matrix(self) -> MemoryMatrix:
+        """The memories of storage as arrays, appended with the memories added since the last access."""
+        if not self._matrix.is_synced(self.storage):
+            self._matrix = MemoryMatrix()
+        self._matrix.extend(self.storage[len(self._matrix) :], self.embeddings)
+        return self._matrix
+
     def set_mem_path(self, memory_saved: Path):
         self.memory_saved = memory_saved
         self.load(memory_saved)
@@ -522,7 +522,7 @@ async def _long_term_planning(role: "STRole", new_day: bool):
         role.scratch.daily_req = await GenDailySchedule().run(role, wake_up_hour)
         logger.info(f"Role: {role.name} daily requirements: {role.scratch.daily_req}")
     elif new_day == "New day":
-        revise_identity(role)
+        await revise_identity(role)
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - TODO
         # We need to create a new daily_req here...
@@ -545,7 +545,7 @@ async def _long_term_planning(role: "STRole", new_day: bool):
     s, p, o = (role.scratch.name, "plan", role.scratch.curr_time.strftime("%A %B %d"))
     keywords = set(["plan"])
     thought_poignancy = 5
-    thought_embedding_pair = (thought, get_embedding(thought))
+    thought_embedding_pair = (thought, await get_embedding(thought))
     role.a_mem.add_thought(
         created, expiration, s, p, o, thought, keywords, thought_poignancy, thought_embedding_pair, None
     )
@@ -655,14 +655,14 @@ async def _determine_action(role: "STRole"):
     role.scratch.add_new_action(**new_action_details)
 
 
-def revise_identity(role: "STRole"):
+async def revise_identity(role: "STRole"):
     p_name = role.scratch.name
 
     focal_points = [
         f"{p_name}'s plan for {role.scratch.get_str_curr_date_str()}.",
         f"Important recent events for {p_name}'s life.",
     ]
-    retrieved = new_agent_retrieve(role, focal_points)
+    retrieved = await new_agent_retrieve(role, focal_points)
 
     statements = "[Statements]\n"
     for key, val in retrieved.items():
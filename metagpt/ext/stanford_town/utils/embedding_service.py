@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : embedding service shared by the roles of the town, cached and batched
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from openai import AsyncOpenAI
+
+from metagpt.config2 import config
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_CACHE_ROOT = CONFIG_ROOT / "stanford_town" / "embeddings"
+
+# embeds a batch of texts, returning their embeddings in the same order
+EmbedFunc = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingService:
+    """
+    Embeddings of the texts of the town, shared by all the roles.
+
+    - cached: a text is embedded once, the embeddings being kept in memory and appended to a JSON lines file at
+      `cache_path`, so that they survive restarts
+    - batched: the texts requested concurrently within `batch_wait` seconds are embedded by one call of `embed_func`,
+      at most `max_batch_size` texts per call, and a text requested again while in flight is not requested twice
+    - non-blocking: a failed call is retried up to `max_retries` times, waiting with `asyncio.sleep` and doubling the
+      delay every time
+
+    `embed_func` calls the OpenAI embeddings API by default. Any local model can stand in for it, e.g.
+    `EmbeddingService(embed_func=HashEmbedding().aget_text_embedding_batch)` to run the town offline.
+    """
+
+    def __init__(
+        self,
+        embed_func: Optional[EmbedFunc] = None,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        cache_path: Optional[Path] = None,
+        max_batch_size: int = 64,
+        batch_wait: float = 0.01,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+    ):
+        self.embed_func = embed_func or self._openai_embed
+        self.model = model
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._cache: dict[str, list[float]] = {}
+        self._pending: dict[str, asyncio.Future] = {}  # text -> embedding, queued or in flight
+        self._queue: list[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._client: Optional[AsyncOpenAI] = None
+        if self.cache_path:
+            self._load()
+
+    def __len__(self):
+        return len(self._cache)
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        return (await self.aget_embeddings([text]))[0]
+
+    async def aget_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Return the embeddings of the texts, requesting those not cached with the other pending requests."""
+        texts = [normalize_text(i) for i in texts]
+        waiting = {}
+        for text in texts:
+            if text in self._cache or text in waiting:
+                continue
+            if text not in self._pending:
+                self._pending[text] = asyncio.get_running_loop().create_future()
+                self._queue.append(text)
+            waiting[text] = self._pending[text]
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._queue and not self._flush_handle:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_wait, self._flush)
+
+        if waiting:
+            # shielded, a caller being cancelled must not cancel the embeddings the other callers wait for
+            results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            embeddings = dict(zip(waiting, results))
+            return [self._cache.get(text) or embeddings[text] for text in texts]
+        return [self._cache[text] for text in texts]
+
+    def _flush(self):
+        """Send the queued texts, in batches of at most max_batch_size."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            batch, self._queue = self._queue[: self.max_batch_size], self._queue[self.max_batch_size :]
+            task = asyncio.create_task(self._embed_batch(batch))
+            self._tasks.add(task)  # keep a reference until done
+            task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(self, batch: list[str]):
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                embeddings = await self.embed_func(batch)
+                break
+            except Exception as exp:
+                if attempt == self.max_retries:
+                    logger.warning(f"get_embedding failed {attempt} times, exp: {exp}")
+                    error = ValueError(f"get_embedding failed: {exp}")
+                    for text in batch:
+                        future = self._pending.pop(text, None)
+                        if future and not future.done():
+                            future.set_exception(error)
+                    return
+                logger.info(f"get_embedding failed, exp: {exp}, will retry in {delay}s.")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        self._cache.update(zip(batch, embeddings))
+        self._save(batch)
+        for text, embedding in zip(batch, embeddings):
+            future = self._pending.pop(text, None)
+            if future and not future.done():
+                future.set_result(embedding)
+
+    async def _openai_embed(self, texts: list[str]) -> list[list[float]]:
+        if not self._client:
+            self._client = AsyncOpenAI(api_key=config.llm.api_key)
+        rsp = await self._client.embeddings.create(input=texts, model=self.model)
+        return [i.embedding for i in sorted(rsp.data, key=lambda i: i.index)]
+
+    def _load(self):
+        if not self.cache_path.exists():
+            return
+        with open(self.cache_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:  # torn by an interrupted write
+                    continue
+                self._cache[item["text"]] = item["embedding"]
+
+    def _save(self, texts: list[str]):
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [json.dumps({"text": text, "embedding": self._cache[text]}) + "\n" for text in texts]
+        with open(self.cache_path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+def normalize_text(text: str) -> str:
+    text = text.replace("\n", " ")
+    return text or "this is blank"
+
+
+_services: dict[str, EmbeddingService] = {}
+
+
+def get_embedding_service(model: str = DEFAULT_EMBEDDING_MODEL) -> EmbeddingService:
+    """The service shared by all the roles for the model, cached under ~/.metagpt/stanford_town/embeddings."""
+    if model not in _services:
+        _services[model] = EmbeddingService(model=model, cache_path=EMBEDDING_CACHE_ROOT / f"{model}.jsonl")
+    return _services[model]
+
+
+def set_embedding_service(service: EmbeddingService):
+    """Replace the service of its model, e.g. with one of a local embedding model."""
+    _services[service.model] = service
@@ -7,13 +7,16 @@
 @Modified By: mashenquan, 2023-11-1. According to RFC 116: Updated the type of index key.
 """
 from collections import defaultdict
-from typing import DefaultDict, Iterable, Set
+from pathlib import Path
+from typing import Callable, DefaultDict, Iterable, Optional, Set
 
-from pydantic import BaseModel, Field, SerializeAsAny
+from pydantic import BaseModel, Field, PrivateAttr, SerializeAsAny
 
 from metagpt.const import IGNORED_MESSAGE_ID
+from metagpt.memory.memory_segment import MemorySegment, SegmentEntry
 from metagpt.schema import Message
 from metagpt.utils.common import any_to_str, any_to_str_set
+from metagpt.utils.inverted_index import InvertedIndex
 
 
 class Memory(BaseModel):
@@ -22,85 +25,314 @@ class Memory(BaseModel):
     storage: list[SerializeAsAny[Message]] = []
     index: DefaultDict[str, list[SerializeAsAny[Message]]] = Field(default_factory=lambda: defaultdict(list))
     ignore_id: bool = False
+    # Max number of messages kept in RAM, 0 means unbounded. Once exceeded, the oldest quarter of the window is
+    # spilled to the append-only segment at `spill_path`, required then, and paged back in on demand. A role sets both,
+    # see `Role._init_memory`.
+    window_size: int = 0
+    spill_path: Optional[Path] = None
+
+    # Secondary indexes, rebuilt from `storage` whenever they fall out of sync (e.g. after deserialization).
+    _id_index: dict[str, Message] = PrivateAttr(default_factory=dict)
+    _role_index: DefaultDict[str, list[Message]] = PrivateAttr(default_factory=lambda: defaultdict(list))
+    _send_to_index: DefaultDict[str, list[Message]] = PrivateAttr(default_factory=lambda: defaultdict(list))
+    _indexed_count: int = PrivateAttr(default=0)
+    # id() of each in-RAM message -> its rank in insertion order. Storage and every bucket list messages in that order,
+    # so a message is found in any of them by binary search.
+    _ranks: dict[int, int] = PrivateAttr(default_factory=dict)
+    _next_rank: int = PrivateAttr(default=0)
+    _segment: Optional[MemorySegment] = PrivateAttr(default=None)
+    # Full-text index over message contents keyed by message id, built on the first keyword query.
+    _text_index: Optional[InvertedIndex] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        if self.window_size and not self.spill_path:
+            raise ValueError("A memory with a window_size needs a spill_path to spill the older messages to.")
+        # A deserialized `index` holds copies of the stored messages; point it back at the stored objects themselves.
+        self._rebuild_action_index()
+        self._rebuild_index()
+
+    def __eq__(self, other):
+        # Private indexes are derived from the fields, so they take no part in equality.
+        if not isinstance(other, Memory):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    @property
+    def segment(self) -> Optional[MemorySegment]:
+        """The on-disk segment of spilled messages, None if nothing can have been spilled"""
+        if self._segment is None and self.spill_path:
+            self._segment = MemorySegment(self.spill_path)
+        return self._segment
+
+    def _rebuild_index(self):
+        self._id_index = {}
+        self._role_index = defaultdict(list)
+        self._send_to_index = defaultdict(list)
+        self._indexed_count = 0
+        self._ranks = {}
+        self._next_rank = 0
+        for message in self.storage:
+            self._index_message(message)
+
+    def _rebuild_action_index(self):
+        self.index = defaultdict(list, {action: [] for action in self.index})  # keep the keys lookups have created
+        for message in self.storage:
+            if message.cause_by:
+                self.index[message.cause_by].append(message)
+
+    def _ensure_index(self):
+        if self._indexed_count != len(self.storage):
+            self._rebuild_index()
+            self._text_index = None
+
+    @property
+    def text_index(self) -> InvertedIndex:
+        """The full-text index over all messages, including spilled ones"""
+        self._ensure_index()
+        if self._text_index is None:
+            self._text_index = InvertedIndex()
+            for message in self._iter_all():
+                self._text_index.add(message.id, message.content)
+        return self._text_index
+
+    def _index_message(self, message: Message):
+        self._id_index[message.id] = message
+        self._role_index[message.role].append(message)
+        for address in message.send_to:
+            self._send_to_index[address].append(message)
+        self._ranks[id(message)] = self._next_rank
+        self._next_rank += 1
+        self._indexed_count += 1
+
+    def _unindex_message(self, message: Message):
+        """Remove the message from storage and from all the indexes"""
+        self._remove(self.storage, message)
+        if self._id_index.get(message.id) is message:
+            del self._id_index[message.id]
+        self._remove_from_bucket(self._role_index, message.role, message)
+        for address in message.send_to:
+            self._remove_from_bucket(self._send_to_index, address, message)
+        if message.cause_by:
+            self._remove(self.index.get(message.cause_by), message)
+        if self._text_index is not None:
+            self._text_index.remove(message.id, message.content)
+        self._ranks.pop(id(message), None)
+        self._indexed_count -= 1
+
+    def _remove(self, messages: Optional[list[Message]], message: Message):
+        """Remove `message` itself (not merely an equal copy) from `messages`, found by its rank in O(log n)."""
+        if not messages:
+            return
+        rank = self._ranks.get(id(message))
+        if rank is not None:
+            ranks = self._ranks
+            low, high = 0, len(messages)
+            while low < high:
+                mid = (low + high) // 2
+                mid_rank = ranks.get(id(messages[mid]))
+                if mid_rank is None:  # a message that was never indexed, e.g. put in `storage` directly
+                    break
+                if mid_rank < rank:
+                    low = mid + 1
+                else:
+                    high = mid
+            else:
+                if low < len(messages) and messages[low] is message:
+                    del messages[low]
+                    return
+        _remove_identical(messages, message)
+
+    def _remove_from_bucket(self, index: dict[str, list[Message]], key: str, message: Message):
+        """Remove `message` from `index[key]`, dropping the key once its bucket is empty."""
+        self._remove(index.get(key), message)
+        if key in index and not index[key]:
+            del index[key]
+
+    def _find(self, message: Message) -> Optional[Message]:
+        """Return the in-RAM message equal to `message`, looked up by id unless ids are ignored."""
+        self._ensure_index()
+        if not self.ignore_id:
+            return self._id_index.get(message.id)
+        for i in self.storage:
+            if i == message:
+                return i
+        return None
+
+    def _is_spilled(self, message: Message) -> bool:
+        segment = self.segment
+        if not segment or not segment.count():
+            return False
+        if not self.ignore_id:
+            return segment.contains_id(message.id)
+        return segment.contains_message(message)
+
+    def _is_stored(self, message: Message) -> bool:
+        return self._find(message) is not None or self._is_spilled(message)
+
+    def _spill(self):
+        """Move the oldest messages out of RAM into the segment once the window overflows."""
+        if not self.window_size or len(self.storage) <= self.window_size or not self.segment:
+            return
+        keep = self.window_size - self.window_size // 4
+        spilled = self.storage[: len(self.storage) - keep]
+        self.storage = self.storage[len(self.storage) - keep :]
+        self.segment.append(spilled)
+        self._rebuild_action_index()
+        self._rebuild_index()
+
+    def contains(self, message: Message) -> bool:
+        """Return True if `add` would treat the message as already stored"""
+        if self.ignore_id and message.id != IGNORED_MESSAGE_ID:
+            message = message.model_copy(update={"id": IGNORED_MESSAGE_ID})
+        return self._is_stored(message)
 
     def add(self, message: Message):
         """Add a new message to storage, while updating the index"""
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
-        if message in self.storage:
+        if self._is_stored(message):
             return
         self.storage.append(message)
+        self._index_message(message)
+        if self._text_index is not None:
+            self._text_index.add(message.id, message.content)
         if message.cause_by:
             self.index[message.cause_by].append(message)
+        self._spill()
 
     def add_batch(self, messages: Iterable[Message]):
         for message in messages:
             self.add(message)
 
+    def _with_spilled(self, predicate: Callable[[SegmentEntry], bool], in_ram: list[Message]) -> list[Message]:
+        segment = self.segment
+        if not segment or not segment.count():
+            return list(in_ram)
+        return segment.filter(predicate) + in_ram
+
     def get_by_role(self, role: str) -> list[Message]:
         """Return all messages of a specified role"""
-        return [message for message in self.storage if message.role == role]
+        self._ensure_index()
+        return self._with_spilled(lambda e: e.role == role, self._role_index.get(role, []))
+
+    def get_by_send_to(self, address: str) -> list[Message]:
+        """Return all messages addressed to a specified address"""
+        self._ensure_index()
+        return self._with_spilled(lambda e: address in e.send_to, self._send_to_index.get(address, []))
 
     def get_by_content(self, content: str) -> list[Message]:
         """Return all messages containing a specified content"""
-        return [message for message in self.storage if content in message.content]
+        return [message for message in self._iter_candidates(content) if content in message.content]
+
+    def _iter_candidates(self, substring: str) -> Iterable[Message]:
+        """Iterate over the messages that may contain `substring`, oldest first"""
+        if self.ignore_id:
+            return self._iter_all()
+        msg_ids = self.text_index.candidates(substring)
+        if msg_ids is None:
+            return self._iter_all()
+        return self._get_by_ids(msg_ids)
+
+    def _get_by_ids(self, msg_ids: list[str]) -> list[Message]:
+        """Return the messages with the given ids in the given order, paging spilled ones back in"""
+        self._ensure_index()
+        found = {i: self._id_index[i] for i in msg_ids if i in self._id_index}
+        if self.segment and len(found) < len(msg_ids):
+            found.update(self.segment.get_by_ids(i for i in msg_ids if i not in found))
+        return [found[i] for i in msg_ids if i in found]
+
+    def search(self, query: str, k: int = 5) -> list[Message]:
+        """Return the k messages most relevant to the query by BM25, all matching ones when k=0"""
+        if self.ignore_id:
+            raise ValueError("Ranked search needs unique message ids, it is unavailable when `ignore_id` is set")
+        return self._get_by_ids([msg_id for msg_id, _ in self.text_index.search(query, top_k=k)])
+
+    def _iter_all(self) -> Iterable[Message]:
+        """Iterate over spilled messages, then in-RAM ones, oldest first"""
+        if self.segment:
+            yield from self.segment.iter_messages()
+        yield from self.storage
 
     def delete_newest(self) -> "Message":
         """delete the newest message from the storage"""
+        self._ensure_index()
         if len(self.storage) > 0:
-            newest_msg = self.storage.pop()
-            if newest_msg.cause_by and newest_msg in self.index[newest_msg.cause_by]:
-                self.index[newest_msg.cause_by].remove(newest_msg)
+            newest_msg = self.storage[-1]
+            self._unindex_message(newest_msg)
         else:
             newest_msg = None
         return newest_msg
 
     def delete(self, message: Message):
-        """Delete the specified message from storage, while updating the index"""
+        """Delete the specified message from storage, while updating the index. Spilled messages are read-only."""
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
-        self.storage.remove(message)
-        if message.cause_by and message in self.index[message.cause_by]:
-            self.index[message.cause_by].remove(message)
+        stored = self._find(message)
+        if stored is None:
+            raise ValueError(f"{message} is not in memory")
+        self._unindex_message(stored)
 
     def clear(self):
         """Clear storage and index"""
         self.storage = []
         self.index = defaultdict(list)
+        self._rebuild_index()
+        self._text_index = None
+        if self.segment:
+            self.segment.clear()
 
     def count(self) -> int:
         """Return the number of messages in storage"""
-        return len(self.storage)
+        spilled = self.segment.count() if self.segment else 0
+        return spilled + len(self.storage)
 
     def try_remember(self, keyword: str) -> list[Message]:
         """Try to recall all messages containing a specified keyword"""
-        return [message for message in self.storage if keyword in message.content]
+        return [message for message in self._iter_candidates(keyword) if keyword in message.content]
 
     def get(self, k=0) -> list[Message]:
         """Return the most recent k memories, return all when k=0"""
+        if (k == 0 or k > len(self.storage)) and self.segment and self.segment.count():
+            return self.segment.tail(k - len(self.storage) if k else 0) + self.storage
         return self.storage[-k:]
 
     def find_news(self, observed: list[Message], k=0) -> list[Message]:
         """find news (previously unseen messages) from the the most recent k memories, from all memories when k=0"""
+        if k == 0 or k >= self.count():
+            return [i for i in observed if not self._is_stored(i)]
         already_observed = self.get(k)
-        news: list[Message] = []
-        for i in observed:
-            if i in already_observed:
-                continue
-            news.append(i)
-        return news
+        if self.ignore_id:
+            return [i for i in observed if i not in already_observed]
+        observed_ids = {i.id for i in already_observed}
+        return [i for i in observed if i.id not in observed_ids]
 
     def get_by_action(self, action) -> list[Message]:
         """Return all messages triggered by a specified Action"""
         index = any_to_str(action)
-        return self.index[index]
+        segment = self.segment
+        if not segment or not segment.count():
+            return self.index[index]
+        return segment.filter(lambda e: e.cause_by == index) + self.index[index]
 
     def get_by_actions(self, actions: Set) -> list[Message]:
         """Return all messages triggered by specified Actions"""
         rsp = []
         indices = any_to_str_set(actions)
+        segment = self.segment
+        if segment and segment.count():
+            rsp += segment.filter(lambda e: e.cause_by in indices)
         for action in indices:
             if action not in self.index:
                 continue
             rsp += self.index[action]
         return rsp
+
+
+def _remove_identical(messages: Optional[list[Message]], message: Message):
+    """Remove `message` itself (not merely an equal copy) from `messages`, scanning from the newest end."""
+    if not messages:
+        return
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i] is message:
+            del messages[i]
+            return
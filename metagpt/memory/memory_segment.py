@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc   : Append-only on-disk segment for messages spilled out of the in-RAM window of `Memory`.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from metagpt.schema import Message
+
+
+class SegmentEntry(NamedTuple):
+    """Catalogue record of one spilled message; the message body stays on disk."""
+
+    offset: int
+    id: str
+    role: str
+    cause_by: str
+    send_to: frozenset
+
+
+class MemorySegment:
+    """A JSONL file holding spilled messages, one `Message.dump()` per line, oldest first.
+
+    Only a small catalogue (byte offset, id, role, cause_by, send_to) is kept in RAM, so paging messages back in
+    reads just the lines that are needed. The catalogue is rebuilt lazily from the file on first use.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Optional[list[SegmentEntry]] = None
+        self._by_id: dict[str, SegmentEntry] = {}
+        self._digests: Optional[set[bytes]] = None  # of the lines, built on the first `contains_message`
+
+    @property
+    def entries(self) -> list[SegmentEntry]:
+        if self._entries is None:
+            self._load_catalogue()
+        return self._entries
+
+    def _load_catalogue(self):
+        self._entries = []
+        self._by_id = {}
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as reader:
+            offset = 0
+            for line in reader:
+                if line.strip():
+                    self._catalogue(offset, json.loads(line))
+                offset += len(line)
+
+    def _catalogue(self, offset: int, data: dict):
+        entry = SegmentEntry(
+            offset=offset,
+            id=data.get("id", ""),
+            role=data.get("role", "user"),
+            cause_by=data.get("cause_by", ""),
+            send_to=frozenset(data.get("send_to", [])),
+        )
+        self._entries.append(entry)
+        self._by_id[entry.id] = entry
+
+    def count(self) -> int:
+        return len(self.entries)
+
+    def contains_id(self, msg_id: str) -> bool:
+        _ = self.entries
+        return msg_id in self._by_id
+
+    def contains_message(self, message: Message) -> bool:
+        """Whether a message equal to `message` was spilled, ids included, by the digest of its dump."""
+        if self._digests is None:
+            self._digests = set()
+            if self.path.exists():
+                with open(self.path, "rb") as reader:
+                    self._digests.update(_digest(line.rstrip(b"\n")) for line in reader if line.strip())
+        return _digest(message.dump().encode("utf-8")) in self._digests
+
+    def get_by_ids(self, msg_ids: Iterable[str]) -> dict[str, Message]:
+        """Page the spilled messages with the given ids back in, keyed by id; unknown ids are skipped."""
+        _ = self.entries
+        entries = [self._by_id[i] for i in msg_ids if i in self._by_id]
+        return {entry.id: message for entry, message in zip(entries, self.read(entries))}
+
+    def append(self, messages: list[Message]):
+        """Append messages to the end of the segment."""
+        _ = self.entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as writer:
+            offset = writer.tell()
+            for message in messages:
+                line = message.dump().encode("utf-8") + b"\n"
+                writer.write(line)
+                if self._digests is not None:
+                    self._digests.add(_digest(line.rstrip(b"\n")))
+                self._catalogue(offset, json.loads(line))
+                offset += len(line)
+
+    def read(self, entries: list[SegmentEntry]) -> list[Message]:
+        """Page the messages of the given catalogue entries back in from disk."""
+        if not entries:
+            return []
+        messages = []
+        with open(self.path, "rb") as reader:
+            for entry in entries:
+                reader.seek(entry.offset)
+                messages.append(Message.load(reader.readline().decode("utf-8")))
+        return messages
+
+    def tail(self, k: int = 0) -> list[Message]:
+        """Return the newest k spilled messages, all of them when k=0"""
+        return self.read(self.entries[-k:] if k else self.entries)
+
+    def filter(self, predicate: Callable[[SegmentEntry], bool]) -> list[Message]:
+        """Return the spilled messages whose catalogue entry satisfies `predicate`."""
+        return self.read([entry for entry in self.entries if predicate(entry)])
+
+    def iter_messages(self) -> Iterator[Message]:
+        """Stream all spilled messages without holding them in memory at once."""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as reader:
+            for line in reader:
+                if line.strip():
+                    yield Message.load(line)
+
+    def clear(self):
+        """Remove all spilled messages."""
+        self.path.unlink(missing_ok=True)
+        self._entries = []
+        self._by_id = {}
+        self._digests = None
+
+
+def _digest(line: bytes) -> bytes:
+    return hashlib.blake2b(line, digest_size=16).digest()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc    : Admission control for LLM requests: max in-flight requests, request/token per minute budgets and
+    priority ordering of queued requests, shared by every LLM instance built from an equivalent LLMConfig.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import NamedTuple, Optional
+
+from metagpt.configs.llm_config import LLMConfig
+from metagpt.logs import logger
+
+
+class AdmissionMetrics(NamedTuple):
+    """Snapshot of an admission controller's queue"""
+
+    in_flight: int
+    queue_depth: int
+    max_queue_depth: int
+    total_admitted: int
+    total_wait_time: float
+
+
+class AdmissionController:
+    """Admit LLM requests once they fit in the concurrency, RPM and TPM budgets, highest priority first.
+
+    A limit of 0 disables that budget. Token budgets are charged with the estimated prompt tokens on admission and
+    topped up with the completion tokens through `record_tokens`. A single request larger than the token budget is
+    admitted once the window is otherwise empty, so it cannot block the queue forever.
+    """
+
+    def __init__(self, max_concurrency: int = 0, rpm: int = 0, tpm: int = 0, period: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.period = period
+
+        self._in_flight = 0
+        self._requests: deque[float] = deque()  # admission timestamps within the last period
+        self._tokens: deque[tuple[float, int]] = deque()  # (timestamp, tokens) within the last period
+        self._window_tokens = 0
+        self._waiters: list[tuple[int, int, asyncio.Future, int]] = []  # heap of (-priority, seq, future, tokens)
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._max_queue_depth = 0
+        self._total_admitted = 0
+        self._total_wait_time = 0.0
+
+    @property
+    def metrics(self) -> AdmissionMetrics:
+        return AdmissionMetrics(
+            in_flight=self._in_flight,
+            queue_depth=len(self._waiters),
+            max_queue_depth=self._max_queue_depth,
+            total_admitted=self._total_admitted,
+            total_wait_time=self._total_wait_time,
+        )
+
+    @asynccontextmanager
+    async def admit(self, tokens: int = 0, priority: int = 0):
+        """Hold a slot for the duration of one request. Higher `priority` is admitted first."""
+        await self.acquire(tokens=tokens, priority=priority)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    async def acquire(self, tokens: int = 0, priority: int = 0):
+        self._bind_loop()
+        start = time.monotonic()
+        if not self._waiters and self._can_admit(tokens, start):
+            self._admit(tokens, start)
+            return
+
+        future = self._loop.create_future()
+        entry = (-priority, next(self._seq), future, tokens)
+        heapq.heappush(self._waiters, entry)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # admitted right before being cancelled
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._dispatch()
+            raise
+        self._total_wait_time += time.monotonic() - start
+
+    def _bind_loop(self):
+        """Queued futures and timers belong to one event loop, drop the state left behind by a previous loop."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._in_flight = 0
+        self._waiters = []
+        self._timer = None
+
+    def release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    def record_tokens(self, tokens: int):
+        """Charge tokens known only after the request, e.g. the completion, to the current window."""
+        if self.tpm and tokens > 0:
+            self._tokens.append((time.monotonic(), tokens))
+            self._window_tokens += tokens
+
+    def _expire(self, now: float):
+        while self._requests and now - self._requests[0] >= self.period:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= self.period:
+            self._window_tokens -= self._tokens.popleft()[1]
+
+    def _can_admit(self, tokens: int, now: float) -> bool:
+        self._expire(now)
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return False
+        if self.rpm and len(self._requests) >= self.rpm:
+            return False
+        if self.tpm and self._tokens and self._window_tokens + tokens > self.tpm:
+            return False
+        return True
+
+    def _admit(self, tokens: int, now: float):
+        self._in_flight += 1
+        self._total_admitted += 1
+        if self.rpm:
+            self._requests.append(now)
+        self.record_tokens(tokens)
+
+    def _dispatch(self):
+        """Admit queued requests in priority order while budgets allow, else wake up when the window slides."""
+        now = time.monotonic()
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_admit(tokens, now):
+                break
+            heapq.heappop(self._waiters)
+            self._admit(tokens, now)
+            future.set_result(None)
+        if self._waiters and not self._timer:
+            delay = self._next_expiry(now)
+            if delay is not None:
+                self._timer = self._loop.call_later(delay, self._on_timer)
+
+    def _next_expiry(self, now: float) -> Optional[float]:
+        stamps = [self._requests[0]] if self._requests else []
+        if self._tokens:
+            stamps.append(self._tokens[0][0])
+        if not stamps:
+            return None
+        return max(0.0, min(stamps) + self.period - now)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+
+_controllers: dict[tuple, AdmissionController] = {}
+
+
+def get_admission_controller(config: LLMConfig) -> Optional[AdmissionController]:
+    """Return the controller shared by every LLM built from an equivalent config, None if no limit is set.
+
+    The limits are part of the key, so a config with other limits for the same endpoint gets a controller enforcing
+    its own limits rather than the ones of the first config seen.
+    """
+    if not (config.max_concurrency or config.rpm or config.tpm):
+        return None
+    key = (
+        config.api_type,
+        config.base_url,
+        config.api_key,
+        config.model,
+        config.max_concurrency,
+        config.rpm,
+        config.tpm,
+    )
+    controller = _controllers.get(key)
+    if controller is None:
+        controller = AdmissionController(max_concurrency=config.max_concurrency, rpm=config.rpm, tpm=config.tpm)
+        _controllers[key] = controller
+        logger.debug(f"LLM admission control enabled for {config.api_type} {config.model}")
+    return controller
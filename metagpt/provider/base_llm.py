@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import Optional, Union
 
 from openai import AsyncOpenAI
@@ -24,10 +25,13 @@ from tenacity import (
 
 from metagpt.configs.llm_config import LLMConfig
 from metagpt.const import LLM_API_TIMEOUT, USE_CONFIG_TIMEOUT
-from metagpt.logs import logger
+from metagpt.logs import log_llm_stream, logger
+from metagpt.provider.admission_controller import get_admission_controller
+from metagpt.provider.response_cache import get_response_cache, make_cache_key
 from metagpt.schema import Message
 from metagpt.utils.common import log_and_reraise
 from metagpt.utils.cost_manager import CostManager, Costs
+from metagpt.utils.token_counter import count_input_tokens, count_output_tokens
 
 
 class BaseLLM(ABC):
@@ -42,6 +46,7 @@ class BaseLLM(ABC):
     cost_manager: Optional[CostManager] = None
     model: Optional[str] = None  # deprecated
     pricing_plan: Optional[str] = None
+    priority: int = 0  # requests with a higher priority are admitted first when `LLMConfig` limits are hit
 
     @abstractmethod
     def __init__(self, config: LLMConfig):
@@ -198,11 +203,65 @@ class BaseLLM(ABC):
         self, messages: list[dict], stream: bool = False, timeout: int = USE_CONFIG_TIMEOUT
     ) -> str:
         """Asynchronous version of completion. Return str. Support stream-print"""
+        return await self._cached_acompletion_text(messages, stream=stream, timeout=timeout)
+
+    async def _cached_acompletion_text(
+        self, messages: list[dict], stream: bool = False, timeout: int = USE_CONFIG_TIMEOUT
+    ) -> str:
+        """Answer from the response cache when enabled, otherwise request a completion under admission control."""
+        cache = get_response_cache(self.config)
+        key = None
+        if cache is not None:
+            key = make_cache_key(self.config, messages, model=self.model)
+            rsp = cache.get(key)
+            if self.cost_manager:
+                self.cost_manager.update_cache(hit=rsp is not None)
+            if rsp is not None:
+                if stream:
+                    log_llm_stream(rsp)
+                    log_llm_stream("\n")
+                return rsp
+
+        async with self._admission(messages) as record_output:
+            rsp = await self._acompletion_text(messages, stream=stream, timeout=timeout)
+            record_output(rsp)
+        if cache is not None and rsp:
+            cache.set(key, rsp)
+        return rsp
+
+    async def _acompletion_text(
+        self, messages: list[dict], stream: bool = False, timeout: int = USE_CONFIG_TIMEOUT
+    ) -> str:
         if stream:
             return await self._achat_completion_stream(messages, timeout=self.get_timeout(timeout))
         resp = await self._achat_completion(messages, timeout=self.get_timeout(timeout))
         return self.get_choice_text(resp)
 
+    @asynccontextmanager
+    async def _admission(self, messages):
+        """Hold a request slot under the limits set in `LLMConfig`, yielding a callback that charges the output
+        tokens of the request to the token budget."""
+        controller = get_admission_controller(self.config)
+        if not controller:
+            yield lambda output: None
+            return
+
+        def record_output(output):
+            if controller.tpm and output:
+                controller.record_tokens(self._count_tokens(count_output_tokens, output))
+
+        tokens = self._count_tokens(count_input_tokens, messages) if controller.tpm else 0
+        async with controller.admit(tokens=tokens, priority=self.priority):
+            yield record_output
+
+    def _count_tokens(self, counter, content) -> int:
+        """Count tokens with `counter` for the current model, falling back to ~4 characters per token."""
+        model = self.pricing_plan or self.model or self.config.model
+        try:
+            return counter(content, model)
+        except Exception:
+            return len(str(content)) // 4
+
     def get_choice_text(self, rsp: dict) -> str:
         """Required to provide the first text of choice"""
         return rsp.get("choices")[0]["message"]["content"]
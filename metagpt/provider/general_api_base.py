@@ -37,6 +37,8 @@ import logging
 import openai
 from openai import version
 
+from metagpt.utils.ahttp_client import get_session
+
 logger = logging.getLogger("openai")
 
 TIMEOUT_SECS = 600
@@ -413,6 +415,8 @@ class APIRequestor:
                     async for r in resp:
                         yield r
                 finally:
+                    # hand the connection back to the shared pool even if the stream is not fully consumed
+                    result.release()
                     await ctx.__aexit__(None, None, None)
 
             return wrap_resp(), got_stream, self.api_key
@@ -618,5 +622,5 @@ class APIRequestor:
 
 @asynccontextmanager
 async def aiohttp_session() -> AsyncIterator[aiohttp.ClientSession]:
-    async with aiohttp.ClientSession() as session:
-        yield session
+    # The shared keep-alive session outlives each request, it is closed on `Team` shutdown or with the event loop.
+    yield await get_session()
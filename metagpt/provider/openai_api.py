@@ -34,6 +34,7 @@ from metagpt.utils.common import CodeParser, decode_image, log_and_reraise
 from metagpt.utils.cost_manager import CostManager
 from metagpt.utils.exceptions import handle_exception
 from metagpt.utils.token_counter import (
+    StreamTokenCounter,
     count_input_tokens,
     count_output_tokens,
     get_max_completion_tokens,
@@ -92,6 +93,7 @@ class OpenAILLM(BaseLLM):
         )
         usage = None
         collected_messages = []
+        token_counter = self._stream_token_counter()
         async for chunk in response:
             chunk_message = chunk.choices[0].delta.content or "" if chunk.choices else ""  # extract the message
             finish_reason = (
@@ -99,6 +101,8 @@ class OpenAILLM(BaseLLM):
             )
             log_llm_stream(chunk_message)
             collected_messages.append(chunk_message)
+            if token_counter:
+                token_counter.add(chunk_message)
             if finish_reason:
                 if hasattr(chunk, "usage") and chunk.usage is not None:
                     # Some services have usage as an attribute of the chunk, such as Fireworks
@@ -117,7 +121,8 @@ class OpenAILLM(BaseLLM):
         full_reply_content = "".join(collected_messages)
         if not usage:
             # Some services do not provide the usage attribute, such as OpenAI or OpenLLM
-            usage = self._calc_usage(messages, full_reply_content)
+            completion_tokens = token_counter.count if token_counter else None
+            usage = self._calc_usage(messages, full_reply_content, completion_tokens=completion_tokens)
 
         self._update_costs(usage)
         return full_reply_content
@@ -154,11 +159,7 @@ class OpenAILLM(BaseLLM):
     )
     async def acompletion_text(self, messages: list[dict], stream=False, timeout=USE_CONFIG_TIMEOUT) -> str:
         """when streaming, print each token in place."""
-        if stream:
-            return await self._achat_completion_stream(messages, timeout=timeout)
-
-        rsp = await self._achat_completion(messages, timeout=self.get_timeout(timeout))
-        return self.get_choice_text(rsp)
+        return await self._cached_acompletion_text(messages, stream=stream, timeout=timeout)
 
     async def _achat_completion_function(
         self, messages: list[dict], timeout: int = USE_CONFIG_TIMEOUT, **chat_configs
@@ -182,7 +183,8 @@ class OpenAILLM(BaseLLM):
         if "tools" not in kwargs:
             configs = {"tools": [{"type": "function", "function": GENERAL_FUNCTION_SCHEMA}]}
             kwargs.update(configs)
-        rsp = await self._achat_completion_function(messages, **kwargs)
+        async with self._admission(messages):
+            rsp = await self._achat_completion_function(messages, **kwargs)
         return self.get_choice_function_arguments(rsp)
 
     def _parse_arguments(self, arguments: str) -> dict:
@@ -249,19 +251,31 @@ class OpenAILLM(BaseLLM):
         """Required to provide the first text of choice"""
         return rsp.choices[0].message.content if rsp.choices else ""
 
-    def _calc_usage(self, messages: list[dict], rsp: str) -> CompletionUsage:
+    def _calc_usage(self, messages: list[dict], rsp: str, completion_tokens: Optional[int] = None) -> CompletionUsage:
         usage = CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
         if not self.config.calc_usage:
             return usage
 
         try:
             usage.prompt_tokens = count_input_tokens(messages, self.pricing_plan)
-            usage.completion_tokens = count_output_tokens(rsp, self.pricing_plan)
+            if completion_tokens is None:
+                completion_tokens = count_output_tokens(rsp, self.pricing_plan)
+            usage.completion_tokens = completion_tokens
         except Exception as e:
             logger.warning(f"usage calculation failed: {e}")
 
         return usage
 
+    def _stream_token_counter(self) -> Optional[StreamTokenCounter]:
+        """Count the completion tokens of a streamed reply while it arrives, None if usage is not calculated."""
+        if not self.config.calc_usage:
+            return None
+        try:
+            return StreamTokenCounter(self.pricing_plan)
+        except Exception as e:
+            logger.warning(f"usage calculation failed: {e}")
+            return None
+
     def _get_max_tokens(self, messages: list[dict]):
         if not self.auto_max_tokens:
             return self.config.max_token
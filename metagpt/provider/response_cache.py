@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc    : Persistent cache of LLM responses keyed by the normalized request: an in-memory LRU in front of a sqlite
+    store with TTL and size-based eviction. Opt-in through `LLMConfig.response_cache`.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from metagpt.configs.llm_config import LLMConfig
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+
+DEFAULT_RESPONSE_CACHE_PATH = CONFIG_ROOT / "llm_response_cache.db"
+
+
+def normalize_content(content):
+    """Ignore differences in line endings and trailing whitespace, which do not change what is asked."""
+    if isinstance(content, str):
+        return "\n".join(line.rstrip() for line in content.strip().replace("\r\n", "\n").split("\n"))
+    if isinstance(content, list):
+        return [normalize_content(i) for i in content]
+    if isinstance(content, dict):
+        return {k: normalize_content(v) for k, v in content.items()}
+    return content
+
+
+# fields of LLMConfig that do not change the completion: credentials, transport, accounting and the cache itself
+NON_REQUEST_FIELDS = {
+    "api_key",
+    "access_key",
+    "secret_key",
+    "api_secret",
+    "app_id",
+    "pricing_plan",
+    "stream",
+    "timeout",
+    "proxy",
+    "calc_usage",
+    "max_concurrency",
+    "rpm",
+    "tpm",
+    "response_cache",
+    "response_cache_path",
+    "response_cache_ttl",
+    "response_cache_max_size",
+}
+
+
+def make_cache_key(config: LLMConfig, messages: list[dict], model: Optional[str] = None) -> str:
+    """Hash everything that determines a completion: the endpoint, the model, the sampling options and the prompt.
+
+    Every field of the config shapes the request but those of `NON_REQUEST_FIELDS`, so that a field added to LLMConfig
+    is part of the key by default.
+    """
+    request = config.model_dump(mode="json", exclude=NON_REQUEST_FIELDS)
+    request["model"] = model or config.model
+    request["messages"] = normalize_content(messages)
+    data = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LLM responses kept in a sqlite file, with the most recently used ones also held in RAM.
+
+    Entries older than `ttl` seconds are never served (0 keeps them forever). Once the stored responses exceed
+    `max_bytes` (0 means unbounded), the least recently used ones are evicted.
+
+    A hit does not write to sqlite: access times are buffered and committed with the next write, at `close`, or once
+    `touch_batch` of them are pending, so serving from the cache does not block the event loop on a commit.
+    """
+
+    def __init__(
+        self, path: Path, ttl: float = 0, max_bytes: int = 0, memory_entries: int = 256, touch_batch: int = 256
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.touch_batch = touch_batch
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()  # key -> (response, created_at)
+        self._accessed: dict[str, float] = {}  # key -> accessed_at not yet written to sqlite
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+            """
+        )
+        with self._lock:
+            self._evict(time.time())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl) and now - created_at >= self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response of a request, None on a miss"""
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                response, created_at = self._memory[key]
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._touch(key, now)
+                    return response
+                del self._memory[key]
+
+            row = self._conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self._expired(created_at, now):
+                self._accessed.pop(key, None)
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._touch(key, now)
+            self._remember(key, response, created_at)
+            return response
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response.encode("utf-8")), now, now),
+            )
+            self._accessed.pop(key, None)
+            self._remember(key, response, now)
+            self._evict(now)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._memory.clear()
+            self._accessed.clear()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+    def _touch(self, key: str, now: float):
+        self._accessed[key] = now
+        if len(self._accessed) >= self.touch_batch:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def _flush_accessed(self):
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", [(t, k) for k, t in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _remember(self, key: str, response: str, created_at: float):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used ones until the store fits in `max_bytes`."""
+        self._flush_accessed()  # so that recent hits count as recent uses
+        evicted = []
+        if self.ttl:
+            rows = self._conn.execute("SELECT key FROM responses WHERE created_at <= ?", (now - self.ttl,))
+            evicted += [key for (key,) in rows.fetchall()]
+        if self.max_bytes:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at, rowid"):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append(key)
+                    total -= size
+        if evicted:
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in evicted])
+            for key in evicted:
+                self._memory.pop(key, None)
+        self._conn.commit()
+
+
+_caches: dict[Path, ResponseCache] = {}
+
+
+def get_response_cache(config: LLMConfig) -> Optional[ResponseCache]:
+    """Return the cache shared by every LLM that stores responses at the same path, None if caching is off"""
+    if not config.response_cache:
+        return None
+    path = Path(config.response_cache_path or DEFAULT_RESPONSE_CACHE_PATH).expanduser().resolve()
+    cache = _caches.get(path)
+    if cache is None:
+        cache = ResponseCache(
+            path, ttl=config.response_cache_ttl, max_bytes=int(config.response_cache_max_size * 1024 * 1024)
+        )
+        _caches[path] = cache
+        atexit.register(cache.close)  # keeps the buffered access times
+        logger.debug(f"LLM response cache enabled at {path}")
+    return cache
@@ -1,7 +1,7 @@
 import asyncio
+from functools import lru_cache
 from typing import List, Tuple, Union
 
-import evaluate
 import jieba
 from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.evaluation import SemanticSimilarityEvaluator
@@ -24,6 +24,14 @@ class DatasetConfig(BaseModel):
     datasets: List[DatasetInfo]
 
 
+@lru_cache(maxsize=None)
+def load_metric(path: str):
+    """Load an evaluate metric once, evaluate.load fetches and builds it every time."""
+    import evaluate  # only needed by the text metrics
+
+    return evaluate.load(path=path)
+
+
 class RAGBenchmark:
     def __init__(
         self,
@@ -74,7 +82,7 @@ class RAGBenchmark:
 
     def bleu_score(self, response: str, reference: str, with_penalty=False) -> Union[float, Tuple[float]]:
         f = lambda text: list(jieba.cut(text))
-        bleu = evaluate.load(path="bleu")
+        bleu = load_metric("bleu")
         results = bleu.compute(predictions=[response], references=[[reference]], tokenizer=f)
 
         bleu_avg = results["bleu"]
@@ -92,7 +100,7 @@ class RAGBenchmark:
     def rougel_score(self, response: str, reference: str) -> float:
         # pip install rouge_score
         f = lambda text: list(jieba.cut(text))
-        rouge = evaluate.load(path="rouge")
+        rouge = load_metric("rouge")
 
         results = rouge.compute(predictions=[response], references=[[reference]], tokenizer=f, rouge_types=["rougeL"])
         score = results["rougeL"]
@@ -0,0 +1,228 @@
+"""Performance benchmark of SimpleEngine configurations: index build time, retrieve latency, throughput and memory."""
+
+import asyncio
+import gc
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+import jieba
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import Field as LlamaField
+from llama_index.core.llms import MockLLM
+from llama_index.core.node_parser import SentenceSplitter
+from pydantic import BaseModel, ConfigDict, Field
+
+from metagpt.logs import logger
+from metagpt.rag.benchmark.base import DatasetInfo
+from metagpt.rag.engines import SimpleEngine
+from metagpt.rag.schema import BaseRankerConfig, BaseRetrieverConfig
+from metagpt.utils.common import write_json_file
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class HashEmbedding(BaseEmbedding):
+    """Deterministic local embedding for benchmarks, no model nor network involved.
+
+    A text is embedded as its bag of jieba tokens, hashed into embed_dim signed buckets and L2 normalized, so that texts
+    sharing words are close, like with a real embedding.
+    """
+
+    embed_dim: int = LlamaField(default=256, gt=0, description="Dimensions of the vectors.")
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "HashEmbedding"
+
+    def _embed(self, text: str) -> Embedding:
+        vector = np.zeros(self.embed_dim, dtype=np.float32)
+        for token in jieba.lcut(text.lower()):
+            if not token.strip():
+                continue
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[h % self.embed_dim] += 1.0 if h >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._embed(text)
+
+
+class BenchmarkConfig(BaseModel):
+    """A SimpleEngine configuration to benchmark, built with `SimpleEngine.from_docs`."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    name: str
+    retriever_configs: Optional[list[BaseRetrieverConfig]] = None
+    ranker_configs: Optional[list[BaseRankerConfig]] = None
+    chunk_size: int = Field(default=1024, description="Chunk size of the SentenceSplitter.")
+    chunk_overlap: int = Field(default=200, description="Chunk overlap of the SentenceSplitter.")
+    num_workers: Optional[int] = Field(default=None, description="Processes parsing the documents.")
+
+
+class LatencyStats(NamedTuple):
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+
+    @classmethod
+    def from_seconds(cls, latencies: list[float]) -> "LatencyStats":
+        """Stats in milliseconds."""
+        if not latencies:
+            return cls(0.0, 0.0, 0.0, 0.0)
+        ms = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return cls(float(p50), float(p95), float(p99), float(ms.mean()))
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    num_files: int
+    num_nodes: int
+    num_queries: int
+    concurrency: int
+    build_seconds: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    qps: float
+    rss_mb: float = Field(description="Resident memory after the queries, 0 if unknown.")
+    peak_rss_mb: float = Field(description="Peak resident memory of the process so far, 0 if unknown.")
+
+
+class RAGBenchmarkRunner:
+    """Build an engine for each config over the same documents, then send it the queries concurrently.
+
+    Embeddings come from a local HashEmbedding by default, so the numbers measure the engine, not an embedding service,
+    and are reproducible. Only retrieval is measured, no LLM is called.
+    """
+
+    def __init__(self, embed_model: BaseEmbedding = None, concurrency: int = 8, repeat: int = 1):
+        self.embed_model = embed_model or HashEmbedding()
+        self.concurrency = concurrency
+        self.repeat = repeat
+
+    async def run(
+        self, configs: list[BenchmarkConfig], input_files: list[str], queries: list[str]
+    ) -> list[BenchmarkResult]:
+        results = []
+        for config in configs:
+            results.append(await self.run_config(config, input_files, queries))
+            gc.collect()  # release the previous engine before measuring the next one
+        return results
+
+    async def run_dataset(self, configs: list[BenchmarkConfig], dataset: DatasetInfo) -> list[BenchmarkResult]:
+        """Benchmark on a dataset of RAGBenchmark.load_dataset, querying its questions."""
+        return await self.run(configs, dataset.document_files, [gt["question"] for gt in dataset.gt_info])
+
+    async def run_config(self, config: BenchmarkConfig, input_files: list[str], queries: list[str]) -> BenchmarkResult:
+        # factories set the built index on the retriever configs, each run gets its own copy
+        config = config.model_copy(deep=True)
+
+        start = time.perf_counter()
+        engine = SimpleEngine.from_docs(
+            input_files=input_files,
+            transformations=[SentenceSplitter(chunk_size=config.chunk_size, chunk_overlap=config.chunk_overlap)],
+            embed_model=self.embed_model,
+            llm=MockLLM(),
+            retriever_configs=config.retriever_configs,
+            ranker_configs=config.ranker_configs,
+            num_workers=config.num_workers,
+        )
+        build_seconds = time.perf_counter() - start
+
+        latencies, elapsed = await self._query(engine, queries * self.repeat)
+        stats = LatencyStats.from_seconds(latencies)
+        rss_mb, peak_rss_mb = get_rss_mb()
+        result = BenchmarkResult(
+            name=config.name,
+            num_files=len(input_files),
+            num_nodes=engine.num_doc_nodes,
+            num_queries=len(latencies),
+            concurrency=self.concurrency,
+            build_seconds=build_seconds,
+            p50_ms=stats.p50,
+            p95_ms=stats.p95,
+            p99_ms=stats.p99,
+            mean_ms=stats.mean,
+            qps=len(latencies) / elapsed if elapsed else 0.0,
+            rss_mb=rss_mb,
+            peak_rss_mb=peak_rss_mb,
+        )
+        logger.info(f"Benchmark {config.name}: {result.model_dump()}")
+        return result
+
+    async def _query(self, engine: SimpleEngine, queries: list[str]) -> tuple[list[float], float]:
+        """Retrieve the queries with at most `concurrency` in flight, return the latency of each and the total time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _retrieve(query: str) -> float:
+            async with semaphore:
+                start = time.perf_counter()
+                await engine.aretrieve(query)
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*[_retrieve(query) for query in queries])
+        return list(latencies), time.perf_counter() - start
+
+
+def get_rss_mb() -> tuple[float, float]:
+    """Return the current and peak resident memory of the process in MB, 0 when the platform doesn't tell."""
+    rss = peak = 0.0
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = maxrss / 2**20 if sys.platform == "darwin" else maxrss / 2**10  # bytes on macOS, KB otherwise
+    return rss, peak
+
+
+REPORT_COLUMNS = {
+    "name": "config",
+    "num_nodes": "nodes",
+    "build_seconds": "build (s)",
+    "p50_ms": "p50 (ms)",
+    "p95_ms": "p95 (ms)",
+    "p99_ms": "p99 (ms)",
+    "qps": "QPS",
+    "rss_mb": "RSS (MB)",
+    "peak_rss_mb": "peak RSS (MB)",
+}
+
+
+def to_markdown(results: List[BenchmarkResult]) -> str:
+    """A table comparing the results side by side, one row per config."""
+    lines = ["| " + " | ".join(REPORT_COLUMNS.values()) + " |", "|" + "---|" * len(REPORT_COLUMNS)]
+    for result in results:
+        values = result.model_dump()
+        cells = [f"{values[key]:.2f}" if isinstance(values[key], float) else str(values[key]) for key in REPORT_COLUMNS]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def save_report(results: List[BenchmarkResult], path: Union[str, Path]):
+    """Save the results as path.json and the markdown table as path.md."""
+    path = Path(path)
+    write_json_file(str(path.with_suffix(".json")), [r.model_dump() for r in results], encoding="utf-8")
+    path.with_suffix(".md").write_text(to_markdown(results), encoding="utf-8")
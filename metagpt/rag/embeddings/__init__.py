@@ -0,0 +1,3 @@
+from metagpt.rag.embeddings.cached_embedding import CachedEmbedding, EmbeddingCache
+
+__all__ = ["CachedEmbedding", "EmbeddingCache"]
@@ -0,0 +1,253 @@
+"""Embedding with an on-disk cache of text vectors."""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+
+DEFAULT_EMBEDDING_CACHE_PATH = CONFIG_ROOT / "embedding_cache"
+
+KEY_SIZE = 32  # sha256 digest
+
+# fields of the embed models that change the vectors of a same model name: its dimensions, or the server answering
+MODEL_ID_FIELDS = (
+    "dimensions",
+    "api_type",
+    "api_base",
+    "base_url",
+    "azure_endpoint",
+    "azure_deployment",
+    "api_version",
+)
+
+
+class EmbeddingCache:
+    """Content hash -> vector, kept on disk.
+
+    Vectors are appended as rows of a float32 matrix that is read through a memory map, and the hash of each row is
+    appended to a key file, so opening the cache only reads the keys. A single process should write to a cache.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._keys_file = self.path / "keys.bin"
+        self._vectors_file = self.path / "vectors.f32"
+        self._meta_file = self.path / "meta.json"
+        self._lock = threading.Lock()
+
+        self.dim: Optional[int] = json.loads(self._meta_file.read_text())["dim"] if self._meta_file.exists() else None
+        keys = self._keys_file.read_bytes() if self._keys_file.exists() else b""
+        size = len(keys) // KEY_SIZE
+        if self.dim:
+            vectors_size = self._vectors_file.stat().st_size if self._vectors_file.exists() else 0
+            size = min(size, vectors_size // (4 * self.dim))
+        self._truncate(size)  # drop a row left incomplete by an interrupted write
+
+        self._rows: dict[bytes, int] = {keys[i * KEY_SIZE : (i + 1) * KEY_SIZE]: i for i in range(size)}
+        self._matrix: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def get_many(self, keys: list[bytes]) -> list[Optional[np.ndarray]]:
+        """Return the vector of each key, None for the missing ones."""
+        rows = [self._rows.get(key) for key in keys]
+        found = [i for i, row in enumerate(rows) if row is not None]
+        if not found:
+            return [None] * len(keys)
+
+        vectors = np.array(self._get_matrix()[[rows[i] for i in found]])
+        result = [None] * len(keys)
+        for i, vector in zip(found, vectors):
+            result[i] = vector
+        return result
+
+    def put_many(self, keys: list[bytes], vectors: list[Embedding]):
+        """Append the vectors of keys not cached yet."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._meta_file.write_text(json.dumps({"dim": self.dim}))
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Vectors of dimension {vectors.shape[1]} cannot be cached with {self.dim}.")
+
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self._rows:
+                    new.setdefault(key, vector)
+            if not new:
+                return
+
+            with open(self._vectors_file, "ab") as f:
+                f.write(np.stack(list(new.values())).tobytes())
+            with open(self._keys_file, "ab") as f:
+                f.write(b"".join(new))
+            for key in new:
+                self._rows[key] = len(self._rows)
+
+    def _get_matrix(self) -> np.memmap:
+        with self._lock:
+            if self._matrix is None or len(self._matrix) < len(self._rows):
+                self._matrix = np.memmap(
+                    self._vectors_file, dtype=np.float32, mode="r", shape=(len(self._rows), self.dim)
+                )
+            return self._matrix
+
+    def _truncate(self, size: int):
+        for file, row_size in ((self._keys_file, KEY_SIZE), (self._vectors_file, 4 * (self.dim or 0))):
+            if file.exists() and file.stat().st_size > size * row_size:
+                with open(file, "r+b") as f:
+                    f.truncate(size * row_size)
+
+
+class EmbeddingCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def get_model_id(embed_model: BaseEmbedding) -> str:
+    """Identify the vectors of an embed model, as vectors of different models are not comparable."""
+    fields = {name: getattr(embed_model, name, None) for name in MODEL_ID_FIELDS}
+    fields = {name: str(value) for name, value in fields.items() if value is not None}
+    return f"{type(embed_model).__name__}:{embed_model.model_name}:{json.dumps(fields, sort_keys=True)}"
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Wrap an embed model, so that a text already embedded is served from an `EmbeddingCache`.
+
+    Texts to embed are deduplicated, split into batches of `embed_batch_size` and sent to the wrapped model with up to
+    `concurrency` batches in flight. Query embeddings are not cached.
+    """
+
+    embed_model: BaseEmbedding = Field(description="The embed model to cache.")
+    concurrency: int = Field(default=4, gt=0, description="Max batches sent to the embed model at the same time.")
+
+    _cache: EmbeddingCache = PrivateAttr()
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    def __init__(
+        self,
+        embed_model: BaseEmbedding,
+        cache_path: Optional[Union[str, os.PathLike]] = None,
+        embed_batch_size: Optional[int] = None,
+        concurrency: int = 4,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            embed_model=embed_model,
+            model_name=embed_model.model_name,
+            embed_batch_size=embed_batch_size or embed_model.embed_batch_size,
+            concurrency=concurrency,
+            **kwargs,
+        )
+        model_id = get_model_id(embed_model)
+        cache_dir = Path(cache_path or DEFAULT_EMBEDDING_CACHE_PATH) / hashlib.sha1(model_id.encode()).hexdigest()[:16]
+        self._cache = EmbeddingCache(cache_dir)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def cache_stats(self) -> EmbeddingCacheStats:
+        return EmbeddingCacheStats(hits=self._hits, misses=self._misses, size=len(self._cache))
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self.embed_model._get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await self.embed_model._aget_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self.get_text_embedding_batch([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self.aget_text_embedding_batch([text]))[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self.get_text_embedding_batch(texts)
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return await self.aget_text_embedding_batch(texts)
+
+    def get_text_embedding_batch(self, texts: list[str], show_progress: bool = False, **kwargs: Any) -> list[Embedding]:
+        keys, vectors, batches = self._lookup(texts)
+        if len(batches) > 1 and self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                embeddings = list(pool.map(self.embed_model.get_text_embedding_batch, batches))
+        else:
+            embeddings = [self.embed_model.get_text_embedding_batch(batch) for batch in batches]
+        return self._merge(keys, vectors, batches, embeddings)
+
+    async def aget_text_embedding_batch(self, texts: list[str], show_progress: bool = False) -> list[Embedding]:
+        keys, vectors, batches = self._lookup(texts)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _embed(batch: list[str]) -> list[Embedding]:
+            async with semaphore:
+                return await self.embed_model.aget_text_embedding_batch(batch)
+
+        embeddings = await asyncio.gather(*[_embed(batch) for batch in batches])
+        return self._merge(keys, vectors, batches, embeddings)
+
+    def _lookup(self, texts: list[str]) -> tuple[list[bytes], list[Optional[np.ndarray]], list[list[str]]]:
+        """Return the keys and cached vectors of the texts, and the batches of distinct texts to embed."""
+        keys = [self._cache.key(text) for text in texts]
+        vectors = self._cache.get_many(keys)
+
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        texts_to_embed = list(missing.values())
+        batches = [
+            texts_to_embed[i : i + self.embed_batch_size] for i in range(0, len(texts_to_embed), self.embed_batch_size)
+        ]
+
+        hits = len(texts) - sum(vector is None for vector in vectors)
+        self._hits += hits
+        self._misses += len(texts) - hits
+        if texts:
+            logger.info(f"Embedding cache: {hits}/{len(texts)} hits, {len(texts_to_embed)} texts to embed.")
+        return keys, vectors, batches
+
+    def _merge(
+        self,
+        keys: list[bytes],
+        vectors: list[Optional[np.ndarray]],
+        batches: list[list[str]],
+        embeddings: list[list[Embedding]],
+    ) -> list[Embedding]:
+        """Cache the new embeddings and fill them in. Vectors are always returned as float32 values, as cached."""
+        texts = [text for batch in batches for text in batch]
+        new = [embedding for batch in embeddings for embedding in batch]
+        if new:
+            new_keys = [self._cache.key(text) for text in texts]
+            self._cache.put_many(new_keys, new)
+            computed = dict(zip(new_keys, np.asarray(new, dtype=np.float32)))
+            vectors = [computed[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+        return [vector.tolist() for vector in vectors]
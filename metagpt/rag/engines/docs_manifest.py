@@ -0,0 +1,112 @@
+"""Manifest of the files ingested by SimpleEngine, used to sync a directory incrementally."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from llama_index.core.schema import BaseNode
+from pydantic import BaseModel, Field
+
+from metagpt.utils.common import read_json_file, write_json_file
+
+MANIFEST_FNAME = "docs_manifest.json"
+
+
+class FileRecord(BaseModel):
+    """What an ingested file looked like, and what it was turned into."""
+
+    mtime: float
+    size: int
+    sha256: str
+    doc_ids: list[str] = Field(default_factory=list, description="ref_doc_id of the documents read from the file.")
+    node_ids: list[str] = Field(default_factory=list, description="Ids of the nodes split from those documents.")
+
+
+class SyncResult(NamedTuple):
+    added: list[str]
+    modified: list[str]
+    removed: list[str]
+
+
+class DocsManifest(BaseModel):
+    """Path -> FileRecord of every file in an index, saved next to the persisted index."""
+
+    files: dict[str, FileRecord] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, persist_dir: Union[str, os.PathLike]) -> "DocsManifest":
+        """Load the manifest saved in persist_dir, an empty one if there is none."""
+        filename = Path(persist_dir) / MANIFEST_FNAME
+        return cls(**read_json_file(str(filename))) if filename.exists() else cls()
+
+    def save(self, persist_dir: Union[str, os.PathLike]):
+        write_json_file(str(Path(persist_dir) / MANIFEST_FNAME), self.model_dump(), encoding="utf-8")
+
+    def diff(self, paths: list[Union[str, os.PathLike]]) -> SyncResult:
+        """Compare the files now at `paths` with the ingested ones.
+
+        A file whose mtime and size are unchanged is assumed unchanged; otherwise its content hash decides.
+        """
+        current = {file_key(path): Path(path) for path in paths}
+        added, modified = [], []
+        for key, path in current.items():
+            record = self.files.get(key)
+            if record is None:
+                added.append(key)
+                continue
+
+            stat = path.stat()
+            if (record.mtime, record.size) == (stat.st_mtime, stat.st_size):
+                continue
+            if file_sha256(path) != record.sha256:
+                modified.append(key)
+            else:
+                record.mtime = stat.st_mtime  # touched only, no need to hash it again next time
+
+        removed = [key for key in self.files if key not in current]
+        return SyncResult(added=added, modified=modified, removed=removed)
+
+    def update(
+        self,
+        doc_files: dict[str, str],
+        nodes: list[BaseNode],
+        input_files: Optional[list[Union[str, os.PathLike]]] = None,
+    ):
+        """Record the files documents were read from, given as ref_doc_id -> file_path, with the ids of their nodes.
+
+        The input_files read are recorded too, those giving no document or no node included, so that a sync does not
+        read them again until they change.
+        """
+        doc_files = {doc_id: file_key(path) for doc_id, path in doc_files.items()}
+        keys = dict.fromkeys([file_key(path) for path in input_files or []] + list(doc_files.values()))
+        if not keys:
+            return
+
+        records = {}
+        for key in keys:
+            stat = os.stat(key)
+            records[key] = FileRecord(mtime=stat.st_mtime, size=stat.st_size, sha256=file_sha256(key))
+        for doc_id, key in doc_files.items():
+            records[key].doc_ids.append(doc_id)
+        for node in nodes:
+            key = doc_files.get(node.ref_doc_id)
+            if key:
+                records[key].node_ids.append(node.node_id)
+        self.files.update(records)
+
+    def remove(self, keys: list[str]) -> list[str]:
+        """Forget the files, return the ref_doc_id of their documents."""
+        return [doc_id for key in keys for doc_id in self.files.pop(key).doc_ids]
+
+
+def file_key(path: Union[str, os.PathLike]) -> str:
+    return str(Path(path).resolve())
+
+
+def file_sha256(path: Union[str, os.PathLike]) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
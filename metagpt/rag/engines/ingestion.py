@@ -0,0 +1,101 @@
+"""Ingestion of files as a bounded pipeline: read and split in worker processes, embed in the caller."""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, NamedTuple, Optional
+
+from llama_index.core import SimpleDirectoryReader
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.indices.utils import embed_nodes
+from llama_index.core.ingestion.pipeline import run_transformations
+from llama_index.core.readers.base import BaseReader
+from llama_index.core.schema import BaseNode, Document, TransformComponent
+
+DEFAULT_FILES_PER_BATCH = 16
+
+
+class ParsedFiles(NamedTuple):
+    doc_files: dict[str, str]  # ref_doc_id -> file_path of the documents read
+    nodes: list[BaseNode]
+    input_files: list[str]  # the files parsed, including those giving no document
+
+
+def fix_document_metadata(documents: list[Document]):
+    """LlamaIndex keep metadata['file_path'], which is unnecessary, maybe deleted in the near future."""
+    for doc in documents:
+        doc.excluded_embed_metadata_keys.append("file_path")
+
+
+def get_doc_files(documents: list[Document]) -> dict[str, str]:
+    return {doc.doc_id: doc.metadata["file_path"] for doc in documents if "file_path" in doc.metadata}
+
+
+def parse_files(
+    input_files: list[str],
+    file_extractor: Optional[dict[str, BaseReader]] = None,
+    transformations: Optional[list[TransformComponent]] = None,
+) -> ParsedFiles:
+    """Read the files and split them into nodes. The documents are dropped, only their files are kept."""
+    documents = SimpleDirectoryReader(input_files=input_files, file_extractor=file_extractor).load_data()
+    fix_document_metadata(documents)
+    nodes = run_transformations(documents, transformations=transformations or [])
+    return ParsedFiles(doc_files=get_doc_files(documents), nodes=nodes, input_files=[str(f) for f in input_files])
+
+
+def iter_parsed_files(
+    input_files: list[str],
+    file_extractor: Optional[dict[str, BaseReader]] = None,
+    transformations: Optional[list[TransformComponent]] = None,
+    num_workers: Optional[int] = None,
+    files_per_batch: int = DEFAULT_FILES_PER_BATCH,
+    max_pending: Optional[int] = None,
+) -> Iterator[ParsedFiles]:
+    """Parse the files in batches of files_per_batch, yielding the batches in the order of input_files.
+
+    With num_workers > 1 the batches are parsed by a process pool. At most max_pending batches, 2 per worker by default,
+    are submitted ahead of the one the caller is consuming, so a slow consumer, e.g. embedding the nodes, holds the
+    workers back, and the memory used by parsing does not grow with the number of files.
+    """
+    batches = [input_files[i : i + files_per_batch] for i in range(0, len(input_files), files_per_batch)]
+    if not num_workers or num_workers <= 1:
+        for batch in batches:
+            yield parse_files(batch, file_extractor, transformations)
+        return
+
+    max_pending = max_pending or 2 * num_workers
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_worker, initargs=(file_extractor, transformations)
+    ) as pool:
+        pending: deque[Future] = deque()
+        batches = iter(batches)
+        try:
+            for batch in batches:
+                pending.append(pool.submit(_parse_files_in_worker, batch))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def set_node_embeddings(nodes: list[BaseNode], embed_model: BaseEmbedding):
+    """Embed the nodes that have no embedding yet, so that an index built from them will not embed them again."""
+    id_to_embedding = embed_nodes(nodes, embed_model)
+    for node in nodes:
+        node.embedding = id_to_embedding[node.node_id]
+
+
+_worker_file_extractor: Optional[dict[str, BaseReader]] = None
+_worker_transformations: Optional[list[TransformComponent]] = None
+
+
+def _init_worker(file_extractor: Optional[dict[str, BaseReader]], transformations: Optional[list[TransformComponent]]):
+    # sent once per worker, instead of with every batch
+    global _worker_file_extractor, _worker_transformations
+    _worker_file_extractor, _worker_transformations = file_extractor, transformations
+
+
+def _parse_files_in_worker(input_files: list[str]) -> ParsedFiles:
+    return parse_files(input_files, _worker_file_extractor, _worker_transformations)
@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from llama_index.core import SimpleDirectoryReader
 from llama_index.core.callbacks.base import CallbackManager
@@ -30,6 +30,15 @@ from llama_index.core.schema import (
 )
 
 from metagpt.config2 import config
+from metagpt.logs import logger
+from metagpt.rag.engines.docs_manifest import DocsManifest, SyncResult
+from metagpt.rag.engines.ingestion import (
+    ParsedFiles,
+    fix_document_metadata,
+    get_doc_files,
+    iter_parsed_files,
+    set_node_embeddings,
+)
 from metagpt.rag.factories import (
     get_index,
     get_rag_embedding,
@@ -39,13 +48,18 @@ from metagpt.rag.factories import (
 )
 from metagpt.rag.interface import NoEmbedding, RAGObject
 from metagpt.rag.parsers import OmniParse
-from metagpt.rag.retrievers.base import ModifiableRAGRetriever, PersistableRAGRetriever
+from metagpt.rag.retrievers.base import (
+    DeletableRAGRetriever,
+    ModifiableRAGRetriever,
+    PersistableRAGRetriever,
+)
 from metagpt.rag.retrievers.hybrid_retriever import SimpleHybridRetriever
 from metagpt.rag.schema import (
     BaseIndexConfig,
     BaseRankerConfig,
     BaseRetrieverConfig,
     BM25RetrieverConfig,
+    HybridRetrieverConfig,
     ObjectNode,
     OmniParseOptions,
     OmniParseType,
@@ -78,6 +92,7 @@ class SimpleEngine(RetrieverQueryEngine):
             callback_manager=callback_manager,
         )
         self._transformations = transformations or self._default_transformations()
+        self._manifest = DocsManifest()
 
     @classmethod
     def from_docs(
@@ -89,6 +104,7 @@ class SimpleEngine(RetrieverQueryEngine):
         llm: LLM = None,
         retriever_configs: list[BaseRetrieverConfig] = None,
         ranker_configs: list[BaseRankerConfig] = None,
+        num_workers: Optional[int] = None,
     ) -> "SimpleEngine":
         """From docs.
 
@@ -102,20 +118,35 @@ class SimpleEngine(RetrieverQueryEngine):
             llm: Must supported by llama index. Default OpenAI.
             retriever_configs: Configuration for retrievers. If more than one config, will use SimpleHybridRetriever.
             ranker_configs: Configuration for rankers.
+            num_workers: If more than 1, files are read and split by that many processes, in batches, while the nodes
+                of finished batches are embedded and indexed. Default reads all files at once in this process.
         """
         if not input_dir and not input_files:
             raise ValueError("Must provide either `input_dir` or `input_files`.")
 
         file_extractor = cls._get_file_extractor()
-        documents = SimpleDirectoryReader(
-            input_dir=input_dir, input_files=input_files, file_extractor=file_extractor
-        ).load_data()
-        cls._fix_document_metadata(documents)
-
         transformations = transformations or cls._default_transformations()
+        if num_workers and num_workers > 1:
+            return cls._from_parsed_files(
+                iter_parsed_files(
+                    input_files or SimpleDirectoryReader(input_dir=input_dir).input_files,
+                    file_extractor=file_extractor,
+                    transformations=transformations,
+                    num_workers=num_workers,
+                ),
+                transformations=transformations,
+                embed_model=embed_model,
+                llm=llm,
+                retriever_configs=retriever_configs,
+                ranker_configs=ranker_configs,
+            )
+
+        reader = SimpleDirectoryReader(input_dir=input_dir, input_files=input_files, file_extractor=file_extractor)
+        documents = reader.load_data()
+        cls._fix_document_metadata(documents)
         nodes = run_transformations(documents, transformations=transformations)
 
-        return cls._from_nodes(
+        engine = cls._from_nodes(
             nodes=nodes,
             transformations=transformations,
             embed_model=embed_model,
@@ -123,6 +154,8 @@ class SimpleEngine(RetrieverQueryEngine):
             retriever_configs=retriever_configs,
             ranker_configs=ranker_configs,
         )
+        engine._manifest.update(get_doc_files(documents), nodes, reader.input_files)
+        return engine
 
     @classmethod
     def from_objs(
@@ -172,7 +205,16 @@ class SimpleEngine(RetrieverQueryEngine):
     ) -> "SimpleEngine":
         """Load from previously maintained index by self.persist(), index_config contains persis_path."""
         index = get_index(index_config, embed_model=cls._resolve_embed_model(embed_model, [index_config]))
-        return cls._from_index(index, llm=llm, retriever_configs=retriever_configs, ranker_configs=ranker_configs)
+        cls._set_bm25_persist_path(retriever_configs, index_config)
+        engine = cls._from_index(index, llm=llm, retriever_configs=retriever_configs, ranker_configs=ranker_configs)
+        if getattr(index_config, "persist_path", None):
+            engine._manifest = DocsManifest.load(index_config.persist_path)
+        return engine
+
+    @property
+    def num_doc_nodes(self) -> int:
+        """The number of nodes split from the files ingested by from_docs, add_docs or sync, objs not included."""
+        return sum(len(record.node_ids) for record in self._manifest.files.values())
 
     async def asearch(self, content: str, **kwargs) -> str:
         """Inplement tools.SearchInterface"""
@@ -197,11 +239,44 @@ class SimpleEngine(RetrieverQueryEngine):
         """Add docs to retriever. retriever must has add_nodes func."""
         self._ensure_retriever_modifiable()
 
-        documents = SimpleDirectoryReader(input_files=input_files).load_data()
+        reader = SimpleDirectoryReader(input_files=input_files)
+        documents = reader.load_data()
         self._fix_document_metadata(documents)
 
         nodes = run_transformations(documents, transformations=self._transformations)
         self._save_nodes(nodes)
+        self._manifest.update(get_doc_files(documents), nodes, reader.input_files)
+
+    def sync(self, input_dir: str, num_workers: Optional[int] = None) -> SyncResult:
+        """Bring the retriever up to date with the files in input_dir, as `from_docs(input_dir=...)` would index them.
+
+        Only added or modified files are read, split and embedded again. The nodes of modified and removed files are
+        deleted from the retriever, which must support both adding nodes and deleting docs. Files are tracked by a
+        manifest, which `persist` saves next to the index, so a later `from_index` can sync again.
+        Files are read and split in batches, by num_workers processes if more than 1, as in `from_docs`.
+        """
+        self._ensure_retriever_modifiable()
+        self._ensure_retriever_deletable()
+
+        result = self._manifest.diff(SimpleDirectoryReader(input_dir=input_dir).input_files)
+        stale_doc_ids = self._manifest.remove(result.modified + result.removed)
+        if stale_doc_ids:
+            self.retriever.delete_docs(stale_doc_ids)
+
+        for parsed in iter_parsed_files(
+            result.added + result.modified,
+            file_extractor=self._get_file_extractor(),
+            transformations=self._transformations,
+            num_workers=num_workers,
+        ):
+            self._save_nodes(parsed.nodes)
+            self._manifest.update(parsed.doc_files, parsed.nodes, parsed.input_files)
+
+        logger.info(
+            f"Synced {input_dir}: {len(result.added)} added, {len(result.modified)} modified, "
+            f"{len(result.removed)} removed."
+        )
+        return result
 
     def add_objs(self, objs: list[RAGObject]):
         """Adds objects to the retriever, storing each object's original form in metadata for future reference."""
@@ -215,6 +290,7 @@ class SimpleEngine(RetrieverQueryEngine):
         self._ensure_retriever_persistable()
 
         self._persist(str(persist_dir), **kwargs)
+        self._manifest.save(persist_dir)
 
     @classmethod
     def _from_nodes(
@@ -239,6 +315,53 @@ class SimpleEngine(RetrieverQueryEngine):
             transformations=transformations,
         )
 
+    @classmethod
+    def _from_parsed_files(
+        cls,
+        batches: Iterable[ParsedFiles],
+        transformations: Optional[list[TransformComponent]] = None,
+        embed_model: BaseEmbedding = None,
+        llm: LLM = None,
+        retriever_configs: list[BaseRetrieverConfig] = None,
+        ranker_configs: list[BaseRankerConfig] = None,
+    ) -> "SimpleEngine":
+        """Build the engine from the first batch with nodes, then add the nodes of each later batch as it is parsed.
+
+        So only the nodes of one batch are held at a time, besides those in the index.
+        """
+        embed_model = cls._resolve_embed_model(embed_model, retriever_configs)
+        engine, empty_batches = None, []
+        for parsed in batches:
+            if not parsed.nodes:
+                empty_batches.append(parsed)  # some retrievers, e.g. bm25, can not be built without nodes
+                continue
+            set_node_embeddings(parsed.nodes, embed_model)
+            if engine is None:
+                engine = cls._from_nodes(
+                    nodes=parsed.nodes,
+                    transformations=transformations,
+                    embed_model=embed_model,
+                    llm=llm,
+                    retriever_configs=retriever_configs,
+                    ranker_configs=ranker_configs,
+                )
+            else:
+                engine._save_nodes(parsed.nodes)
+            engine._manifest.update(parsed.doc_files, parsed.nodes, parsed.input_files)
+
+        if engine is None:
+            engine = cls._from_nodes(
+                nodes=[],
+                transformations=transformations,
+                embed_model=embed_model,
+                llm=llm,
+                retriever_configs=retriever_configs,
+                ranker_configs=ranker_configs,
+            )
+        for parsed in empty_batches:
+            engine._manifest.update(parsed.doc_files, parsed.nodes, parsed.input_files)
+        return engine
+
     @classmethod
     def _from_index(
         cls,
@@ -258,12 +381,24 @@ class SimpleEngine(RetrieverQueryEngine):
             response_synthesizer=get_response_synthesizer(llm=llm),
         )
 
+    @classmethod
+    def _set_bm25_persist_path(cls, retriever_configs: list[BaseRetrieverConfig], index_config: BaseIndexConfig):
+        """Let bm25 retrievers load the bm25 index persisted along with the index."""
+        for retriever_config in retriever_configs or []:
+            if isinstance(retriever_config, HybridRetrieverConfig):
+                cls._set_bm25_persist_path(retriever_config.retriever_configs, index_config)
+            elif isinstance(retriever_config, BM25RetrieverConfig) and not retriever_config.persist_path:
+                retriever_config.persist_path = index_config.persist_path
+
     def _ensure_retriever_modifiable(self):
         self._ensure_retriever_of_type(ModifiableRAGRetriever)
 
     def _ensure_retriever_persistable(self):
         self._ensure_retriever_of_type(PersistableRAGRetriever)
 
+    def _ensure_retriever_deletable(self):
+        self._ensure_retriever_of_type(DeletableRAGRetriever)
+
     def _ensure_retriever_of_type(self, required_type: BaseRetriever):
         """Ensure that self.retriever is required_type, or at least one of its components, if it's a SimpleHybridRetriever.
 
@@ -296,9 +431,7 @@ class SimpleEngine(RetrieverQueryEngine):
 
     @staticmethod
     def _fix_document_metadata(documents: list[Document]):
-        """LlamaIndex keep metadata['file_path'], which is unnecessary, maybe deleted in the near future."""
-        for doc in documents:
-            doc.excluded_embed_metadata_keys.append("file_path")
+        fix_document_metadata(documents)
 
     @staticmethod
     def _resolve_embed_model(embed_model: BaseEmbedding = None, configs: list[Any] = None) -> BaseEmbedding:
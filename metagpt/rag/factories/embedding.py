@@ -12,6 +12,7 @@ from llama_index.embeddings.openai import OpenAIEmbedding
 from metagpt.config2 import config
 from metagpt.configs.embedding_config import EmbeddingType
 from metagpt.configs.llm_config import LLMType
+from metagpt.rag.embeddings import CachedEmbedding
 from metagpt.rag.factories.base import GenericFactory
 
 
@@ -31,8 +32,16 @@ class RAGEmbeddingFactory(GenericFactory):
         super().__init__(creators)
 
     def get_rag_embedding(self, key: EmbeddingType = None) -> BaseEmbedding:
-        """Key is EmbeddingType."""
-        return super().get_instance(key or self._resolve_embedding_type())
+        """Key is EmbeddingType. With `embedding.cache` on, the model is wrapped by a CachedEmbedding."""
+        embed_model = super().get_instance(key or self._resolve_embedding_type())
+        if config.embedding.cache:
+            embed_model = CachedEmbedding(
+                embed_model=embed_model,
+                cache_path=config.embedding.cache_path,
+                concurrency=config.embedding.embed_concurrency,
+            )
+
+        return embed_model
 
     def _resolve_embedding_type(self) -> EmbeddingType | LLMType:
         """Resolves the embedding type.
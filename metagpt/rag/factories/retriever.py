@@ -27,6 +27,7 @@ from metagpt.rag.schema import (
     ElasticsearchKeywordRetrieverConfig,
     ElasticsearchRetrieverConfig,
     FAISSRetrieverConfig,
+    HybridRetrieverConfig,
 )
 
 
@@ -56,6 +57,7 @@ class RetrieverFactory(ConfigBasedFactory):
             ChromaRetrieverConfig: self._create_chroma_retriever,
             ElasticsearchRetrieverConfig: self._create_es_retriever,
             ElasticsearchKeywordRetrieverConfig: self._create_es_retriever,
+            HybridRetrieverConfig: self._create_hybrid_retriever,
         }
         super().__init__(creators)
 
@@ -71,6 +73,18 @@ class RetrieverFactory(ConfigBasedFactory):
 
         return SimpleHybridRetriever(*retrievers) if len(retrievers) > 1 else retrievers[0]
 
+    def _create_hybrid_retriever(self, config: HybridRetrieverConfig, **kwargs) -> SimpleHybridRetriever:
+        retrievers = super().get_instances(config.retriever_configs, **kwargs)
+
+        return SimpleHybridRetriever(
+            *retrievers,
+            fusion_mode=config.fusion_mode,
+            weights=config.weights,
+            similarity_top_k=config.similarity_top_k,
+            rrf_k=config.rrf_k,
+            timeout=config.timeout,
+        )
+
     def _create_default(self, **kwargs) -> RAGRetriever:
         index = self._extract_index(None, **kwargs) or self._build_default_index(**kwargs)
 
@@ -45,3 +45,17 @@ class PersistableRAGRetriever(RAGRetriever):
     @abstractmethod
     def persist(self, persist_dir: str, **kwargs) -> None:
         """To support persist, must inplement this func"""
+
+
+class DeletableRAGRetriever(RAGRetriever):
+    """Support deletion."""
+
+    @classmethod
+    def __subclasshook__(cls, C):
+        if cls is DeletableRAGRetriever:
+            return check_methods(C, "delete_docs")
+        return NotImplemented
+
+    @abstractmethod
+    def delete_docs(self, ref_doc_ids: list[str], **kwargs) -> None:
+        """To support delete docs, must inplement this func, deleting the nodes of the documents"""
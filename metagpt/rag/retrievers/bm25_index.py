@@ -0,0 +1,241 @@
+"""Incremental BM25 index."""
+
+import json
+import os
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Hashable, Optional, Union
+
+import numpy as np
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index that grows and shrinks document by document.
+
+    Scores are the ones `rank_bm25.BM25Okapi` gives over the live documents, but adding or removing a document only
+    touches the postings of its own terms, so the cost of an update does not depend on the size of the corpus.
+    Idf values depend on the whole corpus and are recomputed, vectorized, on the first query after a change.
+
+    Removed documents are tombstoned and dropped from the postings once they outnumber the live ones.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self._term_ids: dict[str, int] = {}
+        self._df = array("q")  # term id -> number of live documents containing it
+        self._post_docs: list[array] = []  # term id -> slots of the documents containing it, ascending
+        self._post_tfs: list[array] = []  # term id -> term frequency in each of those documents
+
+        self._keys: list[Optional[Hashable]] = []  # slot -> document key, None once removed
+        self._slots: dict[Hashable, int] = {}  # document key -> slot
+        self._doc_len = np.zeros(0, dtype=np.int64)  # slot -> number of tokens, over-allocated
+        self._alive = np.zeros(0, dtype=bool)
+        self._total_len = 0
+
+        self._idf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def keys(self) -> list[Hashable]:
+        """Keys of the live documents, in insertion order."""
+        return [key for key in self._keys if key is not None]
+
+    def add(self, key: Hashable, tokens: list[str]):
+        """Index a document given its tokens, in O(len(tokens))."""
+        if key in self._slots:
+            raise KeyError(f"Document {key!r} is already indexed, remove it first.")
+
+        slot = len(self._keys)
+        for term, tf in Counter(tokens).items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._df)
+                self._df.append(0)
+                self._post_docs.append(array("i"))
+                self._post_tfs.append(array("i"))
+            self._df[term_id] += 1
+            self._post_docs[term_id].append(slot)
+            self._post_tfs[term_id].append(tf)
+
+        if slot == len(self._doc_len):
+            capacity = max(64, 2 * slot)
+            self._doc_len = np.concatenate([self._doc_len, np.zeros(capacity - slot, dtype=np.int64)])
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - slot, dtype=bool)])
+        self._doc_len[slot] = len(tokens)
+        self._alive[slot] = True
+        self._total_len += len(tokens)
+
+        self._keys.append(key)
+        self._slots[key] = slot
+        self._idf = None
+
+    def remove(self, key: Hashable, tokens: list[str]):
+        """Remove a document, given the same tokens it was added with."""
+        slot = self._slots.pop(key)
+        for term in set(tokens):
+            self._df[self._term_ids[term]] -= 1
+
+        self._keys[slot] = None
+        self._alive[slot] = False
+        self._total_len -= int(self._doc_len[slot])
+        self._idf = None
+
+        if len(self._keys) - len(self._slots) > len(self._slots):
+            self._compact()
+
+    def clear(self):
+        self.__init__(k1=self.k1, b=self.b, epsilon=self.epsilon)
+
+    def get_scores(self, tokens: list[str]) -> np.ndarray:
+        """BM25 score of every live document, in insertion order."""
+        slots, scores = self._score(tokens)
+        dense = np.zeros(len(self._keys))
+        dense[slots] = scores
+        return dense[self._alive[: len(self._keys)]]
+
+    def top_k(self, tokens: list[str], k: int) -> list[tuple[Hashable, float]]:
+        """Return the `k` best (key, score) pairs, best first, ties in insertion order.
+
+        Only the documents sharing a term with the query are scored. Others score 0, and are only looked at when
+        fewer than `k` documents score above that.
+        """
+        k = min(k, len(self._slots))
+        if k <= 0:
+            return []
+
+        slots, scores = self._score(tokens)
+        if np.count_nonzero(scores > 0) < k:
+            slots = np.flatnonzero(self._alive[: len(self._keys)])
+            scores = self.get_scores(tokens)
+
+        slots, scores = self._select(slots, scores, k)
+        return [(self._keys[slot], float(score)) for slot, score in zip(slots.tolist(), scores.tolist())]
+
+    def _score(self, tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the live slots sharing a term with the query, ascending, and their scores."""
+        idf = self._get_idf()
+        doc_len = self._doc_len[: len(self._keys)]
+        avgdl = self._total_len / len(self._slots) if self._slots else 1.0
+
+        all_slots, all_scores = [], []
+        for term, count in Counter(tokens).items():
+            term_id = self._term_ids.get(term)
+            if term_id is None or not self._df[term_id]:
+                continue
+            slots = np.array(self._post_docs[term_id], dtype=np.int64)
+            tfs = np.array(self._post_tfs[term_id], dtype=np.float64)
+            norm = self.k1 * (1 - self.b + self.b * doc_len[slots] / avgdl)
+            all_slots.append(slots)
+            all_scores.append(count * idf[term_id] * (tfs * (self.k1 + 1) / (tfs + norm)))
+
+        if not all_slots:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        slots, inverse = np.unique(np.concatenate(all_slots), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(all_scores), minlength=len(slots))
+        alive = self._alive[slots]
+        return slots[alive], scores[alive]
+
+    @staticmethod
+    def _select(slots: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """The k best of ascending slots, ordered by score descending then slot, like a stable sort."""
+        if k < len(scores):
+            kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores > kth
+            ties = np.flatnonzero(scores == kth)[: k - np.count_nonzero(keep)]
+            keep[ties] = True
+            slots, scores = slots[keep], scores[keep]
+        order = np.lexsort((slots, -scores))
+        return slots[order], scores[order]
+
+    def _get_idf(self) -> np.ndarray:
+        """Idf of every term, floored at epsilon * average idf like BM25Okapi."""
+        if self._idf is not None:
+            return self._idf
+
+        df = np.array(self._df, dtype=np.float64)
+        present = df > 0
+        idf = np.zeros_like(df)
+        if present.any():
+            idf[present] = np.log(len(self._slots) - df[present] + 0.5) - np.log(df[present] + 0.5)
+            eps = self.epsilon * idf[present].mean()
+            idf[present & (idf < 0)] = eps
+        self._idf = idf
+        return idf
+
+    def _compact(self):
+        """Drop removed documents from the postings and terms no live document contains."""
+        alive = self._alive[: len(self._keys)]
+        new_slots = np.cumsum(alive) - 1
+
+        term_ids, df, post_docs, post_tfs = {}, array("q"), [], []
+        for term, term_id in self._term_ids.items():
+            if not self._df[term_id]:
+                continue
+            slots = np.array(self._post_docs[term_id], dtype=np.int64)
+            keep = alive[slots]
+            term_ids[term] = len(df)
+            df.append(self._df[term_id])
+            post_docs.append(array("i", new_slots[slots[keep]].astype(np.int32).tobytes()))
+            post_tfs.append(array("i", np.array(self._post_tfs[term_id], dtype=np.int32)[keep].tobytes()))
+
+        self._term_ids, self._df, self._post_docs, self._post_tfs = term_ids, df, post_docs, post_tfs
+        self._keys = [key for key in self._keys if key is not None]
+        self._slots = {key: slot for slot, key in enumerate(self._keys)}
+        self._doc_len = self._doc_len[: len(alive)][alive]
+        self._alive = np.ones(len(self._keys), dtype=bool)
+        self._idf = None
+
+    def save(self, path: Union[str, os.PathLike]):
+        """Write the index as flat arrays to a npz file. Keys must be JSON serializable, e.g. node ids."""
+        if len(self._keys) > len(self._slots):
+            self._compact()
+
+        lengths = np.array([len(docs) for docs in self._post_docs], dtype=np.int64)
+        arrays = {
+            "params": np.array([self.k1, self.b, self.epsilon]),
+            "terms": np.frombuffer(json.dumps(list(self._term_ids)).encode("utf-8"), dtype=np.uint8),
+            "keys": np.frombuffer(json.dumps(self._keys).encode("utf-8"), dtype=np.uint8),
+            "df": np.array(self._df, dtype=np.int64),
+            "indptr": np.concatenate([[0], np.cumsum(lengths)]),
+            "docs": np.frombuffer(b"".join(docs.tobytes() for docs in self._post_docs), dtype=np.int32),
+            "tfs": np.frombuffer(b"".join(tfs.tobytes() for tfs in self._post_tfs), dtype=np.int32),
+            "doc_len": self._doc_len[: len(self._keys)],
+        }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "BM25Index":
+        with np.load(path) as data:
+            k1, b, epsilon = data["params"].tolist()
+            index = cls(k1=k1, b=b, epsilon=epsilon)
+
+            terms = json.loads(data["terms"].tobytes().decode("utf-8"))
+            index._keys = json.loads(data["keys"].tobytes().decode("utf-8"))
+            index._df = array("q", data["df"].tobytes())
+            indptr = data["indptr"].tolist()
+            docs = data["docs"].astype(np.int32).tobytes()
+            tfs = data["tfs"].astype(np.int32).tobytes()
+            index._doc_len = data["doc_len"].astype(np.int64)
+
+        index._term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        for start, end in zip(indptr, indptr[1:]):
+            index._post_docs.append(array("i", docs[start * 4 : end * 4]))
+            index._post_tfs.append(array("i", tfs[start * 4 : end * 4]))
+        index._slots = {key: slot for slot, key in enumerate(index._keys)}
+        index._alive = np.ones(len(index._keys), dtype=bool)
+        index._total_len = int(index._doc_len.sum())
+        return index
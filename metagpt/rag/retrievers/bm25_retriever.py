@@ -1,16 +1,27 @@
 """BM25 retriever."""
-from typing import Callable, Optional
+from pathlib import Path
+from typing import Callable, Optional, Union
 
 from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.callbacks.base import CallbackManager
 from llama_index.core.constants import DEFAULT_SIMILARITY_TOP_K
-from llama_index.core.schema import BaseNode, IndexNode
+from llama_index.core.schema import BaseNode, IndexNode, NodeWithScore, QueryBundle
 from llama_index.retrievers.bm25 import BM25Retriever
-from rank_bm25 import BM25Okapi
+from llama_index.retrievers.bm25.base import tokenize_remove_stopwords
+
+from metagpt.logs import logger
+from metagpt.rag.retrievers.bm25_index import BM25Index
+
+BM25_INDEX_FNAME = "bm25_index.npz"
 
 
 class DynamicBM25Retriever(BM25Retriever):
-    """BM25 retriever."""
+    """BM25 retriever.
+
+    Backed by an incremental `BM25Index` instead of a `BM25Okapi` rebuilt over the whole corpus, so adding or deleting
+    nodes only costs the tokenization of those nodes.
+    """
 
     def __init__(
         self,
@@ -22,28 +33,85 @@ class DynamicBM25Retriever(BM25Retriever):
         object_map: Optional[dict] = None,
         verbose: bool = False,
         index: VectorStoreIndex = None,
+        persist_path: Optional[Union[str, Path]] = None,
     ) -> None:
-        super().__init__(
-            nodes=nodes,
-            tokenizer=tokenizer,
-            similarity_top_k=similarity_top_k,
+        # BM25Retriever.__init__ would build a BM25Okapi over all nodes, which BM25Index replaces.
+        BaseRetriever.__init__(
+            self,
             callback_manager=callback_manager,
             object_map=object_map,
             objects=objects,
             verbose=verbose,
         )
+        self._tokenizer = tokenizer or tokenize_remove_stopwords
+        self._similarity_top_k = similarity_top_k
         self._index = index
+        self._node_map: dict[str, BaseNode] = {}
+        self.bm25, nodes = self._load_bm25_index(persist_path, nodes)
+        self._add_to_bm25(nodes)
+
+    @property
+    def _nodes(self) -> list[BaseNode]:
+        return list(self._node_map.values())
 
     def add_nodes(self, nodes: list[BaseNode], **kwargs) -> None:
-        """Support add nodes."""
-        self._nodes.extend(nodes)
-        self._corpus = [self._tokenizer(node.get_content()) for node in self._nodes]
-        self.bm25 = BM25Okapi(self._corpus)
+        """Support add nodes. A node with the id of an existing one replaces it."""
+        self._add_to_bm25(nodes)
 
         if self._index:
             self._index.insert_nodes(nodes, **kwargs)
 
+    def delete_docs(self, ref_doc_ids: list[str], **kwargs) -> None:
+        """Support delete docs."""
+        ref_doc_ids = set(ref_doc_ids)
+        for node_id in [node_id for node_id, node in self._node_map.items() if node.ref_doc_id in ref_doc_ids]:
+            self._remove_node(node_id)
+
+        if self._index:
+            for ref_doc_id in ref_doc_ids:
+                self._index.delete_ref_doc(ref_doc_id, delete_from_docstore=True, **kwargs)
+
     def persist(self, persist_dir: str, **kwargs) -> None:
-        """Support persist."""
+        """Support persist. The bm25 index is saved next to the index storage."""
         if self._index:
             self._index.storage_context.persist(persist_dir)
+        self.bm25.save(Path(persist_dir) / BM25_INDEX_FNAME)
+
+    def _get_scored_nodes(self, query: str) -> list[NodeWithScore]:
+        scores = self.bm25.get_scores(self._tokenizer(query))
+        return [NodeWithScore(node=node, score=float(score)) for node, score in zip(self._node_map.values(), scores)]
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        if query_bundle.custom_embedding_strs or query_bundle.embedding:
+            logger.warning("BM25Retriever does not support embeddings, skipping...")
+
+        top_k = self.bm25.top_k(self._tokenizer(query_bundle.query_str), self._similarity_top_k)
+        return [NodeWithScore(node=self._node_map[node_id], score=score) for node_id, score in top_k]
+
+    def _add_to_bm25(self, nodes: list[BaseNode]):
+        for node in nodes:
+            if node.node_id in self._node_map:
+                self._remove_node(node.node_id)
+            self.bm25.add(node.node_id, self._tokenizer(node.get_content()))
+            self._node_map[node.node_id] = node
+
+    def _remove_node(self, node_id: str):
+        node = self._node_map.pop(node_id)
+        self.bm25.remove(node_id, self._tokenizer(node.get_content()))
+
+    def _load_bm25_index(
+        self, persist_path: Optional[Union[str, Path]], nodes: list[BaseNode]
+    ) -> tuple[BM25Index, list[BaseNode]]:
+        """Load the bm25 index persisted with the nodes, return it and the nodes it misses, which still need indexing."""
+        filename = Path(persist_path) / BM25_INDEX_FNAME if persist_path else None
+        if not filename or not filename.exists():
+            return BM25Index(), nodes
+
+        bm25 = BM25Index.load(filename)
+        node_map = {node.node_id: node for node in nodes}
+        if any(key not in node_map for key in bm25.keys()):
+            logger.warning(f"{filename} does not match the nodes, rebuilding the bm25 index.")
+            return BM25Index(), nodes
+
+        self._node_map = {key: node_map[key] for key in bm25.keys()}
+        return bm25, [node for node in nodes if node.node_id not in bm25]
@@ -11,6 +11,11 @@ class ChromaRetriever(VectorIndexRetriever):
         """Support add nodes."""
         self._index.insert_nodes(nodes, **kwargs)
 
+    def delete_docs(self, ref_doc_ids: list[str], **kwargs) -> None:
+        """Support delete docs."""
+        for ref_doc_id in ref_doc_ids:
+            self._index.delete_ref_doc(ref_doc_id, delete_from_docstore=True, **kwargs)
+
     def persist(self, persist_dir: str, **kwargs) -> None:
         """Support persist.
 
@@ -1,16 +1,53 @@
 """FAISS retriever."""
 
+import numpy as np
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.schema import BaseNode
 
 
 class FAISSRetriever(VectorIndexRetriever):
-    """FAISS retriever."""
+    """FAISS retriever.
+
+    The index is an IndexFlatL2, the scores are L2 distances, lower being better. Searching it is synchronous.
+    """
+
+    score_is_distance = True
+    is_sync = True
 
     def add_nodes(self, nodes: list[BaseNode], **kwargs) -> None:
         """Support add nodes."""
         self._index.insert_nodes(nodes, **kwargs)
 
+    def delete_docs(self, ref_doc_ids: list[str], **kwargs) -> None:
+        """Support delete docs.
+
+        FaissVectorStore can't delete, and the ids of its vectors are their positions. So the vectors are removed from
+        the faiss index directly, which keeps the order of the others, and the vector ids of the index are shifted.
+        """
+        docstore = self._index.docstore
+        node_ids = set()
+        for ref_doc_id in ref_doc_ids:
+            ref_doc_info = docstore.get_ref_doc_info(ref_doc_id)
+            if ref_doc_info:
+                node_ids.update(ref_doc_info.node_ids)
+
+        index_struct = self._index.index_struct
+        removed = np.array(
+            sorted(int(vector_id) for vector_id, node_id in index_struct.nodes_dict.items() if node_id in node_ids),
+            dtype=np.int64,
+        )
+        if len(removed):
+            self._index.vector_store.client.remove_ids(removed)
+            index_struct.nodes_dict = {
+                str(int(vector_id) - int(np.searchsorted(removed, int(vector_id)))): node_id
+                for vector_id, node_id in index_struct.nodes_dict.items()
+                if node_id not in node_ids
+            }
+            self._index.storage_context.index_store.add_index_struct(index_struct)
+
+        for ref_doc_id in ref_doc_ids:
+            docstore.delete_ref_doc(ref_doc_id, raise_error=False)
+
     def persist(self, persist_dir: str, **kwargs) -> None:
         """Support persist."""
         self._index.storage_context.persist(persist_dir)
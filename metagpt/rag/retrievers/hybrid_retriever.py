@@ -1,48 +1,157 @@
 """Hybrid retriever."""
 
+import asyncio
 import copy
+from typing import Optional, Union
 
-from llama_index.core.schema import BaseNode, QueryType
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryType
 
+from metagpt.logs import logger
 from metagpt.rag.retrievers.base import RAGRetriever
+from metagpt.rag.schema import FusionMode
 
 
 class SimpleHybridRetriever(RAGRetriever):
     """A composite retriever that aggregates search results from multiple retrievers."""
 
-    def __init__(self, *retrievers):
+    def __init__(
+        self,
+        *retrievers,
+        fusion_mode: FusionMode = FusionMode.SIMPLE,
+        weights: Optional[list[float]] = None,
+        similarity_top_k: Optional[int] = None,
+        rrf_k: int = 60,
+        timeout: Optional[Union[float, list[Optional[float]]]] = None,
+    ):
         self.retrievers: list[RAGRetriever] = retrievers
+        self.fusion_mode = FusionMode(fusion_mode)
+        self.weights = weights or [1.0] * len(retrievers)
+        self.similarity_top_k = similarity_top_k
+        self.rrf_k = rrf_k
+        self.timeouts = timeout if isinstance(timeout, list) else [timeout] * len(retrievers)
+        if len(self.weights) != len(retrievers) or len(self.timeouts) != len(retrievers):
+            raise ValueError("weights and timeouts must have one value per retriever.")
         super().__init__()
 
     async def _aretrieve(self, query: QueryType, **kwargs):
         """Asynchronously retrieves and aggregates search results from all configured retrievers.
 
-        This method queries each retriever in the `retrievers` list with the given query and
-        additional keyword arguments. It then combines the results, ensuring that each node is
-        unique, based on the node's ID.
+        The retrievers are queried concurrently, each with its own copy of the query and its own timeout; a retriever
+        that times out contributes no results. A retriever without a native async path, e.g. BM25 or FAISS, is run in a
+        thread, so that it neither blocks the others nor escapes its timeout. The results are then fused according to
+        `fusion_mode`.
         """
-        all_nodes = []
-        for retriever in self.retrievers:
-            # Prevent retriever changing query
-            query_copy = copy.deepcopy(query)
-            nodes = await retriever.aretrieve(query_copy, **kwargs)
-            all_nodes.extend(nodes)
-
-        # combine all nodes
-        result = []
-        node_ids = set()
-        for n in all_nodes:
-            if n.node.node_id not in node_ids:
-                result.append(n)
-                node_ids.add(n.node.node_id)
-        return result
+        results = await asyncio.gather(
+            *[
+                self._aretrieve_with_timeout(retriever, query, timeout, **kwargs)
+                for retriever, timeout in zip(self.retrievers, self.timeouts)
+            ]
+        )
+        return self._fuse(results)
+
+    def _retrieve(self, query: QueryType):
+        results = [retriever.retrieve(copy.copy(query)) for retriever in self.retrievers]
+        return self._fuse(results)
 
     def add_nodes(self, nodes: list[BaseNode]) -> None:
         """Support add nodes."""
         for r in self.retrievers:
             r.add_nodes(nodes)
 
+    def delete_docs(self, ref_doc_ids: list[str], **kwargs) -> None:
+        """Support delete docs."""
+        for r in self.retrievers:
+            r.delete_docs(ref_doc_ids, **kwargs)
+
     def persist(self, persist_dir: str, **kwargs) -> None:
         """Support persist."""
         for r in self.retrievers:
             r.persist(persist_dir, **kwargs)
+
+    @staticmethod
+    async def _aretrieve_with_timeout(
+        retriever: RAGRetriever, query: QueryType, timeout: Optional[float], **kwargs
+    ) -> list[NodeWithScore]:
+        # Prevent retriever changing query, retrievers only reassign its fields so a shallow copy is enough
+        query_copy = copy.copy(query)
+        if is_sync_retriever(retriever):
+            retrieval = asyncio.to_thread(retriever.retrieve, query_copy)
+        else:
+            retrieval = retriever.aretrieve(query_copy, **kwargs)
+        try:
+            return await asyncio.wait_for(retrieval, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{type(retriever).__name__} did not respond in {timeout}s, skipped.")
+            return []
+
+    def _fuse(self, results: list[list[NodeWithScore]]) -> list[NodeWithScore]:
+        if self.fusion_mode == FusionMode.RECIPROCAL_RANK:
+            fused = reciprocal_rank_fusion(results, self.weights, self.rrf_k)
+        elif self.fusion_mode == FusionMode.WEIGHTED_SCORE:
+            distances = [getattr(retriever, "score_is_distance", False) is True for retriever in self.retrievers]
+            fused = weighted_score_fusion(results, self.weights, distances)
+        else:
+            fused = simple_fusion(results)
+        return fused[: self.similarity_top_k] if self.similarity_top_k else fused
+
+
+def is_sync_retriever(retriever: RAGRetriever) -> bool:
+    """Whether the aretrieve of the retriever would run synchronously in the event loop.
+
+    A retriever declares it with `is_sync = True`, e.g. a vector index retriever over a local index; otherwise it is
+    sync if it keeps the default `_aretrieve` of llama-index, which calls `_retrieve`.
+    """
+    declared = getattr(retriever, "is_sync", None)
+    if isinstance(declared, bool):
+        return declared
+    return isinstance(retriever, BaseRetriever) and type(retriever)._aretrieve is BaseRetriever._aretrieve
+
+
+def simple_fusion(results: list[list[NodeWithScore]]) -> list[NodeWithScore]:
+    """Combine all nodes, ensuring that each node is unique based on the node's ID. The first result wins."""
+    fused = {}
+    for nodes in results:
+        for n in nodes:
+            fused.setdefault(n.node.node_id, n)
+    return list(fused.values())
+
+
+def reciprocal_rank_fusion(
+    results: list[list[NodeWithScore]], weights: list[float], k: int = 60
+) -> list[NodeWithScore]:
+    """Score each node by the sum of weight / (k + rank) over the retrievers that returned it, rank starting at 1."""
+    return _rank_fused(
+        results, [[weight / (k + rank) for rank in range(1, len(nodes) + 1)] for nodes, weight in zip(results, weights)]
+    )
+
+
+def weighted_score_fusion(
+    results: list[list[NodeWithScore]], weights: list[float], distances: Optional[list[bool]] = None
+) -> list[NodeWithScore]:
+    """Score each node by the weighted sum of its scores, min-max normalized per retriever to be comparable.
+
+    The scores of a retriever flagged in `distances` are distances, e.g. L2 of FAISS, lower being better, so their
+    normalized values are flipped.
+    """
+    contributions = []
+    for nodes, weight, is_distance in zip(results, weights, distances or [False] * len(results)):
+        scores = [n.score or 0.0 for n in nodes]
+        low, high = min(scores, default=0.0), max(scores, default=0.0)
+        normalized = [(s - low) / (high - low) if high > low else 1.0 for s in scores]
+        if is_distance and high > low:
+            normalized = [1.0 - i for i in normalized]
+        contributions.append([weight * i for i in normalized])
+    return _rank_fused(results, contributions)
+
+
+def _rank_fused(results: list[list[NodeWithScore]], contributions: list[list[float]]) -> list[NodeWithScore]:
+    """Sum the contributions of each node, best first, ties in order of first appearance."""
+    nodes, scores = {}, {}
+    for result, contribution in zip(results, contributions):
+        for n, score in zip(result, contribution):
+            node_id = n.node.node_id
+            nodes.setdefault(node_id, n.node)
+            scores[node_id] = scores.get(node_id, 0.0) + score
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [NodeWithScore(node=nodes[node_id], score=scores[node_id]) for node_id in ranked]
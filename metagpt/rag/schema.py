@@ -59,6 +59,10 @@ class FAISSRetrieverConfig(IndexRetrieverConfig):
 class BM25RetrieverConfig(IndexRetrieverConfig):
     """Config for BM25-based retrievers."""
 
+    persist_path: Optional[Union[str, Path]] = Field(
+        default=None, description="The directory of a persisted bm25 index, loaded instead of tokenizing all nodes."
+    )
+
     _no_embedding: bool = PrivateAttr(default=True)
 
 
@@ -101,6 +105,32 @@ class ElasticsearchKeywordRetrieverConfig(ElasticsearchRetrieverConfig):
     )
 
 
+class FusionMode(str, Enum):
+    """How SimpleHybridRetriever merges the results of its retrievers."""
+
+    SIMPLE = "simple"  # keep the first result of each node, in the order of the retrievers
+    RECIPROCAL_RANK = "reciprocal_rank"  # sum of weight / (rrf_k + rank) over the retrievers
+    WEIGHTED_SCORE = "weighted_score"  # weighted sum of the scores min-max normalized per retriever, higher is better
+
+
+class HybridRetrieverConfig(BaseRetrieverConfig):
+    """Config for a hybrid retriever, which queries its retrievers concurrently and fuses their results.
+
+    similarity_top_k is the number of results kept after fusion.
+    """
+
+    retriever_configs: list[BaseRetrieverConfig] = Field(..., description="Configs of the retrievers to combine.")
+    fusion_mode: FusionMode = Field(default=FusionMode.RECIPROCAL_RANK, description="How to fuse the results.")
+    weights: Optional[list[float]] = Field(
+        default=None, description="Weight of each retriever in fusion, all 1.0 by default."
+    )
+    rrf_k: int = Field(default=60, description="Rank offset of reciprocal rank fusion, damping the top ranks.")
+    timeout: Optional[Union[float, list[Optional[float]]]] = Field(
+        default=None,
+        description="Seconds to wait for each retriever, or a list with one per retriever. Late retrievers are skipped.",
+    )
+
+
 class BaseRankerConfig(BaseModel):
     """Common config for rankers.
 
@@ -12,16 +12,21 @@ This script is designed to create a symbols repository from the provided source
 from __future__ import annotations
 
 import ast
+import functools
+import hashlib
 import json
+import os
 import re
+import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 from pydantic import BaseModel, Field, field_validator
 
-from metagpt.const import AGGREGATION, COMPOSITION, GENERALIZATION
+from metagpt.const import AGGREGATION, COMPOSITION, CONFIG_ROOT, GENERALIZATION
 from metagpt.logs import logger
 from metagpt.utils.common import any_to_str, aread, remove_white_spaces
 from metagpt.utils.exceptions import handle_exception
@@ -419,15 +424,79 @@ class DotClassMethod(BaseModel):
         return attrs
 
 
+DEFAULT_SYMBOLS_CACHE_ROOT = CONFIG_ROOT / "repo_symbols_cache"
+# below this many files to parse, a process pool costs more than it saves
+MIN_FILES_PER_POOL = 32
+
+
+class RepoSymbolsCache:
+    """
+    Persistent cache of the symbols of the files of a project, as dumped `RepoFileInfo`, keyed by file.
+
+    A file whose mtime and size are unchanged is assumed unchanged, otherwise its content hash decides.
+    """
+
+    VERSION = 1
+
+    def __init__(self, pathname: Path):
+        self.pathname = Path(pathname)
+        self.entries: Dict[str, dict] = {}
+        if self.pathname.exists():
+            try:
+                data = json.loads(self.pathname.read_text(encoding="utf-8"))
+                if data.get("version") == self.VERSION:
+                    self.entries = data["files"]
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignore invalid symbols cache {self.pathname}: {e}")
+
+    def get(self, key: str, path: Path) -> Optional[dict]:
+        """Return the cached symbols of the file if it is unchanged, None otherwise."""
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        stat = path.stat()
+        if (entry["mtime"], entry["size"]) == (stat.st_mtime, stat.st_size):
+            return entry["symbols"]
+        if entry["sha256"] == file_sha256(path):
+            entry["mtime"], entry["size"] = stat.st_mtime, stat.st_size  # touched only
+            return entry["symbols"]
+        return None
+
+    def put(self, key: str, path: Path, symbols: dict):
+        stat = path.stat()
+        self.entries[key] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha256": file_sha256(path),
+            "symbols": symbols,
+        }
+
+    def save(self, keys: List[str]):
+        """Save the entries of the given keys only, dropping the files no longer in the project."""
+        self.entries = {key: self.entries[key] for key in keys if key in self.entries}
+        self.pathname.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.pathname.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "files": self.entries}), encoding="utf-8")
+        os.replace(tmp, self.pathname)
+
+
 class RepoParser(BaseModel):
     """
     Tool to build a symbols repository from a project directory.
 
     Attributes:
         base_directory (Path): The base directory of the project.
+        cache_path (Path): The symbols cache file, so that only changed files are parsed again. Default is a file of
+            the project under ~/.metagpt/repo_symbols_cache.
+        use_cache (bool): Whether to use the symbols cache. Default is to use it only if `cache_path` is given, so
+            that nothing is written outside the project unless asked for.
+        num_workers (int): The number of processes parsing the files. Default is the number of CPUs.
     """
 
     base_directory: Path = Field(default=None)
+    cache_path: Optional[Path] = Field(default=None)
+    use_cache: Optional[bool] = Field(default=None)
+    num_workers: Optional[int] = Field(default=None)
 
     @classmethod
     @handle_exception(exception_type=Exception, default_return=[])
@@ -477,19 +546,59 @@ class RepoParser(BaseModel):
         Returns:
             List[RepoFileInfo]: A list of RepoFileInfo objects containing the extracted information.
         """
-        files_classes = []
+        return [_to_repo_file_info(i) for i in self._generate_symbol_dicts()]
+
+    def _generate_symbol_dicts(self) -> List[dict]:
+        """
+        Builds the dumped RepoFileInfo of every '.py' file, taken from the cache for the unchanged files. The
+        others are parsed, in parallel if there are many, and the cache is updated.
+        """
         directory = self.base_directory
 
         matching_files = []
         extensions = ["*.py"]
         for ext in extensions:
             matching_files += directory.rglob(ext)
-        for path in matching_files:
-            tree = self._parse_file(path)
-            file_info = self.extract_class_and_function_info(tree, path)
-            files_classes.append(file_info)
 
-        return files_classes
+        keys = [str(path.relative_to(directory)) for path in matching_files]
+        return self._parse_files_with_cache(
+            matching_files, keys, self._get_cache_path(), functools.partial(_parse_symbols, directory)
+        )
+
+    def _parse_files_with_cache(
+        self, paths: List[Path], keys: List[str], cache_path: Path, parse: Callable[[Path], dict]
+    ) -> List[dict]:
+        """Returns the results of `parse` on the files, taken from the cache at `cache_path` for the unchanged ones."""
+        cache = RepoSymbolsCache(cache_path) if self._cache_enabled() else None
+        results = [cache.get(key, path) if cache else None for key, path in zip(keys, paths)]
+        missing = [i for i, v in enumerate(results) if v is None]
+        parsed = self._parse_files([paths[i] for i in missing], parse)
+        for i, v in zip(missing, parsed):
+            results[i] = v
+            if cache:
+                cache.put(keys[i], paths[i], v)
+
+        if cache and (missing or len(cache.entries) != len(keys)):
+            cache.save(keys)
+        logger.debug(f"Parsed {len(missing)} of {len(keys)} files, the others were cached in {cache_path}.")
+        return results
+
+    def _parse_files(self, paths: List[Path], parse: Callable[[Path], dict]) -> List[dict]:
+        num_workers = self.num_workers or os.cpu_count() or 1
+        if num_workers <= 1 or len(paths) < MIN_FILES_PER_POOL:
+            return [parse(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            chunksize = max(1, len(paths) // (num_workers * 4))
+            return list(pool.map(parse, paths, chunksize=chunksize))
+
+    def _cache_enabled(self) -> bool:
+        return self.cache_path is not None if self.use_cache is None else self.use_cache
+
+    def _get_cache_path(self) -> Path:
+        if self.cache_path:
+            return Path(self.cache_path)
+        project_id = hashlib.sha1(str(self.base_directory.resolve()).encode("utf-8")).hexdigest()[:16]
+        return DEFAULT_SYMBOLS_CACHE_ROOT / f"{self.base_directory.name}-{project_id}.json"
 
     def generate_json_structure(self, output_path: Path):
         """
@@ -498,7 +607,7 @@ class RepoParser(BaseModel):
         Args:
             output_path (Path): The path to the JSON file to be generated.
         """
-        files_classes = [i.model_dump() for i in self.generate_symbols()]
+        files_classes = self._generate_symbol_dicts()
         output_path.write_text(json.dumps(files_classes, indent=4))
 
     def generate_dataframe_structure(self, output_path: Path):
@@ -508,7 +617,7 @@ class RepoParser(BaseModel):
         Args:
             output_path (Path): The path to the CSV file to be generated.
         """
-        files_classes = [i.model_dump() for i in self.generate_symbols()]
+        files_classes = self._generate_symbol_dicts()
         df = pd.DataFrame(files_classes)
         df.to_csv(output_path, index=False)
 
@@ -710,12 +819,21 @@ class RepoParser(BaseModel):
         """
         return [RepoParser._parse_variable(t) for t in node.targets]
 
-    async def rebuild_class_views(self, path: str | Path = None):
+    async def rebuild_class_views(self, path: str | Path = None, use_pyreverse: bool = False):
         """
-        Executes `pylint` to reconstruct the dot format class view repository file.
+        Reconstructs the class views and the class relationship views of a package.
+
+        The classes are extracted from the syntax trees of the '.py' files. Only the files changed since the last call
+        are parsed again, in parallel if there are many. `pyreverse` is executed instead if `use_pyreverse` is True, or
+        if the extraction fails.
 
         Args:
             path (str | Path): The path to the target directory or file. Default is None.
+            use_pyreverse (bool): Whether to execute `pylint`'s `pyreverse` to extract the classes. Default is False.
+
+        Returns:
+            Tuple[List[DotClassInfo], List[DotClassRelationship], str]: A tuple containing the class views, the
+            relationships, and the root path of the package.
         """
         if not path:
             path = self.base_directory
@@ -725,6 +843,47 @@ class RepoParser(BaseModel):
         init_file = path / "__init__.py"
         if not init_file.exists():
             raise ValueError("Failed to import module __init__ with error:No module named __init__.")
+        if not use_pyreverse:
+            try:
+                return self._extract_class_views(path)
+            except Exception as e:
+                if not shutil.which("pyreverse"):
+                    raise
+                logger.warning(f"Failed to extract the class views of {path}, fall back to pyreverse: {e}")
+        return await self._rebuild_class_views_with_pyreverse(path)
+
+    def _extract_class_views(self, path: Path) -> Tuple[List[DotClassInfo], List[DotClassRelationship], str]:
+        """
+        Extracts the classes of the package from the syntax trees, as `pyreverse` would in its default mode: the
+        public attributes and methods, and the relationships between the classes of the package.
+
+        Args:
+            path (Path): The path to the package directory.
+
+        Returns:
+            Tuple[List[DotClassInfo], List[DotClassRelationship], str]: A tuple containing the class views, the
+            relationships, and the root path of the package.
+        """
+        path = path.resolve()
+        root = path.parent
+        while (root / "__init__.py").exists():
+            root = root.parent
+        files = sorted(path.rglob("*.py"))
+        keys = [str(f.relative_to(root)) for f in files]
+        cache_path = self._get_cache_path().with_suffix(".classes.json")
+        views = self._parse_files_with_cache(files, keys, cache_path, functools.partial(_parse_class_views, root))
+        class_views, relationship_views = _build_class_views(views)
+        return class_views, relationship_views, os.path.join(str(root), "")
+
+    async def _rebuild_class_views_with_pyreverse(
+        self, path: Path
+    ) -> Tuple[List[DotClassInfo], List[DotClassRelationship], str]:
+        """
+        Executes `pylint` to reconstruct the dot format class view repository file.
+
+        Args:
+            path (Path): The path to the package directory.
+        """
         command = f"pyreverse {str(path)} -o dot"
         output_dir = path / "__dot__"
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -763,27 +922,46 @@ class RepoParser(BaseModel):
             if not package_name:
                 continue
             class_name, members, functions = re.split(r"(?<!\\)\|", info)
-            class_info = DotClassInfo(name=class_name)
-            class_info.package = package_name
-            for m in members.split("\n"):
-                if not m:
-                    continue
-                attr = DotClassAttribute.parse(m)
-                class_info.attributes[attr.name] = attr
-                for i in attr.compositions:
-                    if i not in class_info.compositions:
-                        class_info.compositions.append(i)
-            for f in functions.split("\n"):
-                if not f:
-                    continue
-                method = DotClassMethod.parse(f)
-                class_info.methods[method.name] = method
-                for i in method.aggregations:
-                    if i not in class_info.compositions and i not in class_info.aggregations:
-                        class_info.aggregations.append(i)
+            class_info = RepoParser._new_class_info(
+                name=class_name, package=package_name, members=members.split("\n"), methods=functions.split("\n")
+            )
             class_views.append(class_info)
         return class_views
 
+    @staticmethod
+    def _new_class_info(name: str, package: str, members: List[str], methods: List[str]) -> DotClassInfo:
+        """
+        Creates a DotClassInfo object from the dot format texts of the members and of the methods of a class.
+
+        Args:
+            name (str): The name of the class.
+            package (str): The package of the class.
+            members (List[str]): The dot format texts of the class attributes.
+            methods (List[str]): The dot format texts of the class methods.
+
+        Returns:
+            DotClassInfo: The class information.
+        """
+        class_info = DotClassInfo(name=name)
+        class_info.package = package
+        for m in members:
+            if not m:
+                continue
+            attr = DotClassAttribute.parse(m)
+            class_info.attributes[attr.name] = attr
+            for i in attr.compositions:
+                if i not in class_info.compositions:
+                    class_info.compositions.append(i)
+        for f in methods:
+            if not f:
+                continue
+            method = DotClassMethod.parse(f)
+            class_info.methods[method.name] = method
+            for i in method.aggregations:
+                if i not in class_info.compositions and i not in class_info.aggregations:
+                    class_info.aggregations.append(i)
+        return class_info
+
     @staticmethod
     async def _parse_class_relationships(class_view_pathname: Path) -> List[DotClassRelationship]:
         """
@@ -1010,6 +1188,269 @@ class RepoParser(BaseModel):
         return "." + full_key[0:ix]
 
 
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _parse_symbols(base_directory: Path, path: Path) -> dict:
+    """Parse a file into its dumped RepoFileInfo, in a worker process or not."""
+    parser = RepoParser(base_directory=base_directory)
+    return parser.extract_class_and_function_info(RepoParser._parse_file(path), path).model_dump()
+
+
+def _to_repo_file_info(symbols: dict) -> RepoFileInfo:
+    file_info = RepoFileInfo(**symbols)
+    file_info.page_info = [CodeBlockInfo(**i) for i in file_info.page_info]
+    return file_info
+
+
+# decorators of the methods shown as attributes, and as abstract, by pyreverse
+PROPERTY_DECORATORS = {"property", "cached_property"}
+ABSTRACT_DECORATORS = {"abstractmethod", "abstractproperty"}
+MAX_REEXPORT_DEPTH = 8
+
+
+def _parse_class_views(root: Path, path: Path) -> dict:
+    """
+    Extracts the classes of a file, in a worker process or not. The names the classes refer to are not resolved, since
+    they can be defined in other files; see `_build_class_views`.
+
+    Args:
+        root (Path): The directory of the top-level package.
+        path (Path): The path to the Python file.
+
+    Returns:
+        dict: The file relative to root, its module, its imported names mapped to their qualified names, and its
+        classes with their public attributes, methods, base classes and the names of the classes of their attributes.
+    """
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    is_package = parts[-1] == "__init__"
+    if is_package:
+        parts.pop()
+    module = ".".join(parts)
+    view = {"file": path.relative_to(root).as_posix(), "module": module, "imports": {}, "classes": []}
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        logger.warning(f"Skip the classes of {path}: {e}")
+        return view
+
+    package = module if is_package else module.rpartition(".")[0]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    view["imports"][alias.asname] = alias.name
+                else:
+                    head = alias.name.partition(".")[0]
+                    view["imports"][head] = head
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                ns = package.split(".")[: len(package.split(".")) - node.level + 1] if package else []
+                base = ".".join(ns + ([node.module] if node.module else []))
+            for alias in node.names:
+                if alias.name != "*":
+                    view["imports"][alias.asname or alias.name] = f"{base}.{alias.name}" if base else alias.name
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            _parse_class(node, node.name, view["classes"])
+    return view
+
+
+def _parse_class(node: ast.ClassDef, qualname: str, classes: List[dict]):
+    """Appends the class and its nested classes to `classes`."""
+    attributes, methods = {}, {}
+    for item in node.body:
+        if isinstance(item, ast.ClassDef):
+            _parse_class(item, f"{qualname}.{item.name}", classes)
+        elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            _add_attribute(attributes, item.target.id, item.annotation, item.value, {})
+        elif isinstance(item, ast.Assign):
+            for target in item.targets:
+                if isinstance(target, ast.Name):
+                    _add_attribute(attributes, target.id, None, item.value, {})
+        elif is_func(item):
+            decorators = {_get_dotted_name(d.func if isinstance(d, ast.Call) else d) for d in item.decorator_list}
+            decorators = {d.rpartition(".")[2] for d in decorators}
+            if decorators & {"setter", "deleter"}:
+                continue
+            if decorators & PROPERTY_DECORATORS:
+                _add_attribute(attributes, item.name, item.returns, None, {}, with_refs=False)
+            elif not item.name.startswith("_"):
+                methods[item.name] = _get_method_description(item, decorators)
+            if "staticmethod" not in decorators and "classmethod" not in decorators:
+                _add_instance_attributes(attributes, item)
+    classes.append(
+        {
+            "name": qualname,
+            "bases": [name for name in map(_get_dotted_name, node.bases) if name],
+            "attributes": {k: v for k, v in attributes.items() if not k.startswith("_")},
+            "methods": methods,
+        }
+    )
+
+
+def _add_instance_attributes(attributes: Dict[str, list], node: ast.FunctionDef | ast.AsyncFunctionDef):
+    """Adds the attributes assigned to `self` in the method."""
+    args = node.args.posonlyargs + node.args.args
+    if not args:
+        return
+    self_name = args[0].arg
+    params = {a.arg: a.annotation for a in args + node.args.kwonlyargs}
+    for item in ast.walk(node):
+        if isinstance(item, ast.AnnAssign):
+            targets, annotation = [item.target], item.annotation
+        elif isinstance(item, ast.Assign):
+            targets, annotation = item.targets, None
+        else:
+            continue
+        for target in targets:
+            values = [item.value]
+            if isinstance(target, ast.Tuple):
+                targets_ = target.elts
+                values = [None] * len(targets_)
+            else:
+                targets_ = [target]
+            for t, value in zip(targets_, values):
+                if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == self_name:
+                    _add_attribute(attributes, t.attr, annotation, value, params)
+
+
+def _add_attribute(
+    attributes: Dict[str, list], name: str, annotation, value, params: Dict[str, ast.expr], with_refs: bool = True
+):
+    """
+    Adds an attribute as [type, relationship, names of the classes it refers to], keeping the first known type.
+
+    The type is the annotation, else the class instantiated, or the annotation of the parameter assigned, or the type
+    of the constant assigned. An attribute instantiating or annotated with a class is a composition of it, one assigned
+    a parameter is an aggregation.
+    """
+    type_, relationship, refs = "", "", []
+    if annotation is not None:
+        type_, relationship, refs = ast.unparse(annotation), COMPOSITION, _get_type_names(annotation)
+    elif isinstance(value, ast.Call):
+        callee = _get_dotted_name(value.func)
+        if callee.rpartition(".")[2][:1].isupper():  # a class by naming convention, not a function
+            type_, relationship, refs = callee, COMPOSITION, [callee]
+    elif isinstance(value, ast.Name) and params.get(value.id) is not None:
+        annotation = params[value.id]
+        type_, relationship, refs = ast.unparse(annotation), AGGREGATION, _get_type_names(annotation)
+    elif isinstance(value, ast.Constant) and value.value is not None:
+        type_ = type(value.value).__name__
+    if name not in attributes or (type_ and not attributes[name][0]):
+        attributes[name] = [type_, relationship, refs if with_refs else []]
+
+
+def _get_method_description(node: ast.FunctionDef | ast.AsyncFunctionDef, decorators: set) -> str:
+    """Returns the method as pyreverse shows it: `name(arg, arg: type): return type`, in italics if abstract."""
+    args = node.args.posonlyargs + node.args.args
+    if "staticmethod" not in decorators:
+        args = args[1:]
+    params = [f"{a.arg}: {ast.unparse(a.annotation)}" if a.annotation else a.arg for a in args]
+    body = [i for i in node.body if not (isinstance(i, ast.Expr) and isinstance(i.value, ast.Constant))]
+    is_abstract = decorators & ABSTRACT_DECORATORS or (
+        body
+        and isinstance(body[0], ast.Raise)
+        and _get_dotted_name(body[0].exc.func if isinstance(body[0].exc, ast.Call) else body[0].exc)
+        == "NotImplementedError"
+    )
+    name = f"<I>{node.name}</I>" if is_abstract else node.name
+    returns = f": {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{name}({', '.join(params)}){returns}"
+
+
+def _get_dotted_name(node) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = _get_dotted_name(node.value)
+        return f"{value}.{node.attr}" if value else ""
+    return ""
+
+
+def _get_type_names(node) -> List[str]:
+    """Returns the names of the classes a value of the annotation is an instance of: X, Optional[X], X | Y..."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            node = ast.parse(node.value, mode="eval").body
+        except SyntaxError:
+            return []
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _get_type_names(node.left) + _get_type_names(node.right)
+    if isinstance(node, ast.Subscript):
+        if _get_dotted_name(node.value).rpartition(".")[2] not in ("Optional", "Union"):
+            return []
+        elts = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+        return [name for i in elts for name in _get_type_names(i)]
+    name = _get_dotted_name(node)
+    return [name] if name else []
+
+
+def _build_class_views(views: List[dict]) -> Tuple[List[DotClassInfo], List[DotClassRelationship]]:
+    """
+    Creates the class views of the files extracted by `_parse_class_views`, and the relationships between them, the
+    names of the classes being resolved across the files, through imports and re-exports.
+
+    Args:
+        views (List[dict]): The classes of every file of the package.
+
+    Returns:
+        Tuple[List[DotClassInfo], List[DotClassRelationship]]: The class views and the relationships, their
+        namespaces being prefixed with the file path, e.g. `metagpt/roles/role.py:Role`.
+    """
+    modules = {v["module"]: v for v in views}
+    namespaces = {
+        f"{v['module']}.{c['name']}": v["file"] + ":" + c["name"].replace(".", ":") for v in views for c in v["classes"]
+    }
+
+    def _resolve(view: dict, name: str, depth: int = 0) -> Optional[str]:
+        head, _, tail = name.partition(".")
+        if head in view["imports"]:
+            qualified = view["imports"][head] + (f".{tail}" if tail else "")
+        else:
+            qualified = f"{view['module']}.{name}"
+        if qualified in namespaces:
+            return namespaces[qualified]
+        if depth >= MAX_REEXPORT_DEPTH:
+            return None
+        # a name imported from the package of another module, e.g. `from metagpt.actions import Action`
+        module, rest = qualified, ""
+        while module and module not in modules:
+            module, _, part = module.rpartition(".")
+            rest = f"{part}.{rest}" if rest else part
+        if not module or not rest or module == view["module"]:
+            return None
+        return _resolve(modules[module], rest, depth + 1)
+
+    class_views, relationships = [], set()
+    for view in views:
+        for c in view["classes"]:
+            ns = namespaces[f"{view['module']}.{c['name']}"]
+            members = [f"{k} : {v[0]}" if v[0] else k for k, v in sorted(c["attributes"].items())]
+            methods = [v for _, v in sorted(c["methods"].items())]
+            class_views.append(
+                RepoParser._new_class_info(
+                    name=c["name"].rpartition(".")[2], package=ns, members=members, methods=methods
+                )
+            )
+            for base in c["bases"]:
+                dest = _resolve(view, base)
+                if dest:
+                    relationships.add((ns, dest, GENERALIZATION, None))
+            for attr, (_, relationship, refs) in c["attributes"].items():
+                for ref in refs:
+                    src = _resolve(view, ref)
+                    if src:
+                        relationships.add((src, ns, relationship, attr))
+    relationship_views = [
+        DotClassRelationship(src=src, dest=dest, relationship=relationship, label=label)
+        for src, dest, relationship, label in sorted(relationships, key=lambda r: (r[0], r[1], r[2], r[3] or ""))
+    ]
+    return sorted(class_views, key=lambda c: c.package), relationship_views
+
+
 def is_func(node) -> bool:
     """
     Returns True if the given node represents a function.
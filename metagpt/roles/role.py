@@ -22,7 +22,9 @@
 
 from __future__ import annotations
 
+import uuid
 from enum import Enum
+from pathlib import Path
 from typing import TYPE_CHECKING, Iterable, Optional, Set, Type, Union
 
 from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validator
@@ -30,6 +32,7 @@ from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validat
 from metagpt.actions import Action, ActionOutput
 from metagpt.actions.action_node import ActionNode
 from metagpt.actions.add_requirement import UserRequirement
+from metagpt.const import SERDESER_PATH
 from metagpt.context_mixin import ContextMixin
 from metagpt.logs import logger
 from metagpt.memory import Memory
@@ -172,10 +175,25 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         self.llm.cost_manager = self.context.cost_manager
         if not self.rc.watch:
             self._watch(kwargs.pop("watch", [UserRequirement]))
+        self._init_memory(kwargs.pop("memory_window_size", None))
 
         if self.latest_observed_msg:
             self.recovered = True
 
+    @property
+    def stg_path(self) -> Path:
+        """Where the role stores what does not fit in team.json, e.g. the messages spilled out of its memory"""
+        return SERDESER_PATH / "team" / "roles" / f"{self.__class__.__name__}_{self.name}"
+
+    def _init_memory(self, window_size: Optional[int] = None):
+        """Bound the memory to `window_size` messages, `config.memory_window_size` by default, spilling the older ones
+        under the storage path of the role. A recovered memory keeps its window and spill file."""
+        memory = self.rc.memory
+        if not memory.window_size:
+            memory.window_size = window_size if window_size is not None else self.config.memory_window_size
+        if memory.window_size and not memory.spill_path:
+            memory.spill_path = self.stg_path / f"memory_{uuid.uuid4().hex}.jsonl"
+
     @property
     def todo(self) -> Action:
         """Get action to do"""
@@ -332,6 +350,8 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         self.rc.env = env
         if env:
             env.set_addresses(self, self.addresses)
+            if not self.rc.msg_buffer.empty() or (self.recovered and self.latest_observed_msg):
+                env.mark_ready(self)
             self.llm.system_prompt = self._get_prefix()
             self.llm.cost_manager = self.context.cost_manager
             self.set_actions(self.actions)  # reset actions to update llm and prefix
@@ -427,11 +447,13 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         if not news:
             news = self.rc.msg_buffer.pop_all()
         # Store the read messages in your own memory to prevent duplicate processing.
-        old_messages = [] if ignore_memory else self.rc.memory.get()
+        unseen = [ignore_memory or not self.rc.memory.contains(n) for n in news]
         self.rc.memory.add_batch(news)
         # Filter out messages of interest.
         self.rc.news = [
-            n for n in news if (n.cause_by in self.rc.watch or self.name in n.send_to) and n not in old_messages
+            n
+            for n, is_unseen in zip(news, unseen)
+            if is_unseen and (n.cause_by in self.rc.watch or self.name in n.send_to)
         ]
         self.latest_observed_msg = self.rc.news[-1] if self.rc.news else None  # record the latest observed msg
 
@@ -457,6 +479,8 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         if not message:
             return
         self.rc.msg_buffer.push(message)
+        if self.rc.env:
+            self.rc.env.mark_ready(self)
 
     async def _react(self) -> Message:
         """Think first, then act, until the Role _think it is time to stop and requires no more todo.
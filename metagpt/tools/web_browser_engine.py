@@ -19,6 +19,10 @@ class WebBrowserEngine(BaseModel):
     such as Playwright, Selenium, or custom implementations. It provides a unified interface to run
     browser automation tasks.
 
+    The Playwright and Selenium engines load the pages with a pool of browser contexts or drivers, shared by the
+    engines of the same configuration, see `metagpt.tools.web_browser_pool`. Extra fields such as `pool_size`,
+    `max_per_domain`, `max_pages` and `page_timeout` configure it, and `close_browser_pools` shuts it down.
+
     Attributes:
         model_config: Configuration dictionary allowing arbitrary types and extra fields.
         engine: The type of web browser engine to use.
@@ -4,14 +4,16 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 from typing import Literal, Optional
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
 from pydantic import BaseModel, Field, PrivateAttr
 
 from metagpt.logs import logger
+from metagpt.tools.web_browser_pool import BrowserPool, get_browser_pool
 from metagpt.utils.parse_html import WebPage
 
 
@@ -22,13 +24,21 @@ class PlaywrightWrapper(BaseModel):
     the required browsers are also installed. You can install playwright by running the command
     `pip install metagpt[playwright]` and download the necessary browser binaries by running the
     command `playwright install` for the first time.
+
+    The browser is launched once and its contexts are pooled, see `BrowserPool`. The pool is shared by the wrappers of
+    the same configuration in the event loop, and closed when the loop shuts down or by `close_browser_pools`.
     """
 
     browser_type: Literal["chromium", "firefox", "webkit"] = "chromium"
     launch_kwargs: dict = Field(default_factory=dict)
     proxy: Optional[str] = None
     context_kwargs: dict = Field(default_factory=dict)
+    pool_size: int = Field(default=4, description="Browser contexts loading pages at the same time.")
+    max_pages: int = Field(default=50, description="Pages loaded by a browser context before it is recycled.")
+    max_per_domain: int = Field(default=2, description="Pages of the same domain loaded at the same time.")
+    page_timeout: float = Field(default=30, description="Seconds to load a page.")
     _has_run_precheck: bool = PrivateAttr(False)
+    _pool_key: tuple = PrivateAttr(default=())
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -42,26 +52,25 @@ class PlaywrightWrapper(BaseModel):
         if "ignore_https_errors" in kwargs:
             self.context_kwargs["ignore_https_errors"] = kwargs["ignore_https_errors"]
 
+        # before _run_precheck may set the executable_path
+        self._pool_key = (type(self).__name__, json.dumps(self.model_dump(), sort_keys=True, default=str))
+
     async def run(self, url: str, *urls: str) -> WebPage | list[WebPage]:
-        async with async_playwright() as ap:
-            browser_type = getattr(ap, self.browser_type)
-            await self._run_precheck(browser_type)
-            browser = await browser_type.launch(**self.launch_kwargs)
-            _scrape = self._scrape
-
-            if urls:
-                return await asyncio.gather(_scrape(browser, url), *(_scrape(browser, i) for i in urls))
-            return await _scrape(browser, url)
-
-    async def _scrape(self, browser, url):
-        context = await browser.new_context(**self.context_kwargs)
-        page = await context.new_page()
-        async with page:
+        pool = await get_browser_pool(self._pool_key, lambda: PlaywrightPool(self))
+        _scrape = self._scrape
+
+        if urls:
+            return await asyncio.gather(_scrape(pool, url), *(_scrape(pool, i) for i in urls))
+        return await _scrape(pool, url)
+
+    async def _scrape(self, pool: PlaywrightPool, url):
+        async with pool.acquire(url) as context:
             try:
-                await page.goto(url)
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                html = await page.content()
-                inner_text = await page.evaluate("() => document.body.innerText")
+                async with await context.new_page() as page:
+                    await page.goto(url)
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    html = await page.content()
+                    inner_text = await page.evaluate("() => document.body.innerText")
             except Exception as e:
                 inner_text = f"Fail to load page content for {e}"
                 html = ""
@@ -94,6 +103,49 @@ class PlaywrightWrapper(BaseModel):
         self._has_run_precheck = True
 
 
+class PlaywrightPool(BrowserPool[BrowserContext]):
+    """Contexts of a browser launched on first use, and again if it is disconnected, e.g. after a crash."""
+
+    def __init__(self, wrapper: PlaywrightWrapper):
+        super().__init__(max_size=wrapper.pool_size, max_pages=wrapper.max_pages, max_per_domain=wrapper.max_per_domain)
+        self.wrapper = wrapper
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._launch_lock = asyncio.Lock()
+
+    async def create(self) -> BrowserContext:
+        browser = await self._get_browser()
+        context = await browser.new_context(**self.wrapper.context_kwargs)
+        context.set_default_timeout(self.wrapper.page_timeout * 1000)
+        return context
+
+    async def destroy(self, context: BrowserContext):
+        await context.close()
+
+    def is_usable(self, context: BrowserContext) -> bool:
+        # the contexts of a disconnected browser are dropped, the next ones being created by a relaunched browser
+        return bool(context.browser and context.browser.is_connected())
+
+    async def shutdown(self):
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _get_browser(self) -> Browser:
+        async with self._launch_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+            browser_type = getattr(self._playwright, self.wrapper.browser_type)
+            await self.wrapper._run_precheck(browser_type)
+            self._browser = await browser_type.launch(**self.wrapper.launch_kwargs)
+            return self._browser
+
+
 def _get_install_lock():
     global _install_lock
     if _install_lock is None:
@@ -4,18 +4,24 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import importlib
+import json
+import weakref
 from concurrent import futures
 from copy import deepcopy
 from typing import Callable, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 from webdriver_manager.core.download_manager import WDMDownloadManager
 from webdriver_manager.core.http import WDMHttpClient
 
+from metagpt.tools.web_browser_pool import BrowserPool, get_browser_pool
 from metagpt.utils.parse_html import WebPage
 
 
@@ -29,6 +35,9 @@ class SeleniumWrapper(BaseModel):
        for that browser before running. For example, if you have Mozilla Firefox installed on your
        computer, you can set the configuration SELENIUM_BROWSER_TYPE to firefox. After that, you
        can scrape web pages using the Selenium WebBrowserEngine.
+
+    The drivers are pooled, see `BrowserPool`. The pool is shared by the wrappers of the same configuration in the event
+    loop, and closed when the loop shuts down or by `close_browser_pools`.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -38,13 +47,20 @@ class SeleniumWrapper(BaseModel):
     proxy: Optional[str] = None
     loop: Optional[asyncio.AbstractEventLoop] = None
     executor: Optional[futures.Executor] = None
+    pool_size: int = Field(default=4, description="Drivers loading pages at the same time.")
+    max_pages: int = Field(default=50, description="Pages loaded by a driver before it is recycled.")
+    max_per_domain: int = Field(default=2, description="Pages of the same domain loaded at the same time.")
+    page_timeout: float = Field(default=30, description="Seconds to load a page.")
     _has_run_precheck: bool = PrivateAttr(False)
     _get_driver: Optional[Callable] = PrivateAttr(None)
+    _pool_key: tuple = PrivateAttr(default=())
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         if self.proxy and "proxy-server" not in self.launch_kwargs:
             self.launch_kwargs["proxy-server"] = self.proxy
+        config = self.model_dump(exclude={"loop", "executor"})
+        self._pool_key = (type(self).__name__, json.dumps(config, sort_keys=True, default=str))
 
     @property
     def launch_args(self):
@@ -56,8 +72,14 @@ class SeleniumWrapper(BaseModel):
 
     async def run(self, url: str, *urls: str) -> WebPage | list[WebPage]:
         await self._run_precheck()
+        pool = await get_browser_pool(self._pool_key, lambda: SeleniumPool(self))
 
-        _scrape = lambda url: self.loop.run_in_executor(self.executor, self._scrape_website, url)
+        async def _scrape(url):
+            try:
+                async with pool.acquire(url) as driver:
+                    return await self.loop.run_in_executor(self.executor, self._scrape_website, driver, url)
+            except WebDriverException as e:  # the driver failed, the pool has recycled it
+                return WebPage(inner_text=f"Fail to load page content for {e}", html="", url=url)
 
         if urls:
             return await asyncio.gather(_scrape(url), *(_scrape(i) for i in urls))
@@ -75,17 +97,66 @@ class SeleniumWrapper(BaseModel):
         )
         self._has_run_precheck = True
 
-    def _scrape_website(self, url):
-        with self._get_driver() as driver:
+    def _scrape_website(self, driver: WebDriver, url):
+        """Load the page, raising the errors of the driver but timeouts, so that the pool recycles a broken driver."""
+        try:
+            driver.get(url)
+            WebDriverWait(driver, self.page_timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            inner_text = driver.execute_script("return document.body.innerText;")
+            html = driver.page_source
+        except TimeoutException as e:
+            inner_text = f"Fail to load page content for {e}"
+            html = ""
+        except WebDriverException:
+            raise
+        except Exception as e:
+            inner_text = f"Fail to load page content for {e}"
+            html = ""
+        return WebPage(inner_text=inner_text, html=html, url=url)
+
+
+class SeleniumPool(BrowserPool[WebDriver]):
+    """Drivers started and quit in the executor of the wrapper, their calls being blocking."""
+
+    def __init__(self, wrapper: SeleniumWrapper):
+        super().__init__(max_size=wrapper.pool_size, max_pages=wrapper.max_pages, max_per_domain=wrapper.max_per_domain)
+        self.wrapper = wrapper
+        _selenium_pools.add(self)
+
+    async def create(self) -> WebDriver:
+        return await self.wrapper.loop.run_in_executor(self.wrapper.executor, self._start_driver)
+
+    async def destroy(self, driver: WebDriver):
+        await self.wrapper.loop.run_in_executor(self.wrapper.executor, driver.quit)
+
+    def is_usable(self, driver: WebDriver) -> bool:
+        """Whether the driver still has a session, and its local driver process, if any, still runs."""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        return bool(driver.session_id) and (process is None or process.poll() is None)
+
+    def _start_driver(self) -> WebDriver:
+        driver = self.wrapper._get_driver()
+        driver.set_page_load_timeout(self.wrapper.page_timeout)
+        return driver
+
+    def quit_idle_drivers(self):
+        """Quit the idle drivers without the event loop, e.g. at exit when the pool was not closed."""
+        idle, self._idle = self._idle, []
+        for item in idle:
             try:
-                driver.get(url)
-                WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                inner_text = driver.execute_script("return document.body.innerText;")
-                html = driver.page_source
-            except Exception as e:
-                inner_text = f"Fail to load page content for {e}"
-                html = ""
-            return WebPage(inner_text=inner_text, html=html, url=url)
+                item.resource.quit()
+            except Exception:
+                pass
+
+
+_selenium_pools: weakref.WeakSet[SeleniumPool] = weakref.WeakSet()
+
+
+@atexit.register
+def _quit_idle_drivers():
+    # the driver processes would outlive the interpreter
+    for pool in list(_selenium_pools):
+        pool.quit_idle_drivers()
 
 
 _webdriver_manager_types = {
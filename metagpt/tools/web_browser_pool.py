@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc    : A bounded pool of long-lived browser resources, shared by the web browser engines of an event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+from urllib.parse import urlparse
+
+from metagpt.logs import logger
+
+T = TypeVar("T")
+
+
+class _PooledResource(Generic[T]):
+    def __init__(self, resource: T):
+        self.resource = resource
+        self.pages = 0
+
+
+class BrowserPool(ABC, Generic[T]):
+    """Browser resources, e.g. Playwright contexts or Selenium drivers, reused across pages.
+
+    - at most `max_size` resources exist, a page waits for one to be free;
+    - at most `max_per_domain` pages of the same domain are loaded at the same time;
+    - a resource is recycled, i.e. closed and replaced by a new one, after `max_pages` pages, or when its use raised.
+
+    Subclasses create and destroy the resources, and release what they share on `shutdown`.
+    """
+
+    def __init__(self, max_size: int = 4, max_pages: int = 50, max_per_domain: int = 2):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_per_domain = max_per_domain
+        self.num_created = 0
+        self.closed = False
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: list[_PooledResource[T]] = []
+        self._domains: dict[str, asyncio.Semaphore] = {}
+
+    @abstractmethod
+    async def create(self) -> T:
+        """Create a resource."""
+
+    @abstractmethod
+    async def destroy(self, resource: T):
+        """Close a resource."""
+
+    async def shutdown(self):
+        """Release what the resources share, e.g. the browser, once they are all destroyed."""
+
+    def is_usable(self, resource: T) -> bool:
+        """Whether an idle resource can still load pages, e.g. its browser did not crash."""
+        return True
+
+    @asynccontextmanager
+    async def acquire(self, url: str) -> AsyncIterator[T]:
+        """A resource to load the url with, once the domain of the url and the pool have room for it."""
+        if self.closed:
+            raise RuntimeError("The browser pool is closed.")
+        async with self._get_domain_slots(url), self._slots:
+            if self.closed:
+                raise RuntimeError("The browser pool is closed.")
+            item = await self._get_idle() or await self._create()
+            failed = False
+            try:
+                yield item.resource
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                item.pages += 1
+                if failed or item.pages >= self.max_pages:
+                    await self._destroy(item)
+                else:
+                    self._idle.append(item)
+
+    async def close(self):
+        """Wait for the pages being loaded, then destroy the resources and shutdown."""
+        if self.closed:
+            return
+        self.closed = True
+        for _ in range(self.max_size):
+            await self._slots.acquire()
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._destroy(i) for i in idle))
+        await self.shutdown()
+
+    def _get_domain_slots(self, url: str) -> asyncio.Semaphore:
+        domain = urlparse(url).netloc
+        if domain not in self._domains:
+            self._domains[domain] = asyncio.Semaphore(self.max_per_domain)
+        return self._domains[domain]
+
+    async def _get_idle(self) -> Optional[_PooledResource[T]]:
+        while self._idle:
+            item = self._idle.pop()
+            if self.is_usable(item.resource):
+                return item
+            await self._destroy(item)
+        return None
+
+    async def _create(self) -> _PooledResource[T]:
+        resource = await self.create()
+        self.num_created += 1
+        return _PooledResource(resource)
+
+    async def _destroy(self, item: _PooledResource[T]):
+        try:
+            await self.destroy(item.resource)
+        except Exception as e:
+            logger.warning(f"Fail to close the browser resource: {e}")
+
+
+# event loop -> pool key -> pool, the resources of a pool being bound to the loop that created them
+_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, BrowserPool]] = weakref.WeakKeyDictionary()
+_closers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGenerator] = weakref.WeakKeyDictionary()
+
+
+async def _close_on_loop_shutdown(pools: dict[Hashable, BrowserPool]):
+    """Stay suspended for the lifetime of the loop. `loop.shutdown_asyncgens()`, which `asyncio.run` calls before
+    closing the loop, resumes it so that the pools are closed even if `close_browser_pools` is never called."""
+    try:
+        yield
+    finally:
+        await asyncio.gather(*(pool.close() for pool in pools.values()))
+
+
+async def get_browser_pool(key: Hashable, factory: Callable[[], BrowserPool]) -> BrowserPool:
+    """The pool of the key in the running event loop, created by the factory if there is none yet."""
+    loop = asyncio.get_running_loop()
+    pools = _pools.get(loop)
+    if pools is None:
+        pools = _pools[loop] = {}
+        closer = _close_on_loop_shutdown(pools)
+        await closer.__anext__()
+        _closers[loop] = closer
+    pool = pools.get(key)
+    if pool is None or pool.closed:
+        pool = pools[key] = factory()
+    return pool
+
+
+async def close_browser_pools():
+    """Close the pools of the running event loop, their browsers and drivers.
+
+    Every user of the loop shares the pools, so only the owner of the loop should call it, once they are all done;
+    `asyncio.run` closes them anyway when the loop shuts down.
+    """
+    loop = asyncio.get_running_loop()
+    _pools.pop(loop, None)
+    closer = _closers.pop(loop, None)
+    if closer:
+        await closer.aclose()
@@ -2,11 +2,57 @@
 # -*- coding: utf-8 -*-
 # @Desc   : pure async http_client
 
-from typing import Any, Mapping, Optional, Union
+import asyncio
+import weakref
+from typing import Any, AsyncGenerator, Mapping, Optional, Union
 
 import aiohttp
 from aiohttp.client import DEFAULT_TIMEOUT
 
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 32
+KEEPALIVE_TIMEOUT = 30  # seconds an idle connection is kept open for reuse
+
+# One pooled session per event loop, since a session and its connections can only be used on the loop they belong to.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+_closers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGenerator]" = weakref.WeakKeyDictionary()
+
+
+async def _close_on_loop_shutdown(session: aiohttp.ClientSession):
+    """Stay suspended for the lifetime of the loop. `loop.shutdown_asyncgens()`, which `asyncio.run` calls before
+    closing the loop, resumes it so that the session is closed even if `close_session` is never called."""
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the keep-alive session shared by all requests on the running event loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST, keepalive_timeout=KEEPALIVE_TIMEOUT
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        closer = _close_on_loop_shutdown(session)
+        await closer.__anext__()
+        _sessions[loop] = session
+        _closers[loop] = closer
+    return session
+
+
+async def close_session():
+    """Close the shared session of the running event loop and its pooled connections."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.pop(loop, None)
+    closer = _closers.pop(loop, None)
+    if closer:
+        await closer.aclose()
+    elif session:
+        await session.close()
+
 
 async def apost(
     url: str,
@@ -18,13 +64,13 @@ async def apost(
     encoding: str = "utf-8",
     timeout: int = DEFAULT_TIMEOUT.total,
 ) -> Union[str, dict]:
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url=url, params=params, json=json, data=data, headers=headers, timeout=timeout) as resp:
-            if as_json:
-                data = await resp.json()
-            else:
-                data = await resp.read()
-                data = data.decode(encoding)
+    session = await get_session()
+    async with session.post(url=url, params=params, json=json, data=data, headers=headers, timeout=timeout) as resp:
+        if as_json:
+            data = await resp.json()
+        else:
+            data = await resp.read()
+            data = data.decode(encoding)
     return data
 
 
@@ -43,7 +89,7 @@ async def apost_stream(
         async for line in result:
             deal_with(line)
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url=url, params=params, json=json, data=data, headers=headers, timeout=timeout) as resp:
-            async for line in resp.content:
-                yield line.decode(encoding)
+    session = await get_session()
+    async with session.post(url=url, params=params, json=json, data=data, headers=headers, timeout=timeout) as resp:
+        async for line in resp.content:
+            yield line.decode(encoding)
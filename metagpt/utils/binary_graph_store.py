@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc    : Compact binary persistence of a graph, as an append-only log of edge operations on interned strings.
+"""
+import mmap
+import os
+import shutil
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+NO_SYMBOL = -1
+
+
+class GraphOp(IntEnum):
+    ADD_EDGE = 1  # subject, predicate, object_
+    REMOVE_EDGE = 2  # subject, object_
+    ADD_NODE = 3  # subject
+
+
+# op, subject, predicate, object_; absent values are None
+GraphOpRecord = Tuple[GraphOp, str, Optional[str], Optional[str]]
+
+
+class BinaryGraphStore:
+    """A graph stored in a directory as a log of operations that rebuilds it when replayed.
+
+    - symbols.bin: the UTF-8 bytes of every distinct string, concatenated, each string being stored once.
+    - symbols.idx: int64 end offset of each string in symbols.bin, its position being the id of the string.
+    - ops.i32: int32 rows of (op, subject id, predicate id, object id), NO_SYMBOL for absent values.
+
+    The files are only appended to, so saving new operations does not rewrite the graph, and are read through memory
+    maps. Strings are written before the operations using them; on load, a torn tail left by an interrupted write is
+    dropped. `rewrite` compacts the log into a snapshot.
+    """
+
+    SYMBOLS = "symbols.bin"
+    OFFSETS = "symbols.idx"
+    OPS = "ops.i32"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._ids: dict[str, int] = {}
+        self._symbols_size = 0
+        self.num_ops = 0
+
+    def exists(self) -> bool:
+        return (self.path / self.OPS).exists()
+
+    def load(self) -> List[GraphOpRecord]:
+        """Read the symbols and the operations of the log, in order."""
+        offsets = self._read_array(self.OFFSETS, np.int64)
+        symbols_file = self.path / self.SYMBOLS
+        symbols_size = symbols_file.stat().st_size if symbols_file.exists() else 0
+        num_symbols = int(np.searchsorted(offsets, symbols_size, side="right"))  # offsets are increasing
+
+        symbols = []
+        if num_symbols:
+            with open(symbols_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                for end in offsets[:num_symbols].tolist():
+                    symbols.append(mm[start:end].decode("utf-8"))
+                    start = end
+
+        ops = self._read_array(self.OPS, np.int32)
+        ops = ops[: len(ops) // 4 * 4].reshape(-1, 4)
+        invalid = np.flatnonzero((ops[:, 1:] >= num_symbols).any(axis=1))
+        num_ops = int(invalid[0]) if len(invalid) else len(ops)
+        records = [
+            (GraphOp(op), symbols[s], symbols[p] if p >= 0 else None, symbols[o] if o >= 0 else None)
+            for op, s, p, o in ops[:num_ops].tolist()
+        ]
+
+        self._ids = {symbol: i for i, symbol in enumerate(symbols)}
+        self._symbols_size = int(offsets[num_symbols - 1]) if num_symbols else 0
+        self.num_ops = num_ops
+        del offsets, ops  # unmap before truncating
+        self._truncate(num_symbols, num_ops)
+        return records
+
+    def append(self, records: Iterable[GraphOpRecord]):
+        """Append operations to the log, interning the strings not stored yet."""
+        records = list(records)
+        if not records:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        new_symbols, new_offsets = [], []
+        rows = np.empty((len(records), 4), dtype=np.int32)
+        for i, record in enumerate(records):
+            rows[i, 0] = record[0]
+            for j, value in enumerate(record[1:], start=1):
+                if value is None:
+                    rows[i, j] = NO_SYMBOL
+                    continue
+                symbol_id = self._ids.get(value)
+                if symbol_id is None:
+                    symbol_id = self._ids[value] = len(self._ids)
+                    data = value.encode("utf-8")
+                    self._symbols_size += len(data)
+                    new_symbols.append(data)
+                    new_offsets.append(self._symbols_size)
+                rows[i, j] = symbol_id
+
+        if new_symbols:
+            with open(self.path / self.SYMBOLS, "ab") as f:
+                f.write(b"".join(new_symbols))
+            with open(self.path / self.OFFSETS, "ab") as f:
+                f.write(np.asarray(new_offsets, dtype=np.int64).tobytes())
+        with open(self.path / self.OPS, "ab") as f:
+            f.write(rows.tobytes())
+        self.num_ops += len(records)
+
+    def rewrite(self, records: Iterable[GraphOpRecord]):
+        """Replace the log with the given operations, keeping only the strings they use."""
+        tmp = BinaryGraphStore(self.path.with_name(self.path.name + ".tmp"))
+        shutil.rmtree(tmp.path, ignore_errors=True)
+        tmp.path.mkdir(parents=True)
+        tmp.append(records)
+
+        old = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(old, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(tmp.path, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+
+        self._ids, self._symbols_size, self.num_ops = tmp._ids, tmp._symbols_size, tmp.num_ops
+
+    def _read_array(self, filename: str, dtype) -> np.ndarray:
+        file = self.path / filename
+        size = file.stat().st_size if file.exists() else 0
+        count = size // np.dtype(dtype).itemsize
+        if not count:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(file, dtype=dtype, mode="r", shape=(count,))
+
+    def _truncate(self, num_symbols: int, num_ops: int):
+        sizes = {
+            self.SYMBOLS: self._symbols_size,
+            self.OFFSETS: num_symbols * np.dtype(np.int64).itemsize,
+            self.OPS: num_ops * 4 * np.dtype(np.int32).itemsize,
+        }
+        for filename, size in sizes.items():
+            file = self.path / filename
+            if file.exists() and file.stat().st_size > size:
+                with open(file, "r+b") as f:
+                    f.truncate(size)
+
+
+def iter_snapshot(nodes: Iterable[str], edges: Iterable[Tuple[str, str, str]]) -> Iterator[GraphOpRecord]:
+    """Operations rebuilding a graph of the nodes, in their order, and of the (subject, predicate, object_) edges."""
+    for n in nodes:
+        yield GraphOp.ADD_NODE, n, None, None
+    for s, p, o in edges:
+        yield GraphOp.ADD_EDGE, s, p, o
@@ -20,6 +20,8 @@ class Costs(NamedTuple):
     total_completion_tokens: int
     total_cost: float
     total_budget: float
+    cache_hits: int = 0
+    cache_misses: int = 0
 
 
 class CostManager(BaseModel):
@@ -31,6 +33,8 @@ class CostManager(BaseModel):
     max_budget: float = 10.0
     total_cost: float = 0
     token_costs: dict[str, dict[str, float]] = TOKEN_COSTS  # different model's token cost
+    cache_hits: int = 0  # requests answered by the LLM response cache, which cost nothing
+    cache_misses: int = 0
 
     def update_cost(self, prompt_tokens, completion_tokens, model):
         """
@@ -59,6 +63,22 @@ class CostManager(BaseModel):
             f"Current cost: ${cost:.3f}, prompt_tokens: {prompt_tokens}, completion_tokens: {completion_tokens}"
         )
 
+    def update_cache(self, hit: bool):
+        """
+        Count a lookup in the LLM response cache. A hit is served without calling the API, so it adds no cost.
+
+        Args:
+        hit (bool): Whether the response was found in the cache.
+        """
+        if not hit:
+            self.cache_misses += 1
+            return
+        self.cache_hits += 1
+        logger.info(
+            f"Total running cost: ${self.total_cost:.3f} | Max budget: ${self.max_budget:.3f} | "
+            f"Current cost: $0.000, response cache hits: {self.cache_hits}, misses: {self.cache_misses}"
+        )
+
     def get_total_prompt_tokens(self):
         """
         Get the total number of prompt tokens.
@@ -88,7 +108,14 @@ class CostManager(BaseModel):
 
     def get_costs(self) -> Costs:
         """Get all costs"""
-        return Costs(self.total_prompt_tokens, self.total_completion_tokens, self.total_cost, self.total_budget)
+        return Costs(
+            self.total_prompt_tokens,
+            self.total_completion_tokens,
+            self.total_cost,
+            self.total_budget,
+            self.cache_hits,
+            self.cache_misses,
+        )
 
 
 class TokenCostManager(CostManager):
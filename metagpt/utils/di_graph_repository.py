@@ -12,20 +12,49 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import networkx
 
+from metagpt.utils.binary_graph_store import (
+    BinaryGraphStore,
+    GraphOp,
+    GraphOpRecord,
+    iter_snapshot,
+)
 from metagpt.utils.common import aread, awrite
 from metagpt.utils.graph_repository import SPO, GraphRepository
 
+BINARY_SUFFIX = ".graph"
+# a binary log longer than this many times its snapshot is compacted on save
+COMPACT_RATIO = 2
+
+
+# key1 -> key2 -> key3 -> None, the innermost dicts being insertion ordered sets
+TripleIndex = Dict[str, Dict[str, Dict[str, None]]]
+
 
 class DiGraphRepository(GraphRepository):
-    """Graph repository based on DiGraph."""
+    """Graph repository based on DiGraph.
+
+    An edge subject -> object_ holds the predicate, so a subject and an object are linked by one predicate at most; a
+    new predicate replaces the old one. Triples are also kept in SPO, POS and OSP hash indexes, which answer `select`
+    and `delete` with any combination of criteria without scanning the edges. The indexes are kept in sync by `insert`,
+    `insert_many`, `delete` and `load_json`, so the graph must not be modified through `repo` directly.
+
+    The repository is saved as JSON, or with `binary=True` (or when loaded from a `.graph` path) in the compact format
+    of BinaryGraphStore, where `save` only appends the changes made since the last save or load.
+    """
 
     def __init__(self, name: str | Path, **kwargs):
         super().__init__(name=str(name), **kwargs)
         self._repo = networkx.DiGraph()
+        self._spo: TripleIndex = {}
+        self._pos: TripleIndex = {}
+        self._osp: TripleIndex = {}
+        self._num_triples = 0
+        self._store: Optional[BinaryGraphStore] = None  # the binary log the graph is in sync with
+        self._journal: List[GraphOpRecord] = []  # changes not in the binary log yet
 
     async def insert(self, subject: str, predicate: str, object_: str):
         """Insert a new triple into the directed graph repository.
@@ -39,7 +68,25 @@ class DiGraphRepository(GraphRepository):
             await my_di_graph_repo.insert(subject="Node1", predicate="connects_to", object_="Node2")
             # Adds a directed relationship: Node1 connects_to Node2
         """
+        self._add_to_indexes(subject, predicate, object_)
         self._repo.add_edge(subject, object_, predicate=predicate)
+        if self.binary:
+            self._journal.append((GraphOp.ADD_EDGE, subject, predicate, object_))
+
+    async def insert_many(self, spos: List[SPO]):
+        """Insert triples into the directed graph repository in one batch, as `insert` would one by one.
+
+        Args:
+            spos (List[SPO]): The triples to insert.
+
+        Example:
+            await my_di_graph_repo.insert_many([SPO(subject="Node1", predicate="connects_to", object_="Node2")])
+        """
+        for spo in spos:
+            self._add_to_indexes(spo.subject, spo.predicate, spo.object_)
+        self._repo.add_edges_from((spo.subject, spo.object_, {"predicate": spo.predicate}) for spo in spos)
+        if self.binary:
+            self._journal.extend((GraphOp.ADD_EDGE, spo.subject, spo.predicate, spo.object_) for spo in spos)
 
     async def select(self, subject: str = None, predicate: str = None, object_: str = None) -> List[SPO]:
         """Retrieve triples from the directed graph repository based on specified criteria.
@@ -56,16 +103,7 @@ class DiGraphRepository(GraphRepository):
             selected_triples = await my_di_graph_repo.select(subject="Node1", predicate="connects_to")
             # Retrieves directed relationships where Node1 is the subject and the predicate is 'connects_to'.
         """
-        result = []
-        for s, o, p in self._repo.edges(data="predicate"):
-            if subject and subject != s:
-                continue
-            if predicate and predicate != p:
-                continue
-            if object_ and object_ != o:
-                continue
-            result.append(SPO(subject=s, predicate=p, object_=o))
-        return result
+        return [SPO(subject=s, predicate=p, object_=o) for s, p, o in self._match(subject, predicate, object_)]
 
     async def delete(self, subject: str = None, predicate: str = None, object_: str = None) -> int:
         """Delete triples from the directed graph repository based on specified criteria.
@@ -82,11 +120,12 @@ class DiGraphRepository(GraphRepository):
             deleted_count = await my_di_graph_repo.delete(subject="Node1", predicate="connects_to")
             # Deletes directed relationships where Node1 is the subject and the predicate is 'connects_to'.
         """
-        rows = await self.select(subject=subject, predicate=predicate, object_=object_)
-        if not rows:
-            return 0
-        for r in rows:
-            self._repo.remove_edge(r.subject, r.object_)
+        rows = list(self._match(subject, predicate, object_))
+        for s, p, o in rows:
+            self._remove_from_indexes(s, p, o)
+        self._repo.remove_edges_from((s, o) for s, _, o in rows)
+        if self.binary:
+            self._journal.extend((GraphOp.REMOVE_EDGE, s, None, o) for s, _, o in rows)
         return len(rows)
 
     def json(self) -> str:
@@ -96,21 +135,30 @@ class DiGraphRepository(GraphRepository):
         return data
 
     async def save(self, path: str | Path = None):
-        """Save the directed graph repository to a JSON file.
+        """Save the directed graph repository to a JSON file, or to a binary one if the repository is binary.
 
         Args:
-            path (Union[str, Path], optional): The directory path where the JSON file will be saved.
+            path (Union[str, Path], optional): The directory path where the file will be saved.
                 If not provided, the default path is taken from the 'root' key in the keyword arguments.
         """
-        data = self.json()
-        path = path or self._kwargs.get("root")
+        path = Path(path or self._kwargs.get("root"))
         if not path.exists():
             path.mkdir(parents=True, exist_ok=True)
-        pathname = Path(path) / self.name
-        await awrite(filename=pathname.with_suffix(".json"), data=data, encoding="utf-8")
+        pathname = path / self.name
+        if self.binary:
+            self._save_binary(pathname.with_suffix(BINARY_SUFFIX))
+        else:
+            await self.export_json(pathname.with_suffix(".json"))
+
+    async def export_json(self, pathname: str | Path):
+        """Write the directed graph repository to a JSON file, whatever its format."""
+        await awrite(filename=pathname, data=self.json(), encoding="utf-8")
 
     async def load(self, pathname: str | Path):
-        """Load a directed graph repository from a JSON file."""
+        """Load a directed graph repository from a JSON file, or from a binary one if its suffix is `.graph`."""
+        if Path(pathname).suffix == BINARY_SUFFIX:
+            self._load_binary(Path(pathname))
+            return
         data = await aread(filename=pathname, encoding="utf-8")
         self.load_json(data)
 
@@ -133,8 +181,105 @@ class DiGraphRepository(GraphRepository):
             return self
         m = json.loads(val)
         self._repo = networkx.node_link_graph(m)
+        self._rebuild_indexes()
+        self._store, self._journal = None, []
         return self
 
+    @property
+    def binary(self) -> bool:
+        """Whether the repository is saved in the binary format."""
+        return self._kwargs.get("binary", False)
+
+    def _load_binary(self, pathname: Path):
+        store = BinaryGraphStore(pathname)
+        graph = networkx.DiGraph()
+        for op, s, p, o in store.load():
+            if op == GraphOp.ADD_EDGE:
+                graph.add_edge(s, o, predicate=p)
+            elif op == GraphOp.REMOVE_EDGE:
+                graph.remove_edge(s, o)
+            else:
+                graph.add_node(s)
+        self._repo = graph
+        self._rebuild_indexes()
+        self._store, self._journal = store, []
+
+    def _save_binary(self, pathname: Path):
+        store = self._store
+        if store is None or store.path != pathname or not store.exists():
+            store = BinaryGraphStore(pathname)
+            store.rewrite(self._snapshot())
+        elif store.num_ops + len(self._journal) > COMPACT_RATIO * max(len(self._repo) + self._num_triples, 1024):
+            store.rewrite(self._snapshot())
+        else:
+            store.append(self._journal)
+        self._store, self._journal = store, []
+
+    def _snapshot(self) -> Iterator[GraphOpRecord]:
+        return iter_snapshot(self._repo.nodes, ((s, p, o) for s, o, p in self._repo.edges(data="predicate")))
+
+    def _rebuild_indexes(self):
+        self._spo, self._pos, self._osp, self._num_triples = {}, {}, {}, 0
+        for s, o, p in self._repo.edges(data="predicate"):
+            self._add_to_indexes(s, p, o)
+
+    def _match(self, subject: str = None, predicate: str = None, object_: str = None) -> Iterator[Tuple[str, str, str]]:
+        """Yield the (subject, predicate, object_) triples matching the criteria, an empty criterion matching all."""
+        if subject and predicate and object_:
+            if object_ in self._spo.get(subject, {}).get(predicate, {}):
+                yield subject, predicate, object_
+        elif subject and predicate:
+            for o in self._spo.get(subject, {}).get(predicate, {}):
+                yield subject, predicate, o
+        elif subject and object_:
+            for p in self._osp.get(object_, {}).get(subject, {}):
+                yield subject, p, object_
+        elif predicate and object_:
+            for s in self._pos.get(predicate, {}).get(object_, {}):
+                yield s, predicate, object_
+        elif subject:
+            for p, objects in self._spo.get(subject, {}).items():
+                for o in objects:
+                    yield subject, p, o
+        elif predicate:
+            for o, subjects in self._pos.get(predicate, {}).items():
+                for s in subjects:
+                    yield s, predicate, o
+        elif object_:
+            for s, predicates in self._osp.get(object_, {}).items():
+                for p in predicates:
+                    yield s, p, object_
+        else:
+            for s, o, p in self._repo.edges(data="predicate"):
+                yield s, p, o
+
+    def _add_to_indexes(self, subject: str, predicate: str, object_: str):
+        for old_predicate in list(self._osp.get(object_, {}).get(subject, {})):
+            if old_predicate != predicate:  # replaced, like the predicate of the edge
+                self._remove_from_indexes(subject, old_predicate, object_)
+        objects = self._spo.setdefault(subject, {}).setdefault(predicate, {})
+        if object_ in objects:
+            return
+        objects[object_] = None
+        self._num_triples += 1
+        self._pos.setdefault(predicate, {}).setdefault(object_, {})[subject] = None
+        self._osp.setdefault(object_, {}).setdefault(subject, {})[predicate] = None
+
+    def _remove_from_indexes(self, subject: str, predicate: str, object_: str):
+        self._num_triples -= 1
+        for index, k1, k2, k3 in (
+            (self._spo, subject, predicate, object_),
+            (self._pos, predicate, object_, subject),
+            (self._osp, object_, subject, predicate),
+        ):
+            level2 = index[k1]
+            level3 = level2[k2]
+            del level3[k3]
+            if not level3:
+                del level2[k2]
+                if not level2:
+                    del index[k1]
+
     @staticmethod
     async def load_from(pathname: str | Path) -> GraphRepository:
         """Create and load a directed graph repository from a JSON file.
@@ -146,7 +291,7 @@ class DiGraphRepository(GraphRepository):
             GraphRepository: A new instance of the graph repository loaded from the specified JSON file.
         """
         pathname = Path(pathname)
-        graph = DiGraphRepository(name=pathname.stem, root=pathname.parent)
+        graph = DiGraphRepository(name=pathname.stem, root=pathname.parent, binary=pathname.suffix == BINARY_SUFFIX)
         if pathname.exists():
             await graph.load(pathname=pathname)
         return graph
@@ -160,7 +305,7 @@ class DiGraphRepository(GraphRepository):
     def pathname(self) -> Path:
         """Return the path and filename to the graph repository file."""
         p = Path(self.root) / self.name
-        return p.with_suffix(".json")
+        return p.with_suffix(BINARY_SUFFIX if self.binary else ".json")
 
     @property
     def repo(self):
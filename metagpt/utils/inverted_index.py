@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Desc    : An incremental inverted index with BM25 ranking, updated document by document.
+"""
+import math
+import re
+from collections import Counter
+from typing import Hashable, Optional
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Token -> {document: term frequency} postings with Okapi BM25 scoring.
+
+    Documents are added and removed one at a time, so maintaining the index costs O(|doc|) per update instead of a
+    rebuild over the whole corpus. Besides the postings, only the length and insertion order of each document are kept,
+    so removing a document takes its text again. The tokens of the vocabulary are indexed by their substrings of up to
+    `NGRAM_SIZE` characters, to find the tokens containing a substring without scanning the vocabulary.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, dict[Hashable, int]] = {}
+        self.doc_len: dict[Hashable, int] = {}
+        self._order: dict[Hashable, int] = {}
+        self._ngrams: dict[str, set[str]] = {}  # substring of up to NGRAM_SIZE chars -> tokens containing it
+        self._seq = 0
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self.doc_len
+
+    def add(self, doc_id: Hashable, text: str):
+        """Index `text` under `doc_id`, which must not be indexed yet."""
+        if doc_id in self.doc_len:
+            raise ValueError(f"{doc_id} is already indexed, remove it first.")
+        terms = Counter(tokenize(text))
+        for token, tf in terms.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                self._add_ngrams(token)
+            self.postings[token][doc_id] = tf
+        self.doc_len[doc_id] = sum(terms.values())
+        self._order[doc_id] = self._seq
+        self._seq += 1
+        self._total_len += self.doc_len[doc_id]
+
+    def remove(self, doc_id: Hashable, text: str):
+        """Remove the document `doc_id`, `text` being the text it was added with."""
+        if doc_id not in self.doc_len:
+            return
+        for token in set(tokenize(text)):
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[token]
+                self._remove_ngrams(token)
+        del self._order[doc_id]
+        self._total_len -= self.doc_len.pop(doc_id)
+
+    def clear(self):
+        self.postings = {}
+        self.doc_len = {}
+        self._order = {}
+        self._ngrams = {}
+        self._total_len = 0
+
+    def _iter_ngrams(self, token: str):
+        for n in range(1, self.NGRAM_SIZE + 1):
+            for i in range(len(token) - n + 1):
+                yield token[i : i + n]
+
+    def _add_ngrams(self, token: str):
+        for ngram in self._iter_ngrams(token):
+            self._ngrams.setdefault(ngram, set()).add(token)
+
+    def _remove_ngrams(self, token: str):
+        for ngram in self._iter_ngrams(token):
+            tokens = self._ngrams.get(ngram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._ngrams[ngram]
+
+    def tokens_containing(self, substring: str) -> set[str]:
+        """The tokens of the vocabulary containing `substring`."""
+        if len(substring) <= self.NGRAM_SIZE:
+            return set(self._ngrams.get(substring, ()))
+        ngrams = {substring[i : i + self.NGRAM_SIZE] for i in range(len(substring) - self.NGRAM_SIZE + 1)}
+        rarest = min((self._ngrams.get(i, set()) for i in ngrams), key=len)
+        return {token for token in rarest if substring in token}
+
+    def candidates(self, substring: str) -> Optional[list[Hashable]]:
+        """Return the documents that may contain `substring`, in insertion order.
+
+        Every token of a substring lies inside a single token of any text containing it, so documents lacking such a
+        token can be pruned without false negatives; callers still have to confirm the match on the text itself.
+        Returns None when the substring has no tokens and nothing can be pruned.
+        """
+        tokens = set(tokenize(substring))
+        if not tokens:
+            return None
+        matched: Optional[set] = None
+        for token in sorted(tokens, key=len, reverse=True):
+            docs = set()
+            for term in self.tokens_containing(token):
+                docs.update(self.postings[term])
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return []
+        return sorted(matched & self._order.keys(), key=self._order.__getitem__)
+
+    def idf(self, token: str) -> float:
+        n = len(self.postings.get(token, ()))
+        return math.log(1 + (len(self.doc_len) - n + 0.5) / (n + 0.5))
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[Hashable, float]]:
+        """Return up to `top_k` (doc_id, BM25 score) pairs, best first. Only documents sharing a token with the
+        query are scored."""
+        if not self.doc_len:
+            return []
+        avg_len = self._total_len / len(self.doc_len) or 1
+        scores: dict[Hashable, float] = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = self.idf(token)
+            for doc_id, tf in postings.items():
+                if doc_id not in self.doc_len:  # left by a removal with another text
+                    continue
+                denom = tf + self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / denom
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], self._order[x[0]]))
+        return ranked[:top_k] if top_k else ranked
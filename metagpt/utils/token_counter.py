@@ -10,6 +10,14 @@ ref3: https://github.com/Significant-Gravitas/Auto-GPT/blob/master/autogpt/llm/t
 ref4: https://github.com/hwchase17/langchain/blob/master/langchain/chat_models/openai.py
 ref5: https://ai.google.dev/models/gemini
 """
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
 import tiktoken
 from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletionChunk
@@ -333,13 +341,58 @@ SPARK_TOKENS = {
 }
 
 
-def count_input_tokens(messages, model="gpt-3.5-turbo-0125"):
-    """Return the number of tokens used by a list of messages."""
+# Token counts of recently seen texts, keyed by (encoding name, digest of the text) so that the cache does not keep the
+# prompts alive. Prompts repeat the same system messages and history on every request, so most of their contents are
+# encoded only once.
+_TOKEN_COUNT_CACHE_SIZE = 4096
+_token_counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+_token_counts_lock = threading.Lock()
+# Below this many uncached characters, or on a single core, encoding strings one by one is cheaper than starting
+# tiktoken's batch thread pool.
+_MIN_BATCH_ENCODE_CHARS = 65536
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """Return the tiktoken encoding of a model, loaded once per process."""
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
         logger.info(f"Warning: model {model} not found in tiktoken. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_key(encoding: tiktoken.Encoding, text: str) -> tuple[str, bytes]:
+    return encoding.name, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _get_cached_count(key: tuple[str, bytes]) -> Optional[int]:
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+        return count
+
+
+def _cache_count(key: tuple[str, bytes], count: int):
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+
+
+def _count_text_tokens(encoding: tiktoken.Encoding, text: str) -> int:
+    key = _count_key(encoding, text)
+    count = _get_cached_count(key)
+    if count is None:
+        count = len(encoding.encode(text))
+        _cache_count(key, count)
+    return count
+
+
+def count_input_tokens(messages, model="gpt-3.5-turbo-0125"):
+    """Return the number of tokens used by a list of messages."""
+    encoding = get_encoding(model)
     if model in {
         "gpt-3.5-turbo-0613",
         "gpt-3.5-turbo-16k-0613",
@@ -396,7 +449,7 @@ def count_input_tokens(messages, model="gpt-3.5-turbo-0125"):
                 for item in value:
                     if isinstance(item, dict) and item.get("type") in ["text"]:
                         content = item.get("text", "")
-            num_tokens += len(encoding.encode(content))
+            num_tokens += _count_text_tokens(encoding, content)
             if key == "name":
                 num_tokens += tokens_per_name
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
@@ -414,12 +467,87 @@ def count_output_tokens(string: str, model: str) -> int:
     Returns:
         int: The number of tokens in the text string.
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        logger.info(f"Warning: model {model} not found in tiktoken. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(string))
+    return _count_text_tokens(get_encoding(model), string)
+
+
+def count_tokens_many(strings: list[str], model: str = "gpt-3.5-turbo-0125") -> list[int]:
+    """
+    Returns the number of tokens in each of the text strings.
+
+    Cached counts are reused and the remaining strings are encoded in one batch.
+
+    Args:
+        strings (list[str]): The text strings.
+        model (str): The name of the encoding to use. (e.g., "gpt-3.5-turbo")
+
+    Returns:
+        list[int]: The number of tokens in each text string, in the same order.
+    """
+    encoding = get_encoding(model)
+    counts = {}
+    for string in strings:
+        if string not in counts:
+            counts[string] = _get_cached_count(_count_key(encoding, string))
+    misses = [string for string, count in counts.items() if count is None]
+    if (os.cpu_count() or 1) > 1 and sum(map(len, misses)) >= _MIN_BATCH_ENCODE_CHARS:
+        encoded = encoding.encode_batch(misses)
+    else:
+        encoded = [encoding.encode(string) for string in misses]
+    for string, tokens in zip(misses, encoded):
+        counts[string] = len(tokens)
+        _cache_count(_count_key(encoding, string), len(tokens))
+    return [counts[string] for string in strings]
+
+
+def _stable_boundary(text: str) -> int:
+    """
+    Returns the last position at which `text` can be split without changing how it is tokenized, 0 if there is none.
+
+    tiktoken splits text into pieces with a regex before applying BPE inside each piece, so tokens never cross a
+    piece boundary. Whatever follows, a piece ends before a space that starts a new word, after a line break followed
+    by visible text, and between a letter or digit and the punctuation after it.
+    """
+    for pos in range(len(text) - 1, 0, -1):
+        prev, char = text[pos - 1], text[pos]
+        if prev == "\n" and not char.isspace():
+            return pos
+        if char == " " and not prev.isspace() and pos + 1 < len(text) and text[pos + 1].isalpha():
+            return pos
+        if (
+            prev.isalnum()
+            and not (char.isalnum() or char.isspace() or char == "'")
+            and not unicodedata.category(char).startswith("M")
+        ):
+            return pos
+    return 0
+
+
+class StreamTokenCounter:
+    """
+    Counts the tokens of a reply as it is streamed, chunk by chunk.
+
+    Text is committed up to the last boundary that later chunks cannot merge across, so each chunk only encodes the
+    short uncommitted tail instead of the whole reply, and `count` equals `count_output_tokens` of the full reply.
+    """
+
+    def __init__(self, model: str):
+        self.encoding = get_encoding(model)
+        self._committed_tokens = 0
+        self._pending = ""
+
+    def add(self, delta: str) -> int:
+        """Add a streamed chunk, returning the number of tokens so far."""
+        self._pending += delta
+        boundary = _stable_boundary(self._pending)
+        if boundary:
+            self._committed_tokens += len(self.encoding.encode(self._pending[:boundary]))
+            self._pending = self._pending[boundary:]
+        return self.count
+
+    @property
+    def count(self) -> int:
+        pending_tokens = len(self.encoding.encode(self._pending)) if self._pending else 0
+        return self._committed_tokens + pending_tokens
 
 
 def get_max_completion_tokens(messages: list[dict], model: str, default: int) -> int:
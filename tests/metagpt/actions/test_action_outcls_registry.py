@@ -4,7 +4,12 @@
 
 from typing import List
 
+from metagpt.actions import action_outcls_registry
 from metagpt.actions.action_node import ActionNode
+from metagpt.actions.action_outcls_registry import (
+    get_outcls_cache_stats,
+    get_outcls_json_schema,
+)
 
 
 def test_action_outcls_registry():
@@ -44,3 +49,24 @@ def test_action_outcls_registry():
     outcls6 = ActionNode.create_model_class(class_name, out_mapping)
     outinst6 = outcls6(**out_data2)
     assert outinst5 == outinst6
+
+
+def test_action_outcls_cache(mocker):
+    mocker.patch.object(action_outcls_registry, "MAX_ACTION_OUTCLS", 2)
+    before = get_outcls_cache_stats()
+
+    mapping = {"field": (list[str], ...), "nested": {"inner": (int, ...)}}
+    outcls = ActionNode.create_model_class("cached", mapping)
+    assert ActionNode.create_model_class("cached", dict(reversed(mapping.items()))) is outcls
+    stats = get_outcls_cache_stats()
+    assert (stats.hits - before.hits, stats.misses - before.misses) == (1, 2)  # the nested class is cached too
+    assert stats.size == 2 and 0 < stats.hit_rate < 1
+
+    schema = get_outcls_json_schema(outcls)
+    assert get_outcls_json_schema(outcls) is schema
+    assert schema == outcls.model_json_schema()
+
+    ActionNode.create_model_class("other", {"field": (str, ...)})
+    ActionNode.create_model_class("another", {"field": (str, ...)})
+    assert get_outcls_cache_stats().size == 2
+    assert ActionNode.create_model_class("cached", mapping) is not outcls  # evicted as least recently used
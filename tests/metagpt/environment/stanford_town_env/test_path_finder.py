@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of PathFinder
+
+from pathlib import Path
+
+from metagpt.environment.stanford_town.path_finder import MAX_PATH_STEPS, PathFinder
+from metagpt.environment.stanford_town.stanford_town_ext_env import StanfordTownExtEnv
+
+maze_asset_path = (
+    Path(__file__)
+    .absolute()
+    .parent.joinpath("..", "..", "..", "..", "metagpt/ext/stanford_town/static_dirs/assets/the_ville")
+)
+
+
+def test_find_path():
+    maze = [
+        ["0", "0", "0", "0"],
+        ["0", "1", "1", "0"],
+        ["0", "0", "1", "1"],
+    ]
+    finder = PathFinder(maze, collision_block_char="1")
+
+    # of the shortest paths, the one taking the steps up, then left, from the end
+    assert finder.find_path((0, 0), (3, 1)) == [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1)]
+    assert finder.find_path((0, 2), (3, 0)) == [(0, 2), (0, 1), (0, 0), (1, 0), (2, 0), (3, 0)]
+    assert finder.find_path((1, 2), (1, 2)) == [(1, 2)]
+    assert finder.find_path((0, 0), (2, 2)) == [(2, 2)]  # blocked
+
+    paths = finder.find_paths([((0, 0), (3, 1)), ((0, 0), (1, 2)), ((3, 0), (0, 2))])
+    assert paths == [
+        finder.find_path((0, 0), (3, 1)),
+        [(0, 0), (0, 1), (0, 2), (1, 2)],
+        finder.find_path((3, 0), (0, 2)),
+    ]
+
+    maze[0][1] = "1"
+    assert finder.find_path((0, 0), (3, 1)) == [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1)]  # cached
+    finder.invalidate()
+    assert finder.find_path((0, 0), (3, 1)) == [(3, 1)]
+
+
+def test_find_path_in_the_ville():
+    ext_env = StanfordTownExtEnv(maze_asset_path=maze_asset_path)
+    finder = ext_env.get_path_finder()
+    assert ext_env.get_path_finder() is finder
+
+    path = finder.find_path((58, 9), (37, 0))
+    assert len(path) == 31 and path[0] == (58, 9) and path[-1] == (37, 0)
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+        assert ext_env.get_collision_maze()[y1][x1] == "0"
+    assert finder.find_path((0, 0), (139, 99)) == [(139, 99)]  # farther than MAX_PATH_STEPS
+    assert MAX_PATH_STEPS < 139 + 99
+
+    finder.cache_size = 2
+    finder.find_paths([((58, 9), (60, 9)), ((58, 9), (58, 11)), ((37, 0), (37, 1))])
+    assert len(finder._cache) == 2
+
+    ext_env.collision_maze = [row[:] for row in ext_env.collision_maze]
+    assert ext_env.get_path_finder() is not finder
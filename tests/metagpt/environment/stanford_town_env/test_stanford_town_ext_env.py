@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 # @Desc   : the unittest of StanfordTownExtEnv
 
+import math
+import random
 from pathlib import Path
 
 from metagpt.environment.stanford_town.env_space import (
@@ -62,3 +64,41 @@ def test_stanford_town_ext_env_observe_step():
     event = ("double studio:double studio:bedroom 2:bed", None, None, None)
     obs, _, _, _, _ = ext_env.step(action=EnvAction(action_type=EnvActionType.ADD_TILE_EVENT, coord=tile, event=event))
     assert len(ext_env.tiles[tile[1]][tile[0]]["events"]) == 1
+
+
+def scan_events_in_radius(ext_env: StanfordTownExtEnv, tile: tuple[int, int], vision_r: int) -> list:
+    """the perception of STRole, tile by tile"""
+    curr_arena_path = ext_env.get_tile_path(tile, level="arena")
+    percept_events_set, percept_events_list = set(), []
+    for nearby_tile in ext_env.get_nearby_tiles(tile, vision_r):
+        tile_details = ext_env.access_tile(nearby_tile)
+        if tile_details["events"] and ext_env.get_tile_path(nearby_tile, level="arena") == curr_arena_path:
+            dist = math.dist(nearby_tile, tile)
+            for event in tile_details["events"]:
+                if event not in percept_events_set:
+                    percept_events_list += [[dist, event]]
+                    percept_events_set.add(event)
+    return [event for _, event in sorted(percept_events_list, key=lambda i: i[0])]
+
+
+def test_observe_events_in_radius():
+    ext_env = StanfordTownExtEnv(maze_asset_path=maze_asset_path)
+
+    tile = (72, 14)
+    events = ext_env.observe_events_in_radius(tile, vision_r=4)
+    assert events[0] == ("the Ville:Isabella Rodriguez's apartment:main room:bed", None, None, None)
+    assert events == scan_events_in_radius(ext_env, tile, vision_r=4)
+    assert ext_env.observe_events_in_radius((58, 9), vision_r=4) == []  # no arena
+
+    event = ("Isabella Rodriguez", "is", "sleeping", "sleeping")
+    ext_env.add_event_from_tile(event, tile)
+    assert event in ext_env.observe_events_in_radius(tile, vision_r=4)
+    ext_env.remove_subject_events_from_tile("Isabella Rodriguez", tile)
+    assert ext_env.observe_events_in_radius(tile, vision_r=4) == events
+
+    random.seed(0)
+    for _ in range(50):
+        tile = (random.randrange(ext_env.maze_width), random.randrange(ext_env.maze_height))
+        vision_r = random.randint(0, 12)
+        events = ext_env.observe(EnvObsParams(obs_type=EnvObsType.TILE_EVENTS, coord=tile, vision_radius=vision_r))
+        assert events == scan_events_in_radius(ext_env, tile, vision_r)
@@ -7,8 +7,9 @@ from datetime import datetime, timedelta
 import pytest
 
 from metagpt.ext.stanford_town.memory.agent_memory import AgentMemory
-from metagpt.ext.stanford_town.memory.retrieve import agent_retrieve
+from metagpt.ext.stanford_town.memory.retrieve import agent_retrieve, new_agent_retrieve
 from metagpt.ext.stanford_town.utils.const import STORAGE_PATH
+from metagpt.ext.stanford_town.utils.embedding_service import EmbeddingService
 from metagpt.logs import logger
 
 """
@@ -66,7 +67,8 @@ class TestAgentMemory:
         result2 = agent_memory.get_last_chat("customers")
         logger.info(f"上一次对话是{result2}")
 
-    def test_retrieve_function(self, agent_memory):
+    @pytest.mark.asyncio
+    async def test_retrieve_function(self, agent_memory):
         focus_points = ["who i love?"]
         retrieved = dict()
         for focal_pt in focus_points:
@@ -77,7 +79,7 @@ class TestAgentMemory:
             ]
             nodes = sorted(nodes, key=lambda x: x[0])
             nodes = [i for created, i in nodes]
-            results = agent_retrieve(agent_memory, datetime.now() - timedelta(days=120), 0.99, focal_pt, nodes, 5)
+            results = await agent_retrieve(agent_memory, datetime.now() - timedelta(days=120), 0.99, focal_pt, nodes, 5)
             final_result = []
             for n in results:
                 for i in agent_memory.storage:
@@ -87,3 +89,41 @@ class TestAgentMemory:
 
             retrieved[focal_pt] = final_result
         logger.info(f"检索结果为{retrieved}")
+
+
+@pytest.mark.asyncio
+async def test_retrieve_with_memory_matrix(mocker):
+    agent_memory = AgentMemory()
+    created = datetime(2023, 2, 13)
+    embeddings = {"cafe": [1.0, 0.0], "party": [0.0, 1.0], "idle": [1.0, 0.0]}
+    for i, (description, poignancy) in enumerate([("cafe", 1), ("party", 8), ("cafe", 5), ("idle", 9)]):
+        key = f"{description} {i}"
+        agent_memory.add_event(
+            created + timedelta(days=i), None, "s", "p", "o", key, set(), poignancy, (key, embeddings[description]), []
+        )
+    mocker.patch("metagpt.ext.stanford_town.memory.retrieve.get_embedding", return_value=[1.0, 0.0])
+
+    async def embed(texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    service = EmbeddingService(embed_func=embed)
+    mocker.patch("metagpt.ext.stanford_town.memory.retrieve.get_embedding_service", return_value=service)
+    nodes = [i for i in agent_memory.event_list if "idle" not in i.embedding_key]
+
+    results = await agent_retrieve(agent_memory, created + timedelta(days=3), 0.5, "cafe", nodes, 2)
+
+    # importance + recency + relevance, each normalized: "cafe 2" 0.57+1+1, "party 1" 1+0.33+0, "cafe 0" 0+0+1
+    assert results == ["node_3", "node_2"]
+    assert agent_memory.matrix.embeddings.shape == (4, 2)
+    assert agent_memory.matrix.retrievable.tolist() == [True, True, True, False]
+
+    agent_memory.add_event(created, None, "s", "p", "o", "cafe 4", set(), 9, ("cafe 4", [2.0, 0.0]), [])
+    role = mocker.Mock(memory=agent_memory)
+    role.scratch.curr_time = created + timedelta(days=3)
+    role.scratch.recency_decay = 0.5
+    retrieved = await new_agent_retrieve(role, ["cafe"], 2)
+
+    # the matrix got the new memory, scored 1+0+1 against 0.5+1+1 for "cafe 2"
+    assert [i.memory_id for i in retrieved["cafe"]] == ["node_3", "node_5"]
+    assert retrieved["cafe"][1].last_accessed == created + timedelta(days=3)
+    assert len(agent_memory.matrix) == 5
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of EmbeddingService
+
+import asyncio
+
+import pytest
+
+from metagpt.ext.stanford_town.utils.embedding_service import EmbeddingService
+
+
+class LocalEmbedding:
+    """A local stand-in of the embedding model, recording the batches it is sent."""
+
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Connection error.")
+        return [[float(len(i)), 1.0] for i in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched_and_cached(tmp_path):
+    model = LocalEmbedding()
+    service = EmbeddingService(embed_func=model, cache_path=tmp_path / "embeddings.jsonl", max_batch_size=3)
+
+    texts = ["a", "bb", "a", "ccc", "dddd", ""]
+    embeddings = await asyncio.gather(*[service.aget_embedding(i) for i in texts])
+
+    assert embeddings == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0], [3.0, 1.0], [4.0, 1.0], [13.0, 1.0]]
+    assert model.batches == [["a", "bb", "ccc"], ["dddd", "this is blank"]]
+
+    assert await service.aget_embeddings(["bb", "line\nbreak"]) == [[2.0, 1.0], [10.0, 1.0]]
+    assert model.batches[-1] == ["line break"]
+
+    reloaded = EmbeddingService(embed_func=LocalEmbedding(), cache_path=tmp_path / "embeddings.jsonl")
+    assert len(reloaded) == 6
+    assert await reloaded.aget_embedding("ccc") == [3.0, 1.0]
+    assert reloaded.embed_func.batches == []
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff():
+    model = LocalEmbedding(failures=2)
+    service = EmbeddingService(embed_func=model, retry_delay=0.01)
+    assert await service.aget_embedding("abc") == [3.0, 1.0]
+    assert len(model.batches) == 3
+
+    service = EmbeddingService(embed_func=LocalEmbedding(failures=3), retry_delay=0.01)
+    with pytest.raises(ValueError):
+        await service.aget_embedding("abc")
+    assert len(service) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    class SlowEmbedding(LocalEmbedding):
+        async def __call__(self, texts: list[str]) -> list[list[float]]:
+            await asyncio.sleep(0.05)
+            return await super().__call__(texts)
+
+    model = SlowEmbedding()
+    service = EmbeddingService(embed_func=model)
+
+    cancelled = asyncio.create_task(service.aget_embeddings(["x", "yy"]))
+    other = asyncio.create_task(service.aget_embeddings(["x", "yy"]))
+    await asyncio.sleep(0.02)
+    cancelled.cancel()
+
+    assert await other == [[1.0, 1.0], [2.0, 1.0]]
+    assert cancelled.cancelled()
+    assert await service.aget_embeddings(["x"]) == [[1.0, 1.0]]
+    assert not service._pending and len(model.batches) == 1
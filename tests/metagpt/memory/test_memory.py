@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 # @Desc   : the unittest of Memory
 
+import pytest
+
 from metagpt.actions import UserRequirement
 from metagpt.memory.memory import Memory
 from metagpt.schema import Message
@@ -55,3 +57,118 @@ def test_memory():
     memory.clear()
     assert memory.count() == 0
     assert len(memory.index) == 0
+
+
+def test_memory_index():
+    memory = Memory()
+
+    message1 = Message(content="test message1", role="user1", send_to="Alice")
+    message2 = Message(content="test message2", role="user2", send_to={"Alice", "Bob"})
+    memory.add_batch([message1, message2, message1.model_copy()])
+    assert memory.count() == 2
+    assert memory.contains(message1)
+    assert not memory.contains(Message(content="test message1", role="user1"))
+
+    assert memory.get_by_role("user1") == [message1]
+    assert memory.get_by_send_to("Alice") == [message1, message2]
+    assert memory.get_by_send_to("Bob") == [message2]
+
+    message3 = Message(content="test message3", role="user1")
+    assert memory.find_news([message1, message3]) == [message3]
+    assert memory.find_news([message1, message2], k=1) == [message1]
+
+    memory.delete(message1.model_copy())
+    assert memory.count() == 1
+    assert not memory.contains(message1)
+    assert memory.get_by_role("user1") == []
+    assert memory.get_by_send_to("Alice") == [message2]
+
+    restored = Memory(**memory.model_dump())
+    assert restored.contains(message2)
+    assert restored.get_by_send_to("Bob") == [message2]
+    restored.delete(message2)
+    assert restored.count() == 0
+    assert restored.get_by_action(UserRequirement) == []
+
+
+def test_memory_delete_from_the_middle():
+    memory = Memory()
+    messages = [Message(content=f"test message{i}", role=f"user{i % 3}", send_to="Alice") for i in range(100)]
+    memory.add_batch(messages)
+
+    for message in messages[10:90:2]:
+        memory.delete(message)
+    kept = messages[:10] + messages[11:90:2] + messages[90:]
+    assert memory.storage == kept
+    assert memory.get_by_send_to("Alice") == kept
+    assert memory.get_by_role("user1") == [i for i in kept if i.role == "user1"]
+    assert memory.get_by_action(UserRequirement) == kept
+    assert memory.delete_newest() is messages[-1]
+    assert memory.count() == len(kept) - 1
+
+
+def test_memory_window(tmp_path):
+    spill_path = tmp_path / "memory.jsonl"
+    memory = Memory(window_size=4, spill_path=spill_path)
+
+    messages = [Message(content=f"test message{i}", role=f"user{i % 2}") for i in range(10)]
+    memory.add_batch(messages)
+    assert memory.count() == 10
+    assert len(memory.storage) <= 4
+    assert spill_path.exists()
+
+    assert [i.content for i in memory.get()] == [i.content for i in messages]
+    assert [i.content for i in memory.get(k=6)] == [i.content for i in messages[-6:]]
+    assert len(memory.get_by_role("user0")) == 5
+    assert len(memory.get_by_action(UserRequirement)) == 10
+    assert [i.content for i in memory.try_remember("message1")] == ["test message1"]
+
+    memory.add(messages[0].model_copy())
+    assert memory.count() == 10
+    assert memory.find_news(messages[:2]) == []
+
+    restored = Memory(**memory.model_dump())
+    assert restored.count() == 10
+    assert [i.id for i in restored.get()] == [i.id for i in messages]
+
+    memory.clear()
+    assert memory.count() == 0
+    assert not spill_path.exists()
+
+
+def test_memory_keyword_recall(tmp_path):
+    memory = Memory(window_size=4, spill_path=tmp_path / "memory.jsonl")
+    memory.add(Message(content="write a snake game in python", role="user"))
+    memory.add_batch([Message(content=f"note {i}", role="user") for i in range(8)])
+    memory.add(Message(content="the snake game uses pygame; snake moves with arrow keys", role="assistant"))
+    memory.add(Message(content="snakes and ladders", role="user"))
+
+    assert [i.role for i in memory.try_remember("snake game")] == ["user", "assistant"]
+    assert len(memory.try_remember("nake")) == 3
+    assert len(memory.get_by_content("; ")) == 1
+    assert memory.try_remember("tetris") == []
+
+    ranked = memory.search("snake pygame", k=2)
+    assert ranked[0].role == "assistant"
+    assert len(ranked) == 2
+
+    newest = memory.delete_newest()
+    assert newest.content == "snakes and ladders"
+    assert len(memory.try_remember("nake")) == 2
+    assert memory == Memory(**memory.model_dump())
+
+
+def test_memory_window_with_ignore_id(tmp_path, mocker):
+    memory = Memory(window_size=4, spill_path=tmp_path / "memory.jsonl", ignore_id=True)
+    messages = [Message(content=f"test message{i}") for i in range(10)]
+    memory.add_batch(messages)
+    assert memory.segment.count() > 0
+
+    iter_messages = mocker.spy(memory.segment, "iter_messages")
+    memory.add(Message(content="test message0"))  # spilled
+    memory.add(Message(content="test message10"))
+    assert memory.count() == 11
+    assert not iter_messages.called
+
+    with pytest.raises(ValueError):
+        Memory(window_size=4)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of LLM admission control
+
+import asyncio
+
+import pytest
+
+from metagpt.configs.llm_config import LLMConfig
+from metagpt.provider.admission_controller import (
+    AdmissionController,
+    get_admission_controller,
+)
+from metagpt.provider.base_llm import BaseLLM
+
+
+class FakeLLM(BaseLLM):
+    """A local provider that records how many requests are in flight at once."""
+
+    def __init__(self, config: LLMConfig):
+        self.config = config
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _achat_completion(self, messages: list[dict], timeout=3):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"choices": [{"message": {"content": messages[-1]["content"]}}]}
+
+    async def acompletion(self, messages: list[dict], timeout=3):
+        return await self._achat_completion(messages, timeout=timeout)
+
+    async def _achat_completion_stream(self, messages: list[dict], timeout: int = 3) -> str:
+        rsp = await self._achat_completion(messages, timeout=timeout)
+        return self.get_choice_text(rsp)
+
+
+@pytest.mark.asyncio
+async def test_llm_max_concurrency():
+    config = LLMConfig(api_key="fake_api_key", base_url="fake_base_url", model="fake", max_concurrency=2, tpm=10**6)
+    llm = FakeLLM(config)
+    rsps = await asyncio.gather(*[llm.aask(f"hello {i}", stream=False) for i in range(8)])
+    assert rsps == [f"hello {i}" for i in range(8)]
+    assert llm.max_in_flight == 2
+
+    metrics = get_admission_controller(config).metrics
+    assert metrics.total_admitted == 8
+    assert metrics.in_flight == 0
+    assert metrics.max_queue_depth == 6
+
+    assert get_admission_controller(LLMConfig(api_key="fake_api_key")) is None
+    assert get_admission_controller(config.model_copy()) is get_admission_controller(config)
+    limited = get_admission_controller(config.model_copy(update={"max_concurrency": 1, "rpm": 30}))
+    assert (limited.max_concurrency, limited.rpm, limited.tpm) == (1, 30, 10**6)
+
+
+@pytest.mark.asyncio
+async def test_admission_priority_and_rpm():
+    controller = AdmissionController(rpm=1, period=0.05)
+    order = []
+
+    async def request(name: str, priority: int):
+        async with controller.admit(priority=priority):
+            order.append(name)
+
+    await asyncio.gather(request("first", 0), request("low", 0), request("high", 5))
+    assert order == ["first", "high", "low"]
+    assert controller.metrics.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_tpm():
+    controller = AdmissionController(tpm=100, period=0.05)
+    await controller.acquire(tokens=80)
+    controller.release()
+    assert not controller._can_admit(tokens=30, now=controller._tokens[-1][0])
+    await asyncio.wait_for(controller.acquire(tokens=30), timeout=1)
+    controller.release()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of the LLM response cache
+
+import time
+
+import pytest
+
+from metagpt.configs.llm_config import LLMConfig
+from metagpt.provider.base_llm import BaseLLM
+from metagpt.provider.response_cache import (
+    ResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
+from metagpt.utils.cost_manager import CostManager
+
+
+class EchoLLM(BaseLLM):
+    """A local provider that echoes the prompt and counts the requests it really served."""
+
+    def __init__(self, config: LLMConfig):
+        self.config = config
+        self.cost_manager = CostManager()
+        self.calls = 0
+
+    async def _achat_completion(self, messages: list[dict], timeout=3):
+        self.calls += 1
+        return {"choices": [{"message": {"content": f"echo: {messages[-1]['content']}"}}]}
+
+    async def acompletion(self, messages: list[dict], timeout=3):
+        return await self._achat_completion(messages, timeout=timeout)
+
+    async def _achat_completion_stream(self, messages: list[dict], timeout: int = 3) -> str:
+        rsp = await self._achat_completion(messages, timeout=timeout)
+        return self.get_choice_text(rsp)
+
+
+@pytest.mark.asyncio
+async def test_llm_response_cache(tmp_path, mocker):
+    config = LLMConfig(
+        api_key="fake_api_key", model="fake", response_cache=True, response_cache_path=str(tmp_path / "c.db")
+    )
+    llm = EchoLLM(config)
+    assert await llm.acompletion_text([llm._user_msg("hello")]) == "echo: hello"
+    assert await llm.acompletion_text([llm._user_msg("hello  \r\n")]) == "echo: hello"
+    assert llm.calls == 1
+
+    stream_log = mocker.patch("metagpt.provider.base_llm.log_llm_stream")
+    assert await llm.acompletion_text([llm._user_msg("hello")], stream=True) == "echo: hello"
+    stream_log.assert_any_call("echo: hello")
+    assert llm.calls == 1
+
+    costs = llm.get_costs()
+    assert (costs.cache_hits, costs.cache_misses, costs.total_cost) == (2, 1, 0)
+
+    # a different model is a different request
+    other = EchoLLM(config.model_copy(update={"model": "other"}))
+    await other.acompletion_text([other._user_msg("hello")])
+    assert other.calls == 1
+
+    assert get_response_cache(config) is get_response_cache(config.model_copy())
+    assert get_response_cache(LLMConfig(api_key="fake_api_key")) is None
+
+
+def test_response_cache_persistence_and_eviction(tmp_path):
+    config = LLMConfig(api_key="fake_api_key", model="fake")
+    keys = [make_cache_key(config, [{"role": "user", "content": f"q{i}"}]) for i in range(3)]
+
+    cache = ResponseCache(tmp_path / "c.db", max_bytes=20)
+    cache.set(keys[0], "a" * 10)
+    cache.set(keys[1], "b" * 10)
+    assert cache.get(keys[0]) == "a" * 10  # keys[1] becomes the least recently used
+    cache.set(keys[2], "c" * 10)
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
+    cache.close()
+
+    reopened = ResponseCache(tmp_path / "c.db", ttl=0.05)
+    assert reopened.get(keys[2]) == "c" * 10
+    time.sleep(0.06)
+    assert reopened.get(keys[2]) is None
+    assert reopened.get(keys[0]) is None
+
+
+def test_response_cache_batches_access_times(tmp_path):
+    cache = ResponseCache(tmp_path / "c.db", touch_batch=2)
+    cache.set("k1", "v1")
+    cache.set("k2", "v2")
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+
+    assert cache.get("k1") == "v1"
+    assert not statements  # a hit does not write to sqlite
+    assert cache.get("k1") == "v1"
+    assert not statements  # the same key is buffered once
+    assert cache.get("k2") == "v2"
+    assert [i for i in statements if i.startswith("UPDATE")]
+    statements.clear()
+
+    assert cache.get("k1") == "v1"
+    assert not statements
+    cache.close()  # writes what is still buffered
+    cache.close()
+
+    reopened = ResponseCache(tmp_path / "c.db")
+    rows = dict(reopened._conn.execute("SELECT key, accessed_at FROM responses"))
+    assert rows["k1"] > rows["k2"]
+    reopened.close()
+
+
+def test_make_cache_key():
+    config = LLMConfig(api_key="sk-a", model="m")
+    messages = [{"role": "user", "content": "q\r\n"}]
+    key = make_cache_key(config, messages)
+
+    assert make_cache_key(config, [{"role": "user", "content": "q"}]) == key
+    for same in ({"api_key": "sk-b"}, {"stream": False}, {"timeout": 10}, {"rpm": 3}, {"response_cache": True}):
+        assert make_cache_key(config.model_copy(update=same), messages) == key
+    for other in (
+        {"top_k": 5},
+        {"presence_penalty": 0.5},
+        {"frequency_penalty": 0.5},
+        {"repetition_penalty": 1.1},
+        {"n": 2},
+        {"best_of": 2},
+        {"logprobs": True},
+        {"top_logprobs": 3},
+        {"api_version": "2024-01-01"},
+    ):
+        assert make_cache_key(config.model_copy(update=other), messages) != key
+    assert make_cache_key(config, messages, model="other") != key
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from metagpt.rag.benchmark.base import load_metric
+from metagpt.rag.benchmark.runner import (
+    BenchmarkConfig,
+    HashEmbedding,
+    LatencyStats,
+    RAGBenchmarkRunner,
+    save_report,
+)
+from metagpt.rag.schema import BM25RetrieverConfig, FAISSRetrieverConfig
+
+
+def test_hash_embedding_is_deterministic():
+    embed_model = HashEmbedding(embed_dim=32)
+
+    vector = embed_model.get_text_embedding("the cat sat on the mat")
+
+    assert vector == HashEmbedding(embed_dim=32).get_text_embedding("the cat sat on the mat")
+    assert len(vector) == 32
+    assert sum(v * v for v in vector) == pytest.approx(1.0)
+    assert embed_model.similarity(vector, embed_model.get_query_embedding("cat on the mat")) > embed_model.similarity(
+        vector, embed_model.get_query_embedding("stock market news")
+    )
+
+
+def test_latency_stats():
+    stats = LatencyStats.from_seconds([i / 1000 for i in range(1, 101)])
+
+    assert stats.p50 == pytest.approx(50.5)
+    assert stats.p99 == pytest.approx(99.01)
+    assert stats.mean == pytest.approx(50.5)
+    assert LatencyStats.from_seconds([]) == (0.0, 0.0, 0.0, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_run_and_save_report(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("\n\n".join(f"paragraph {i} about topic {i % 3}" for i in range(50)))
+    configs = [
+        BenchmarkConfig(
+            name="faiss", retriever_configs=[FAISSRetrieverConfig(dimensions=256)], chunk_size=32, chunk_overlap=0
+        ),
+        BenchmarkConfig(name="bm25", retriever_configs=[BM25RetrieverConfig()], chunk_size=32, chunk_overlap=0),
+    ]
+    runner = RAGBenchmarkRunner(concurrency=4, repeat=2)
+
+    results = await runner.run(configs, [str(doc)], ["topic 1", "paragraph 7"])
+    save_report(results, tmp_path / "report")
+
+    assert [r.name for r in results] == ["faiss", "bm25"]
+    for r in results:
+        assert r.num_files == 1
+        assert r.num_nodes > 1
+        assert r.num_queries == 4
+        assert r.qps > 0
+        assert 0 < r.p50_ms <= r.p95_ms <= r.p99_ms
+    assert configs[0].retriever_configs[0].index is None  # configs are not changed by the runs
+    assert [r["name"] for r in json.loads((tmp_path / "report.json").read_text())] == ["faiss", "bm25"]
+    table = (tmp_path / "report.md").read_text().splitlines()
+    assert table[0].startswith("| config | nodes |")
+    assert table[2].startswith("| faiss |")
+
+
+def test_load_metric_is_cached(mocker):
+    mock_evaluate = mocker.MagicMock()
+    mocker.patch.dict("sys.modules", {"evaluate": mock_evaluate})
+    load_metric.cache_clear()
+
+    assert load_metric("bleu") is load_metric("bleu")
+    mock_evaluate.load.assert_called_once_with(path="bleu")
+    load_metric.cache_clear()
@@ -0,0 +1,60 @@
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+
+from metagpt.rag.embeddings import CachedEmbedding, EmbeddingCache
+
+
+class CountingEmbedding(MockEmbedding):
+    calls: int = 0
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        return [[float(len(text)), 0.5] for text in texts]
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return self._get_text_embeddings(texts)
+
+
+class TestCachedEmbedding:
+    @pytest.fixture
+    def embed_model(self):
+        return CountingEmbedding(embed_dim=2)
+
+    def test_reembedding_unchanged_texts_makes_no_calls(self, embed_model, tmp_path):
+        cached = CachedEmbedding(embed_model=embed_model, cache_path=tmp_path, embed_batch_size=2)
+
+        texts = ["a", "bb", "a", "ccc", "dddd"]
+        assert cached.get_text_embedding_batch(texts) == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5], [3.0, 0.5], [4.0, 0.5]]
+        assert embed_model.calls == 2  # 4 distinct texts in batches of 2
+
+        reopened = CachedEmbedding(embed_model=embed_model, cache_path=tmp_path)
+        assert reopened.get_text_embedding_batch(texts) == cached.get_text_embedding_batch(texts)
+        assert reopened.get_text_embedding("ccc") == [3.0, 0.5]
+        assert embed_model.calls == 2
+
+        stats = reopened.cache_stats
+        assert (stats.hits, stats.misses, stats.size, stats.hit_rate) == (6, 0, 4, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_aget_text_embedding_batch(self, embed_model, tmp_path):
+        cached = CachedEmbedding(embed_model=embed_model, cache_path=tmp_path, embed_batch_size=1, concurrency=2)
+
+        assert await cached.aget_text_embedding_batch(["a", "bb", "a"]) == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+        assert await cached.aget_text_embedding_batch(["bb", "eeeee"]) == [[2.0, 0.5], [5.0, 0.5]]
+        assert embed_model.calls == 3
+        assert cached.cache_stats.misses == 4
+
+    def test_models_of_other_dimensions_or_servers_get_their_own_cache(self, tmp_path):
+        class ServedEmbedding(CountingEmbedding):
+            api_base: str = "http://a"
+            dimensions: int = 2
+
+        cached = CachedEmbedding(embed_model=ServedEmbedding(embed_dim=2), cache_path=tmp_path)
+        cached.get_text_embedding("a")
+        for other in (ServedEmbedding(embed_dim=2, api_base="http://b"), ServedEmbedding(embed_dim=2, dimensions=4)):
+            assert CachedEmbedding(embed_model=other, cache_path=tmp_path).cache_stats.size == 0
+        assert CachedEmbedding(embed_model=ServedEmbedding(embed_dim=2), cache_path=tmp_path).cache_stats.size == 1
+
+    def test_open_cache_without_vectors_file(self, tmp_path):
+        (tmp_path / "meta.json").write_text('{"dim": 2}')
+        assert len(EmbeddingCache(tmp_path)) == 0
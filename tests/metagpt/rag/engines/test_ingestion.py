@@ -0,0 +1,50 @@
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import TextNode
+
+from metagpt.rag.engines.ingestion import (
+    iter_parsed_files,
+    parse_files,
+    set_node_embeddings,
+)
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    files = []
+    for i in range(5):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text(f"content of document {i}")
+        files.append(str(path))
+    return files
+
+
+def test_parse_files(input_files):
+    parsed = parse_files(input_files[:2], transformations=[SentenceSplitter()])
+
+    assert sorted(parsed.doc_files.values()) == input_files[:2]
+    assert [n.text for n in parsed.nodes] == ["content of document 0", "content of document 1"]
+    assert set(parsed.doc_files) == {n.ref_doc_id for n in parsed.nodes}
+    assert all("file_path" in n.excluded_embed_metadata_keys for n in parsed.nodes)
+
+
+@pytest.mark.parametrize("num_workers", [None, 2])
+def test_iter_parsed_files_in_order(input_files, num_workers):
+    batches = list(
+        iter_parsed_files(
+            input_files, transformations=[SentenceSplitter()], num_workers=num_workers, files_per_batch=2, max_pending=1
+        )
+    )
+
+    assert [len(b.doc_files) for b in batches] == [2, 2, 1]
+    assert [n.text for b in batches for n in b.nodes] == [f"content of document {i}" for i in range(5)]
+
+
+def test_set_node_embeddings():
+    nodes = [TextNode(text="a"), TextNode(text="b", embedding=[0.5, 0.5])]
+
+    set_node_embeddings(nodes, MockEmbedding(embed_dim=2))
+
+    assert nodes[0].embedding == [0.5, 0.5]
+    assert nodes[1].embedding == [0.5, 0.5]
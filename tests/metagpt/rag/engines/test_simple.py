@@ -4,13 +4,22 @@ import pytest
 from llama_index.core import VectorStoreIndex
 from llama_index.core.embeddings import MockEmbedding
 from llama_index.core.llms import MockLLM
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.readers.base import BaseReader
 from llama_index.core.schema import Document, NodeWithScore, TextNode
 
 from metagpt.rag.engines import SimpleEngine
+from metagpt.rag.engines.docs_manifest import MANIFEST_FNAME
+from metagpt.rag.engines.ingestion import ParsedFiles, parse_files
 from metagpt.rag.parsers import OmniParse
 from metagpt.rag.retrievers import SimpleHybridRetriever
 from metagpt.rag.retrievers.base import ModifiableRAGRetriever, PersistableRAGRetriever
-from metagpt.rag.schema import BM25RetrieverConfig, ObjectNode
+from metagpt.rag.schema import (
+    BM25RetrieverConfig,
+    FAISSIndexConfig,
+    FAISSRetrieverConfig,
+    ObjectNode,
+)
 
 
 class TestSimpleEngine:
@@ -241,7 +250,7 @@ class TestSimpleEngine:
             assert isinstance(node, TextNode)
             assert "is_obj" in node.metadata
 
-    def test_persist_successfully(self, mocker):
+    def test_persist_successfully(self, mocker, tmp_path):
         # Mock
         mock_retriever = mocker.MagicMock(spec=PersistableRAGRetriever)
         mock_retriever.persist.return_value = mocker.MagicMock()
@@ -250,7 +259,10 @@ class TestSimpleEngine:
         engine = SimpleEngine(retriever=mock_retriever)
 
         # Exec
-        engine.persist(persist_dir="")
+        engine.persist(persist_dir=tmp_path)
+
+        # Assert
+        assert (tmp_path / MANIFEST_FNAME).exists()  # even empty, so that from_index can sync
 
     def test_ensure_retriever_of_type(self, mocker):
         # Mock
@@ -322,3 +334,139 @@ class TestSimpleEngine:
         file_extractor = SimpleEngine._get_file_extractor()
         assert ".pdf" in file_extractor
         assert isinstance(file_extractor[".pdf"], OmniParse)
+
+    def test_sync(self, tmp_path):
+        # Setup
+        docs_dir = tmp_path / "docs"
+        docs_dir.mkdir()
+        for name in ["a", "b", "c"]:
+            (docs_dir / f"{name}.txt").write_text(f"content of {name}")
+        embed_model = MockEmbedding(embed_dim=8)
+        engine = SimpleEngine.from_docs(
+            input_dir=str(docs_dir),
+            embed_model=embed_model,
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8, similarity_top_k=10)],
+        )
+
+        (docs_dir / "a.txt").write_text("new content of a")
+        (docs_dir / "b.txt").unlink()
+        (docs_dir / "d.txt").write_text("content of d")
+
+        # Exec
+        result = engine.sync(str(docs_dir))
+
+        # Assert
+        assert result.added == [str((docs_dir / "d.txt").resolve())]
+        assert result.modified == [str((docs_dir / "a.txt").resolve())]
+        assert result.removed == [str((docs_dir / "b.txt").resolve())]
+        texts = sorted(n.text for n in engine.retrieve("content"))
+        assert texts == ["content of c", "content of d", "new content of a"]
+        assert engine.sync(str(docs_dir)) == ([], [], [])
+
+    def test_sync_does_not_read_files_without_nodes_again(self, mocker, tmp_path):
+        # Mock
+        class EmptyReader(BaseReader):
+            def load_data(self, *args, **kwargs) -> list[Document]:
+                return []
+
+        mocker.patch.object(SimpleEngine, "_get_file_extractor", return_value={".skip": EmptyReader()})
+
+        # Setup
+        (tmp_path / "a.txt").write_text("content of a")
+        (tmp_path / "b.skip").write_text("nothing to index")
+        engine = SimpleEngine.from_docs(
+            input_dir=str(tmp_path),
+            embed_model=MockEmbedding(embed_dim=8),
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8)],
+        )
+
+        # Exec
+        (tmp_path / "c.skip").write_text("nothing to index")
+        result = engine.sync(str(tmp_path))
+
+        # Assert
+        assert result == ([str((tmp_path / "c.skip").resolve())], [], [])
+        assert engine.sync(str(tmp_path)) == ([], [], [])
+        assert len(engine._manifest.files) == 3
+        assert engine.num_doc_nodes == 1
+
+    def test_sync_after_from_index(self, tmp_path):
+        # Setup
+        docs_dir, persist_dir = tmp_path / "docs", tmp_path / "index"
+        docs_dir.mkdir()
+        (docs_dir / "a.txt").write_text("content of a")
+        embed_model = MockEmbedding(embed_dim=8)
+        engine = SimpleEngine.from_docs(
+            input_dir=str(docs_dir),
+            embed_model=embed_model,
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8)],
+        )
+        engine.persist(persist_dir)
+        assert (persist_dir / MANIFEST_FNAME).exists()
+
+        (docs_dir / "b.txt").write_text("content of b")
+
+        # Exec
+        engine = SimpleEngine.from_index(
+            index_config=FAISSIndexConfig.model_construct(persist_path=persist_dir, embed_model=embed_model),
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8)],
+        )
+        result = engine.sync(str(docs_dir))
+
+        # Assert
+        assert result == ([str((docs_dir / "b.txt").resolve())], [], [])
+
+    def test_from_docs_with_workers(self, tmp_path):
+        # Setup
+        for i in range(3):
+            (tmp_path / f"{i}.txt").write_text(f"content of {i}")
+        embed_model = MockEmbedding(embed_dim=8)
+
+        # Exec
+        engine = SimpleEngine.from_docs(
+            input_dir=str(tmp_path),
+            embed_model=embed_model,
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8, similarity_top_k=10)],
+            num_workers=2,
+        )
+
+        # Assert
+        assert sorted(n.text for n in engine.retrieve("content")) == [f"content of {i}" for i in range(3)]
+        assert len(engine._manifest.files) == 3
+        assert engine.num_doc_nodes == 3
+
+    def test_from_parsed_files_indexes_each_batch(self, tmp_path, mocker):
+        # Setup
+        files = [tmp_path / f"{i}.txt" for i in range(3)]
+        for i, file in enumerate(files):
+            file.write_text(f"content of {i}")
+        from_nodes = mocker.spy(SimpleEngine, "_from_nodes")
+        save_nodes = mocker.spy(SimpleEngine, "_save_nodes")
+        indexed_before = []
+
+        def batches():
+            yield ParsedFiles(doc_files={}, nodes=[], input_files=[])
+            for file in files:
+                indexed_before.append(from_nodes.call_count + save_nodes.call_count)
+                yield parse_files([str(file)], transformations=[SentenceSplitter()])
+
+        # Exec
+        engine = SimpleEngine._from_parsed_files(
+            batches(),
+            embed_model=MockEmbedding(embed_dim=8),
+            llm=MockLLM(),
+            retriever_configs=[FAISSRetrieverConfig(dimensions=8, similarity_top_k=10)],
+        )
+
+        # Assert
+        assert indexed_before == [0, 1, 2]  # each batch is indexed before the next one is parsed
+        assert len(from_nodes.call_args.kwargs["nodes"]) == 1
+        assert [len(c.args[1]) for c in save_nodes.call_args_list] == [1, 1]
+        assert sorted(n.text for n in engine.retrieve("content")) == [f"content of {i}" for i in range(3)]
+        assert engine.num_doc_nodes == 3
+        assert len(engine._manifest.files) == 3
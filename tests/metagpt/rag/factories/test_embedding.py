@@ -1,7 +1,9 @@
 import pytest
+from llama_index.core.embeddings import MockEmbedding
 
 from metagpt.configs.embedding_config import EmbeddingType
 from metagpt.configs.llm_config import LLMType
+from metagpt.rag.embeddings import CachedEmbedding
 from metagpt.rag.factories.embedding import RAGEmbeddingFactory
 
 
@@ -56,6 +58,7 @@ class TestRAGEmbeddingFactory:
         mock_openai_embedding = self.mock_openai_embedding(mocker)
 
         mock_config.embedding.api_type = None
+        mock_config.embedding.cache = False
         mock_config.llm.api_type = LLMType.OPENAI
 
         # Exec
@@ -64,6 +67,20 @@ class TestRAGEmbeddingFactory:
         # Assert
         mock_openai_embedding.assert_called_once()
 
+    def test_get_rag_embedding_with_cache(self, mocker, mock_config, tmp_path):
+        # Mock
+        mock_config.embedding.cache = True
+        mock_config.embedding.cache_path = str(tmp_path)
+        mock_config.embedding.embed_concurrency = 2
+        mocker.patch("metagpt.rag.factories.embedding.OpenAIEmbedding", return_value=MockEmbedding(embed_dim=1))
+
+        # Exec
+        embedding = self.embedding_factory.get_rag_embedding(EmbeddingType.OPENAI)
+
+        # Assert
+        assert isinstance(embedding, CachedEmbedding)
+        assert embedding.concurrency == 2
+
     @pytest.mark.parametrize(
         "model, embed_batch_size, expected_params",
         [("test_model", 100, {"model_name": "test_model", "embed_batch_size": 100}), (None, None, {})],
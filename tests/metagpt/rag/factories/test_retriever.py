@@ -18,6 +18,8 @@ from metagpt.rag.schema import (
     ElasticsearchRetrieverConfig,
     ElasticsearchStoreConfig,
     FAISSRetrieverConfig,
+    FusionMode,
+    HybridRetrieverConfig,
 )
 
 
@@ -81,6 +83,22 @@ class TestRetrieverFactory:
 
         assert isinstance(retriever, SimpleHybridRetriever)
 
+    def test_get_retriever_with_hybrid_config(self, mocker, mock_nodes, mock_embedding):
+        mock_config = HybridRetrieverConfig(
+            retriever_configs=[FAISSRetrieverConfig(dimensions=1), BM25RetrieverConfig()],
+            fusion_mode=FusionMode.WEIGHTED_SCORE,
+            timeout=1.0,
+        )
+
+        retriever = self.retriever_factory.get_retriever(
+            configs=[mock_config], nodes=mock_nodes, embed_model=mock_embedding
+        )
+
+        assert isinstance(retriever, SimpleHybridRetriever)
+        assert retriever.fusion_mode == FusionMode.WEIGHTED_SCORE
+        assert retriever.timeouts == [1.0, 1.0]
+        assert isinstance(retriever.retrievers[1], DynamicBM25Retriever)
+
     def test_get_retriever_with_chroma_config(self, mocker, mock_chroma_vector_store, mock_embedding):
         mock_config = ChromaRetrieverConfig(persist_path="/path/to/chroma", collection_name="test_collection")
         mock_chromadb = mocker.patch("metagpt.rag.factories.retriever.chromadb.PersistentClient")
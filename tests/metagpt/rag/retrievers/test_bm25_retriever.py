@@ -1,27 +1,31 @@
 import pytest
 from llama_index.core import VectorStoreIndex
-from llama_index.core.schema import Node
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from rank_bm25 import BM25Okapi
 
-from metagpt.rag.retrievers.bm25_retriever import DynamicBM25Retriever
+from metagpt.rag.retrievers.bm25_index import BM25Index
+from metagpt.rag.retrievers.bm25_retriever import BM25_INDEX_FNAME, DynamicBM25Retriever
 
 
 class TestDynamicBM25Retriever:
     @pytest.fixture(autouse=True)
     def setup(self, mocker):
-        self.doc1 = mocker.MagicMock(spec=Node)
-        self.doc1.get_content.return_value = "Document content 1"
-        self.doc2 = mocker.MagicMock(spec=Node)
-        self.doc2.get_content.return_value = "Document content 2"
+        self.doc1 = TextNode(id_="1", text="Document content 1")
+        self.doc2 = TextNode(
+            id_="2",
+            text="Document content 2",
+            relationships={NodeRelationship.SOURCE: RelatedNodeInfo(node_id="doc2")},
+        )
         self.mock_nodes = [self.doc1, self.doc2]
 
-        index = mocker.MagicMock(spec=VectorStoreIndex)
-        index.storage_context.persist.return_value = "ok"
+        self.index = mocker.MagicMock(spec=VectorStoreIndex)
+        self.index.storage_context.persist.return_value = "ok"
 
         mock_nodes = []
-        mock_tokenizer = mocker.MagicMock()
+        self.mock_tokenizer = mocker.MagicMock(side_effect=str.split)
         self.mock_bm25okapi = mocker.patch("rank_bm25.BM25Okapi.__init__", return_value=None)
 
-        self.retriever = DynamicBM25Retriever(nodes=mock_nodes, tokenizer=mock_tokenizer, index=index)
+        self.retriever = DynamicBM25Retriever(nodes=mock_nodes, tokenizer=self.mock_tokenizer, index=self.index)
 
     def test_add_docs_updates_nodes_and_corpus(self):
         # Exec
@@ -29,9 +33,61 @@ class TestDynamicBM25Retriever:
 
         # Assert
         assert len(self.retriever._nodes) == len(self.mock_nodes)
-        assert len(self.retriever._corpus) == len(self.mock_nodes)
+        assert len(self.retriever.bm25) == len(self.mock_nodes)
         self.retriever._tokenizer.assert_called()
-        self.mock_bm25okapi.assert_called()
+        self.mock_bm25okapi.assert_not_called()
+        self.index.insert_nodes.assert_called_once_with(self.mock_nodes)
 
-    def test_persist(self):
-        self.retriever.persist("")
+    def test_add_nodes_only_tokenizes_new_nodes(self):
+        self.retriever.add_nodes(self.mock_nodes)
+        self.mock_tokenizer.reset_mock()
+
+        self.retriever.add_nodes([TextNode(id_="3", text="Another 3")])
+
+        self.mock_tokenizer.assert_called_once_with("Another 3")
+
+    def test_retrieve_and_delete(self):
+        self.retriever.add_nodes([*self.mock_nodes, TextNode(id_="3", text="Another text 3")])
+
+        nodes = self.retriever.retrieve("content 2")
+        assert [n.node.node_id for n in nodes] == ["2", "1"]
+
+        self.retriever.delete_docs(["doc2"])
+        nodes = self.retriever.retrieve("content 2")
+        assert [n.node.node_id for n in nodes] == ["1", "3"]
+        self.index.delete_ref_doc.assert_called_once_with("doc2", delete_from_docstore=True)
+
+    def test_persist(self, tmp_path):
+        self.retriever.add_nodes(self.mock_nodes)
+        self.retriever.persist(str(tmp_path))
+
+        self.index.storage_context.persist.assert_called_once_with(str(tmp_path))
+        assert (tmp_path / BM25_INDEX_FNAME).exists()
+
+        self.mock_tokenizer.reset_mock()
+        nodes = [*self.mock_nodes, TextNode(id_="3", text="Document 3")]
+        loaded = DynamicBM25Retriever(nodes=nodes, tokenizer=self.mock_tokenizer, persist_path=tmp_path)
+        self.mock_tokenizer.assert_called_once_with("Document 3")
+        assert loaded._nodes == nodes
+
+
+def test_bm25_index_matches_bm25okapi():
+    corpus = {
+        "a": "the cat sat on the mat".split(),
+        "b": "the dog sat on the log".split(),
+        "c": "cats and dogs".split(),
+        "d": "the quick brown fox".split(),
+    }
+    index = BM25Index()
+    for key, tokens in corpus.items():
+        index.add(key, tokens)
+    index.remove("b", corpus.pop("b"))
+    index.add("b", "a dog on a log".split())
+    corpus["b"] = "a dog on a log".split()
+
+    query = "the dog sat".split()
+    expected = BM25Okapi(list(corpus.values())).get_scores(query)
+    assert index.get_scores(query).tolist() == pytest.approx(expected.tolist())
+
+    ranked = sorted(zip(corpus, expected), key=lambda x: x[1], reverse=True)
+    assert [key for key, _ in index.top_k(query, 3)] == [key for key, _ in ranked[:3]]
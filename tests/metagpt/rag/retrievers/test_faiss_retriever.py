@@ -1,5 +1,9 @@
+import faiss
 import pytest
-from llama_index.core.schema import Node
+from llama_index.core import StorageContext, VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import Document, Node
+from llama_index.vector_stores.faiss import FaissVectorStore
 
 from metagpt.rag.retrievers.faiss_retriever import FAISSRetriever
 
@@ -23,3 +27,21 @@ class TestFAISSRetriever:
         self.retriever.persist("")
 
         self.mock_index.storage_context.persist.assert_called()
+
+    def test_delete_docs(self):
+        docs = [Document(id_=f"doc{i}", text=f"text {i}") for i in range(3)]
+        vector_store = FaissVectorStore(faiss_index=faiss.IndexFlatL2(8))
+        index = VectorStoreIndex.from_documents(
+            docs,
+            storage_context=StorageContext.from_defaults(vector_store=vector_store),
+            embed_model=MockEmbedding(embed_dim=8),
+        )
+        retriever = FAISSRetriever(index, similarity_top_k=3)
+
+        retriever.delete_docs(["doc1"])
+
+        assert vector_store.client.ntotal == 2
+        assert sorted(index.index_struct.nodes_dict) == ["0", "1"]
+        assert index.docstore.get_ref_doc_info("doc1") is None
+        retrieved = retriever.retrieve("text")
+        assert sorted(n.node.ref_doc_id for n in retrieved) == ["doc0", "doc2"]
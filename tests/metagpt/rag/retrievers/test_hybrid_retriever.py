@@ -1,7 +1,19 @@
+import asyncio
+import time
+
 import pytest
-from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
 
+from metagpt.rag.benchmark.runner import HashEmbedding
+from metagpt.rag.factories import get_retriever
 from metagpt.rag.retrievers import SimpleHybridRetriever
+from metagpt.rag.schema import (
+    BM25RetrieverConfig,
+    FAISSRetrieverConfig,
+    FusionMode,
+    HybridRetrieverConfig,
+)
 
 
 class TestSimpleHybridRetriever:
@@ -48,6 +60,50 @@ class TestSimpleHybridRetriever:
         node_scores = {node.node.node_id: node.score for node in results}
         assert node_scores["2"] == 0.95
 
+    @pytest.fixture
+    def ranked_retrievers(self, mocker):
+        async def slow_aretrieve(query):
+            await asyncio.sleep(0.2)
+            return [NodeWithScore(node=TextNode(id_="1"), score=3.0)]
+
+        mock_retriever1 = mocker.AsyncMock()
+        mock_retriever1.aretrieve.side_effect = slow_aretrieve
+        mock_retriever2 = mocker.AsyncMock()
+        mock_retriever2.aretrieve.return_value = [
+            NodeWithScore(node=TextNode(id_="2"), score=10.0),
+            NodeWithScore(node=TextNode(id_="1"), score=8.0),
+            NodeWithScore(node=TextNode(id_="3"), score=0.0),
+        ]
+        return mock_retriever1, mock_retriever2
+
+    @pytest.mark.asyncio
+    async def test_aretrieve_concurrently_with_timeout(self, ranked_retrievers):
+        hybrid_retriever = SimpleHybridRetriever(*ranked_retrievers, ranked_retrievers[0], timeout=[None, None, 0.05])
+
+        start = time.perf_counter()
+        results = await hybrid_retriever._aretrieve("test query")
+
+        assert time.perf_counter() - start < 0.35
+        assert [n.node.node_id for n in results] == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("fusion_mode", "weights", "expected"),
+        [
+            (FusionMode.RECIPROCAL_RANK, None, {"1": 1 / 61 + 1 / 62, "2": 1 / 61}),
+            (FusionMode.WEIGHTED_SCORE, [0.5, 1.0], {"1": 0.5 + 0.8, "2": 1.0}),
+        ],
+    )
+    async def test_aretrieve_fusion(self, ranked_retrievers, fusion_mode, weights, expected):
+        hybrid_retriever = SimpleHybridRetriever(
+            *ranked_retrievers, fusion_mode=fusion_mode, weights=weights, similarity_top_k=2
+        )
+
+        results = await hybrid_retriever._aretrieve("test query")
+
+        assert {n.node.node_id: n.score for n in results} == pytest.approx(expected)
+        assert results[0].node.node_id == "1"
+
     def test_add_nodes(self, mock_hybrid_retriever: SimpleHybridRetriever, mock_node):
         mock_hybrid_retriever.add_nodes([mock_node])
         mock_hybrid_retriever.retrievers[0].add_nodes.assert_called_once()
@@ -55,3 +111,49 @@ class TestSimpleHybridRetriever:
     def test_persist(self, mock_hybrid_retriever: SimpleHybridRetriever):
         mock_hybrid_retriever.persist("")
         mock_hybrid_retriever.retrievers[0].persist.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_weighted_score_fusion_of_faiss_and_bm25():
+    nodes = [
+        TextNode(id_="far", text="dogs and cats chase fish"),
+        TextNode(id_="near", text="apple banana cherry"),
+        TextNode(id_="middle", text="apple pie"),
+    ]
+    config = HybridRetrieverConfig(
+        retriever_configs=[FAISSRetrieverConfig(dimensions=256, similarity_top_k=3), BM25RetrieverConfig()],
+        fusion_mode=FusionMode.WEIGHTED_SCORE,
+        weights=[1.0, 0.1],
+    )
+    retriever = get_retriever(configs=[config], nodes=nodes, embed_model=HashEmbedding())
+
+    faiss_results = await retriever.retrievers[0].aretrieve("apple banana cherry")
+    assert faiss_results[0].node.node_id == "near" and faiss_results[0].score < faiss_results[-1].score  # distances
+
+    results = await retriever.aretrieve("apple banana cherry")
+    assert [n.node.node_id for n in results] == ["near", "middle", "far"]
+
+
+class SleepingRetriever(BaseRetriever):
+    """A retriever without async path, blocking for `seconds`."""
+
+    def __init__(self, node_id: str, seconds: float):
+        self.node_id = node_id
+        self.seconds = seconds
+        super().__init__()
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        time.sleep(self.seconds)
+        return [NodeWithScore(node=TextNode(id_=self.node_id, text=self.node_id), score=1.0)]
+
+
+@pytest.mark.asyncio
+async def test_sync_retrievers_run_concurrently_within_their_timeouts():
+    retrievers = [SleepingRetriever("a", 0.2), SleepingRetriever("b", 0.2), SleepingRetriever("c", 1.0)]
+    hybrid_retriever = SimpleHybridRetriever(*retrievers, timeout=[None, None, 0.3])
+
+    start = time.perf_counter()
+    results = await hybrid_retriever.aretrieve("query")
+
+    assert time.perf_counter() - start < 0.6
+    assert [n.node.node_id for n in results] == ["a", "b"]
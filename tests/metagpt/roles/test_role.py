@@ -18,5 +18,20 @@ def test_role_human(context):
     assert isinstance(role.llm, HumanProvider)
 
 
+def test_role_memory_window(context):
+    role = Role(name="Alice", memory_window_size=4, context=context)
+    assert role.rc.memory.window_size == 4
+    assert role.rc.memory.spill_path.parent == role.stg_path
+    assert role.stg_path.name == "Role_Alice"
+
+    recovered = Role(**role.model_dump(), context=context)
+    assert recovered.rc.memory.spill_path == role.rc.memory.spill_path
+
+    context.config.memory_window_size = 8
+    assert Role(context=context).rc.memory.window_size == 8
+    context.config.memory_window_size = 0
+    assert Role(context=context).rc.memory.spill_path is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
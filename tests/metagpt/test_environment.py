@@ -41,6 +41,49 @@ def test_get_roles(env: Environment):
     assert roles == {role1.profile: role1, role2.profile: role2}
 
 
+def test_publish_message_routing(env: Environment):
+    alice = Role(name="Alice", profile="product manager")
+    bob = Role(name="Bob", profile="engineer")
+    env.add_roles([alice, bob])
+
+    env.publish_message(Message(content="to alice", send_to="Alice"))
+    assert [i.content for i in alice.rc.msg_buffer.pop_all()] == ["to alice"]
+    assert bob.rc.msg_buffer.empty()
+
+    env.publish_message(Message(content="to all"))
+    assert len(alice.rc.msg_buffer.pop_all()) == len(bob.rc.msg_buffer.pop_all()) == 1
+
+    bob.set_addresses({"reviewer"})
+    env.publish_message(Message(content="to reviewer", send_to={"reviewer", "Alice"}))
+    assert len(alice.rc.msg_buffer.pop_all()) == len(bob.rc.msg_buffer.pop_all()) == 1
+    env.publish_message(Message(content="to bob", send_to="Bob"))
+    assert bob.rc.msg_buffer.empty()
+
+
+@pytest.mark.asyncio
+async def test_event_driven_run(env: Environment, mocker):
+    env.event_driven = True
+    env.max_concurrency = 1
+    alice = Role(name="Alice", profile="product manager")
+    bob = Role(name="Bob", profile="engineer")
+    env.add_roles([alice, bob])
+    alice_run = mocker.patch.object(alice, "run")
+    bob_run = mocker.patch.object(bob, "run")
+
+    env.publish_message(Message(content="to alice", send_to="Alice"))
+    await env.run()
+    assert alice_run.call_count == 1
+    assert bob_run.call_count == 0
+
+    await env.run()
+    assert alice_run.call_count == 1
+
+    env.publish_message(Message(content="to all"))
+    await env.run()
+    assert alice_run.call_count == 2
+    assert bob_run.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_publish_and_process_message(env: Environment):
     if env.context.git_repo:
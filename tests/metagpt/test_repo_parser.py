@@ -1,11 +1,19 @@
+import json
 from pathlib import Path
 from pprint import pformat
 
 import pytest
 
-from metagpt.const import METAGPT_ROOT
+from metagpt import repo_parser as repo_parser_module
+from metagpt.const import AGGREGATION, COMPOSITION, GENERALIZATION, METAGPT_ROOT
 from metagpt.logs import logger
-from metagpt.repo_parser import DotClassAttribute, DotClassMethod, DotReturn, RepoParser
+from metagpt.repo_parser import (
+    CodeBlockInfo,
+    DotClassAttribute,
+    DotClassMethod,
+    DotReturn,
+    RepoParser,
+)
 
 
 def test_repo_parser():
@@ -21,6 +29,166 @@ def test_repo_parser():
     assert output_path.exists()
 
 
+def test_generate_symbols_with_cache(tmp_path, mocker):
+    project = tmp_path / "project"
+    project.mkdir()
+    for i in range(3):
+        (project / f"mod{i}.py").write_text(f"class A{i}:\n    def run(self):\n        pass\n\n\nVALUE = {i}\n")
+    cache_path = tmp_path / "cache.json"
+    symbols = RepoParser(base_directory=project, cache_path=cache_path).generate_symbols()
+    assert cache_path.exists()
+
+    (project / "mod1.py").write_text("def main():\n    pass\n")
+    (project / "mod2.py").unlink()
+    spy = mocker.spy(RepoParser, "_parse_file")
+    cached = RepoParser(base_directory=project, cache_path=cache_path).generate_symbols()
+
+    assert [c.args[0].name for c in spy.call_args_list] == ["mod1.py"]
+    by_file = {i.file: i for i in cached}
+    assert set(by_file) == {"mod0.py", "mod1.py"}
+    assert by_file["mod0.py"] == next(i for i in symbols if i.file == "mod0.py")
+    assert by_file["mod1.py"].functions == ["main"]
+    assert all(isinstance(b, CodeBlockInfo) for b in by_file["mod0.py"].page_info)
+    assert set(json.loads(cache_path.read_text())["files"]) == {"mod0.py", "mod1.py"}
+
+
+def test_generate_symbols_without_cache_path(tmp_path, mocker):
+    default_root = tmp_path / "default_cache"
+    mocker.patch.object(repo_parser_module, "DEFAULT_SYMBOLS_CACHE_ROOT", default_root)
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "mod0.py").write_text("def main():\n    pass\n")
+
+    RepoParser(base_directory=project).generate_symbols()
+    assert not default_root.exists()
+    RepoParser(base_directory=project, use_cache=True).generate_symbols()
+    assert len(list(default_root.iterdir())) == 1
+
+
+def test_generate_symbols_in_processes(tmp_path):
+    for i in range(40):
+        (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    pass\n")
+
+    parallel = RepoParser(base_directory=tmp_path, use_cache=False, num_workers=2).generate_symbols()
+    serial = RepoParser(base_directory=tmp_path, use_cache=False, num_workers=1).generate_symbols()
+
+    assert parallel == serial
+    assert sorted(f for i in parallel for f in i.functions) == sorted(f"f{i}" for i in range(40))
+
+
+CLASS_VIEW_FILES = {
+    "__init__.py": "",
+    "base.py": """
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Memory:
+    pass
+
+
+class Base(ABC):
+    name: str = ""
+    memory: Optional[Memory] = None
+
+    @abstractmethod
+    def run(self, query: str) -> str:
+        pass
+
+    def _private(self):
+        pass
+""",
+    "sub/__init__.py": "from .impl import Impl\n",
+    "sub/impl.py": """
+from ..base import Base, Memory
+
+
+class Impl(Base):
+    def __init__(self, memory: Memory, count=0):
+        self.store = Memory()
+        self.shared = memory
+        self._hidden = count
+
+    @property
+    def size(self) -> int:
+        return 0
+
+    def run(self, query: str) -> str:
+        raise NotImplementedError
+
+    class Options:
+        verbose = False
+""",
+    "app.py": """
+from pkg.sub import Impl
+
+
+class App:
+    impl: "Impl"
+""",
+}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_class_views(tmp_path, mocker):
+    package = tmp_path / "pkg"
+    for filename, content in CLASS_VIEW_FILES.items():
+        (package / filename).parent.mkdir(parents=True, exist_ok=True)
+        (package / filename).write_text(content)
+    repo_parser = RepoParser(base_directory=package, cache_path=tmp_path / "cache.json")
+
+    class_views, relationship_views, package_root = await repo_parser.rebuild_class_views()
+
+    assert package_root == f"{tmp_path}/"
+    classes = {c.package: c for c in class_views}
+    assert set(classes) == {
+        "pkg/app.py:App",
+        "pkg/base.py:Base",
+        "pkg/base.py:Memory",
+        "pkg/sub/impl.py:Impl",
+        "pkg/sub/impl.py:Impl:Options",
+    }
+    base = classes["pkg/base.py:Base"]
+    assert [a.description for a in base.attributes.values()] == ["memory : Optional[Memory]", "name : str"]
+    assert base.compositions == ["Memory"]
+    assert [m.description for m in base.methods.values()] == ["<I>run</I>(query: str): str"]
+    impl = classes["pkg/sub/impl.py:Impl"]
+    assert [a.description for a in impl.attributes.values()] == ["shared : Memory", "size : int", "store : Memory"]
+    assert impl.methods["run"].description == "<I>run</I>(query: str): str"
+    relationships = {(r.src, r.dest, r.relationship, r.label) for r in relationship_views}
+    assert relationships == {
+        ("pkg/sub/impl.py:Impl", "pkg/base.py:Base", GENERALIZATION, None),
+        ("pkg/base.py:Memory", "pkg/base.py:Base", COMPOSITION, "memory"),
+        ("pkg/base.py:Memory", "pkg/sub/impl.py:Impl", COMPOSITION, "store"),
+        ("pkg/base.py:Memory", "pkg/sub/impl.py:Impl", AGGREGATION, "shared"),
+        ("pkg/sub/impl.py:Impl", "pkg/app.py:App", COMPOSITION, "impl"),
+    }
+
+    (package / "app.py").write_text("class App:\n    pass\n")
+    spy = mocker.spy(repo_parser_module, "_parse_class_views")
+    class_views, relationship_views, _ = await repo_parser.rebuild_class_views()
+    assert [c.args[1].name for c in spy.call_args_list] == ["app.py"]
+    assert len(class_views) == 5
+    assert len(relationship_views) == 4
+
+
+def test_extract_class_views_in_processes(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "mod0.py").write_text("class A0:\n    pass\n")
+    for i in range(1, 40):
+        (package / f"mod{i}.py").write_text(f"from .mod0 import A0\n\n\nclass A{i}(A0):\n    pass\n")
+
+    parallel = RepoParser(base_directory=package, use_cache=False, num_workers=2)._extract_class_views(package)
+    serial = RepoParser(base_directory=package, use_cache=False, num_workers=1)._extract_class_views(package)
+
+    assert parallel == serial
+    assert len(parallel[0]) == 40
+    assert len(parallel[1]) == 39
+    assert all(r.relationship == GENERALIZATION and r.dest == "pkg/mod0.py:A0" for r in parallel[1])
+
+
 def test_error():
     """_parse_file should return empty list when file not existed"""
     rsp = RepoParser._parse_file(Path("test_not_existed_file.py"))
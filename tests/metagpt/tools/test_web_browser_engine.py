@@ -4,6 +4,7 @@
 import pytest
 
 from metagpt.tools import WebBrowserEngineType, web_browser_engine
+from metagpt.tools.web_browser_pool import close_browser_pools
 from metagpt.utils.parse_html import WebPage
 
 
@@ -29,6 +30,7 @@ async def test_scrape_web_page(browser_type, http_server):
         assert isinstance(results, list)
         assert len(results) == len(urls) + 1
         assert all(("MetaGPT" in i.inner_text) for i in results)
+    await close_browser_pools()
     await server.stop()
 
 
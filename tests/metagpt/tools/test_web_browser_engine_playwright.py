@@ -4,6 +4,7 @@
 import pytest
 
 from metagpt.tools import web_browser_engine_playwright
+from metagpt.tools.web_browser_pool import close_browser_pools
 from metagpt.utils.parse_html import WebPage
 
 
@@ -45,6 +46,7 @@ async def test_scrape_web_page(browser_type, use_proxy, kwagrs, proxy, capfd, ht
         proxy_server.close()
         await proxy_server.wait_closed()
         assert "Proxy:" in capfd.readouterr().out
+    await close_browser_pools()
     await server.stop()
 
 
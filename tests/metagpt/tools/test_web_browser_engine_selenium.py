@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from types import SimpleNamespace
 
 import browsers
 import pytest
 
 from metagpt.tools import web_browser_engine_selenium
+from metagpt.tools.web_browser_pool import close_browser_pools
 from metagpt.utils.parse_html import WebPage
 
 
@@ -52,8 +54,27 @@ async def test_scrape_web_page(browser_type, use_proxy, proxy, capfd, http_serve
         proxy_server.close()
         await proxy_server.wait_closed()
         assert "Proxy: localhost" in capfd.readouterr().out
+    await close_browser_pools()
     await server.stop()
 
 
+def test_selenium_pool_is_usable():
+    class Process:
+        def __init__(self, returncode):
+            self.returncode = returncode
+
+        def poll(self):
+            return self.returncode
+
+    def driver(session_id, returncode=None):
+        return SimpleNamespace(session_id=session_id, service=SimpleNamespace(process=Process(returncode)))
+
+    pool = web_browser_engine_selenium.SeleniumPool(web_browser_engine_selenium.SeleniumWrapper())
+    assert pool.is_usable(driver("session"))
+    assert not pool.is_usable(driver(None))
+    assert not pool.is_usable(driver("session", returncode=1))  # the driver process died
+    assert pool.is_usable(SimpleNamespace(session_id="session"))  # remote driver
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
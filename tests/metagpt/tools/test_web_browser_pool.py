@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pytest
+
+from metagpt.tools.web_browser_engine_playwright import PlaywrightWrapper
+from metagpt.tools.web_browser_pool import (
+    BrowserPool,
+    close_browser_pools,
+    get_browser_pool,
+)
+
+
+class CountingPool(BrowserPool[int]):
+    """Resources are numbers, the pages loaded at the same time are counted per domain."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.destroyed = []
+        self.loading = {}
+        self.max_loading = {}
+        self.is_shutdown = False
+
+    async def create(self) -> int:
+        return self.num_created
+
+    async def destroy(self, resource: int):
+        self.destroyed.append(resource)
+
+    async def shutdown(self):
+        self.is_shutdown = True
+
+    async def load(self, url: str) -> int:
+        domain = url.split("/")[2]
+        async with self.acquire(url) as resource:
+            self.loading[domain] = self.loading.get(domain, 0) + 1
+            self.max_loading[domain] = max(self.max_loading.get(domain, 0), self.loading[domain])
+            await asyncio.sleep(0.01)
+            self.loading[domain] -= 1
+            return resource
+
+
+@pytest.mark.asyncio
+async def test_browser_pool():
+    pool = CountingPool(max_size=3, max_per_domain=2)
+    urls = [f"http://{domain}/{i}" for i in range(6) for domain in ("a.com", "b.com")]
+    resources = await asyncio.gather(*(pool.load(url) for url in urls))
+
+    assert set(resources) == {0, 1, 2}
+    assert pool.max_loading == {"a.com": 2, "b.com": 2}
+    assert pool.num_created == 3 and not pool.destroyed
+
+    with pytest.raises(ValueError):
+        async with pool.acquire("http://a.com"):
+            raise ValueError()
+    assert len(pool.destroyed) == 1
+
+    await pool.close()
+    assert pool.is_shutdown and sorted(pool.destroyed) == [0, 1, 2]
+    with pytest.raises(RuntimeError):
+        await pool.load("http://a.com")
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_recycling():
+    pool = CountingPool(max_pages=2)
+    assert [await pool.load("http://a.com") for _ in range(5)] == [0, 0, 1, 1, 2]
+    assert pool.destroyed == [0, 1]
+    await pool.close()
+    assert pool.destroyed == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_close_waits_for_pages():
+    pool = CountingPool()
+    task = asyncio.create_task(pool.load("http://a.com"))
+    await asyncio.sleep(0)
+    await pool.close()
+    assert task.done() and await task == 0
+    assert pool.destroyed == [0]
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_drops_unusable_resources():
+    pool = CountingPool()
+    assert [await pool.load("http://a.com") for _ in range(2)] == [0, 0]
+    pool.is_usable = lambda resource: resource != 0  # e.g. its browser crashed
+    assert await pool.load("http://a.com") == 1
+    assert pool.destroyed == [0]
+
+
+def test_browser_pools_closed_with_the_loop():
+    async def run():
+        return await get_browser_pool("key", CountingPool)
+
+    pool = asyncio.run(run())
+    assert pool.closed and pool.is_shutdown
+
+
+@pytest.mark.asyncio
+async def test_get_browser_pool():
+    pool = await get_browser_pool("key", CountingPool)
+    assert await get_browser_pool("key", CountingPool) is pool
+    assert await get_browser_pool("other", CountingPool) is not pool
+
+    await close_browser_pools()
+    assert pool.closed and pool.is_shutdown
+    assert await get_browser_pool("key", CountingPool) is not pool
+    await close_browser_pools()
+
+    assert PlaywrightWrapper()._pool_key == PlaywrightWrapper(browser_type="chromium")._pool_key
+    assert PlaywrightWrapper()._pool_key != PlaywrightWrapper(proxy="http://localhost:8080")._pool_key
@@ -3,8 +3,9 @@
 # @Desc   : unittest of ahttp_client
 
 import pytest
+from aiohttp import web
 
-from metagpt.utils.ahttp_client import apost, apost_stream
+from metagpt.utils.ahttp_client import apost, apost_stream, close_session, get_session
 
 
 @pytest.mark.asyncio
@@ -27,3 +28,34 @@ async def test_apost_stream():
     result = apost_stream(url="http://aider.meizu.com/app/weather/listWeather", data={"cityIds": "101240101"})
     async for line in result:
         assert len(line) >= 0
+
+
+@pytest.mark.asyncio
+async def test_shared_session():
+    peers = set()
+
+    async def echo(request: web.Request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response(await request.json())
+
+    app = web.Application()
+    app.router.add_post("/echo", echo)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/echo"
+    try:
+        for i in range(3):
+            assert await apost(url=url, json={"i": i}, as_json=True) == {"i": i}
+        assert len(peers) == 1  # one kept-alive connection served every request
+
+        session = await get_session()
+        assert session is await get_session()
+        await close_session()
+        assert session.closed
+        assert await apost(url=url, json={"i": 3}, as_json=True) == {"i": 3}
+        assert len(peers) == 2
+        await close_session()
+    finally:
+        await runner.cleanup()
@@ -7,6 +7,8 @@
 @Desc    : Unit tests for di_graph_repository.py
 """
 
+import itertools
+import random
 from pathlib import Path
 
 import pytest
@@ -14,8 +16,9 @@ from pydantic import BaseModel
 
 from metagpt.const import DEFAULT_WORKSPACE_ROOT
 from metagpt.repo_parser import RepoParser
+from metagpt.utils.binary_graph_store import BinaryGraphStore
 from metagpt.utils.di_graph_repository import DiGraphRepository
-from metagpt.utils.graph_repository import GraphRepository
+from metagpt.utils.graph_repository import SPO, GraphRepository
 
 
 @pytest.mark.asyncio
@@ -41,6 +44,84 @@ async def test_di_graph_repository():
     graph.pathname.unlink()
 
 
+@pytest.mark.asyncio
+async def test_select_and_delete_with_indexes():
+    rnd = random.Random(0)
+    graph = DiGraphRepository(name="test")
+    await graph.insert_many(
+        [
+            SPO(subject=f"s{rnd.randint(0, 9)}", predicate=f"p{rnd.randint(0, 3)}", object_=f"o{rnd.randint(0, 9)}")
+            for _ in range(60)
+        ]
+    )
+    await graph.insert(subject="s0", predicate="p0", object_="o0")
+    await graph.insert(subject="s0", predicate="p1", object_="o0")  # replaces the predicate of the edge
+
+    def brute_force(s, p, o):
+        return {
+            (a, c, b)
+            for a, b, c in graph.repo.edges(data="predicate")
+            if (not s or s == a) and (not p or p == c) and (not o or o == b)
+        }
+
+    for s, p, o in itertools.product([None, "s0", "s3"], [None, "p1", "p2"], [None, "o0", "o5"]):
+        rows = await graph.select(subject=s, predicate=p, object_=o)
+        assert {(r.subject, r.predicate, r.object_) for r in rows} == brute_force(s, p, o)
+    assert not await graph.select(subject="s0", predicate="p0", object_="o0")
+
+    count = len(graph.repo.edges)
+    deleted = await graph.delete(predicate="p1")
+    assert deleted and len(graph.repo.edges) == count - deleted
+    assert not await graph.select(predicate="p1")
+
+    loaded = DiGraphRepository(name="test").load_json(graph.json())
+    for s, p, o in itertools.product([None, "s0"], [None, "p2"], [None, "o5"]):
+        rows = await loaded.select(subject=s, predicate=p, object_=o)
+        assert sorted(rows, key=str) == sorted(await graph.select(subject=s, predicate=p, object_=o), key=str)
+
+
+@pytest.mark.asyncio
+async def test_binary_save_and_load(tmp_path):
+    graph = DiGraphRepository(name="test", root=tmp_path, binary=True)
+    await graph.insert_many([SPO(subject=f"s{i % 7}", predicate=f"p{i % 3}", object_=f"o{i}") for i in range(50)])
+    await graph.save()
+    assert graph.pathname == tmp_path / "test.graph"
+    ops_file = graph.pathname / BinaryGraphStore.OPS
+    size = ops_file.stat().st_size
+
+    await graph.insert(subject="s0", predicate="p9", object_="o1")
+    await graph.delete(subject="s1")
+    await graph.save()
+    assert ops_file.stat().st_size > size  # appended, not rewritten
+
+    loaded = await DiGraphRepository.load_from(graph.pathname)
+    assert loaded.binary
+    assert loaded.json() == graph.json()
+    assert await loaded.select(subject="s0", object_="o1") == [SPO(subject="s0", predicate="p9", object_="o1")]
+    assert not await loaded.select(subject="s1")
+
+    await loaded.export_json(tmp_path / "test.json")
+    from_json = await DiGraphRepository.load_from(tmp_path / "test.json")
+    assert not from_json.binary
+    assert from_json.json() == graph.json()
+
+
+@pytest.mark.asyncio
+async def test_binary_store_drops_torn_tail(tmp_path):
+    graph = DiGraphRepository(name="test", root=tmp_path, binary=True)
+    await graph.insert(subject="a", predicate="p", object_="b")
+    await graph.save()
+    with open(graph.pathname / BinaryGraphStore.OPS, "ab") as f:
+        f.write(b"\x01\x00\x00")  # interrupted append
+
+    loaded = await DiGraphRepository.load_from(graph.pathname)
+    await loaded.insert(subject="a", predicate="p", object_="c")
+    await loaded.save()
+
+    reloaded = await DiGraphRepository.load_from(graph.pathname)
+    assert {r.object_ for r in await reloaded.select(subject="a")} == {"b", "c"}
+
+
 @pytest.mark.asyncio
 async def test_js_parser():
     class Input(BaseModel):
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of InvertedIndex
+
+import pytest
+
+from metagpt.utils.inverted_index import InvertedIndex
+
+
+def test_inverted_index():
+    index = InvertedIndex()
+    index.add("a", "write a snake game")
+    index.add("b", "snakes and ladders")
+    index.add("c", "play the game")
+
+    assert index.tokens_containing("nak") == {"snake", "snakes"}
+    assert index.tokens_containing("snake") == {"snake", "snakes"}
+    assert index.tokens_containing("ladder") == {"ladders"}
+    assert index.candidates("snake") == ["a", "b"]
+    assert index.candidates("ame") == ["a", "c"]
+    assert index.candidates("snake game") == ["a"]
+    assert index.candidates("zebra") == []
+    assert index.candidates(" ") is None
+    assert [doc_id for doc_id, _ in index.search("snake game")] == ["a", "c"]
+    with pytest.raises(ValueError):
+        index.add("a", "again")
+
+    index.remove("a", "write a snake game")
+    assert "a" not in index and len(index) == 2
+    assert index.tokens_containing("nak") == {"snakes"}
+    assert "write" not in index.postings and "rit" not in index._ngrams
+    assert index.candidates("snake") == ["b"]
+
+    index.clear()
+    assert len(index) == 0 and not index.postings and not index._ngrams
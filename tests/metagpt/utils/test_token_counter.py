@@ -7,7 +7,13 @@
 """
 import pytest
 
-from metagpt.utils.token_counter import count_input_tokens, count_output_tokens
+from metagpt.utils import token_counter
+from metagpt.utils.token_counter import (
+    StreamTokenCounter,
+    count_input_tokens,
+    count_output_tokens,
+    count_tokens_many,
+)
 
 
 def test_count_message_tokens():
@@ -69,5 +75,24 @@ def test_count_string_tokens_gpt_4():
     assert count_output_tokens(string, model="gpt-4-0314") == 4
 
 
+def test_count_tokens_many():
+    strings = ["Hello, world!", "", "Hello, world!", "Hi there!"]
+    assert count_tokens_many(strings, model="gpt-4-0314") == [4, 0, 4, 3]
+
+
+def test_stream_token_counter():
+    reply = "Hello, world! It's a test.\n\n中文，标点。 The quick  brown fox\n```python\nprint(1234567)\n```"
+    counter = StreamTokenCounter(model="gpt-4-0314")
+    for i in range(0, len(reply), 3):
+        counter.add(reply[i : i + 3])
+    assert counter.count == count_output_tokens(reply, model="gpt-4-0314")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
+
+
+def test_token_count_cache_does_not_keep_texts():
+    text = "a prompt kept out of the cache " * 100
+    assert count_tokens_many([text, text]) == [count_output_tokens(text, "gpt-3.5-turbo")] * 2
+    assert all(text not in key for key in token_counter._token_counts)